@@ -5,6 +5,7 @@ from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.contrib.admin.widgets import AdminFileWidget
 from django.conf import settings
+from . import moderation
 from .models import (
     SiteSettings,
     SiteImage,
@@ -13,10 +14,18 @@ from .models import (
     KnowledgeArticle,
     KnowledgeTag,
     BlogPost,
+    BlogTag,
     Tool,
     CaseStudy,
     ContactEvent,
+    SocialImageJob,
+    PrerenderJob,
     StatusChoices,
+    Thread,
+    Answer,
+    ModerationReport,
+    ModerationAuditEntry,
+    ReportStatusChoices,
 )
 from django_ckeditor_5.widgets import CKEditor5Widget
 
@@ -149,6 +158,28 @@ class BlogPostAdmin(admin.ModelAdmin):
     date_hierarchy = "published_at"
 
 
+@admin.register(SocialImageJob)
+class SocialImageJobAdmin(admin.ModelAdmin):
+    list_display = ("post", "status", "attempts", "updated_at")
+    list_filter = ("status",)
+    readonly_fields = ("post", "force", "attempts", "last_error", "created_at", "updated_at")
+
+
+@admin.register(PrerenderJob)
+class PrerenderJobAdmin(admin.ModelAdmin):
+    list_display = ("path", "status", "attempts", "updated_at")
+    list_filter = ("status",)
+    search_fields = ("path",)
+    readonly_fields = ("path", "attempts", "last_error", "created_at", "updated_at")
+
+
+@admin.register(BlogTag)
+class BlogTagAdmin(admin.ModelAdmin):
+    list_display = ("title", "slug")
+    search_fields = ("title", "slug")
+    prepopulated_fields = {"slug": ("title",)}
+
+
 @admin.register(Tool)
 class ToolAdmin(admin.ModelAdmin):
     def thumb(self, obj):
@@ -172,6 +203,7 @@ class ToolAdmin(admin.ModelAdmin):
     list_filter = ("is_published", "is_premium", "schema_kind")
     search_fields = ("title", "slug")
     prepopulated_fields = {"slug": ("title",)}
+    filter_horizontal = ("tags",)
 
 
 class AdminImageWidget(AdminFileWidget):
@@ -199,6 +231,7 @@ class CaseStudyAdmin(admin.ModelAdmin):
     list_editable = ("display_order",)
     prepopulated_fields = {"slug": ("title",)}
     readonly_fields = ("preview_link",)
+    filter_horizontal = ("tags",)
 
     def preview_link(self, obj):
         if not obj.pk:
@@ -220,3 +253,52 @@ class ContactEventAdmin(admin.ModelAdmin):
     search_fields = ("event_type", "ip_hash")
     readonly_fields = ("timestamp", "event_type", "meta", "ip_hash")
     ordering = ("-timestamp",)
+
+
+class AnswerInline(admin.TabularInline):
+    model = Answer
+    extra = 0
+    fields = ("author", "body", "is_staff", "accepted", "status")
+
+
+@admin.register(Thread)
+class ThreadAdmin(admin.ModelAdmin):
+    list_display = ("title", "author", "status", "reply_count", "answered", "last_activity_at")
+    list_filter = ("status", "answered")
+    search_fields = ("title", "slug", "author")
+    prepopulated_fields = {"slug": ("title",)}
+    filter_horizontal = ("tags",)
+    readonly_fields = ("reply_count", "answered", "last_activity_at")
+    inlines = [AnswerInline]
+
+
+@admin.register(ModerationReport)
+class ModerationReportAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "target_type", "target_key", "reporter", "report_count", "status")
+    list_filter = ("status", "target_type")
+    search_fields = ("target_key", "reporter")
+    readonly_fields = ("created_at", "reporter", "target_type", "target_key", "target", "report_count")
+    actions = ("mark_resolved", "mark_dismissed")
+
+    def _close(self, request, queryset, status, action):
+        reports = list(queryset.filter(status=ReportStatusChoices.OPEN))
+        ModerationReport.objects.filter(pk__in=[r.pk for r in reports]).update(
+            status=status, resolved_at=timezone.now()
+        )
+        moderation.log_actions(request.user, action, [r.target for r in reports])
+
+    @admin.action(description="Mark selected reports resolved")
+    def mark_resolved(self, request, queryset):
+        self._close(request, queryset, ReportStatusChoices.RESOLVED, "resolve")
+
+    @admin.action(description="Dismiss selected reports")
+    def mark_dismissed(self, request, queryset):
+        self._close(request, queryset, ReportStatusChoices.DISMISSED, "dismiss")
+
+
+@admin.register(ModerationAuditEntry)
+class ModerationAuditEntryAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "user", "action", "target_type", "target_key")
+    list_filter = ("action",)
+    search_fields = ("user", "target_key")
+    readonly_fields = ("created_at", "user", "action", "target_type", "target_key", "target")
@@ -0,0 +1,89 @@
+"""Content-hashed URLs for static scripts and stylesheets.
+
+``ManifestStaticFilesStorage`` maps each collected file to a hashed name in
+``staticfiles.json``. The first lookup copies the script and stylesheet
+entries into an in-memory map of ready-made URLs, so the ``{% asset %}`` tag
+is a dict lookup per render. Hashed URLs never change content, so browsers
+and CDNs can cache them indefinitely.
+
+SCSS sources resolve to their compiled ``.css`` sibling, which
+``build_static`` writes under ``SASS_BUILD_ROOT`` and :class:`CompiledSassFinder`
+hands to ``collectstatic``. When the Sass processor is enabled (local
+development) they are compiled on demand instead.
+"""
+
+import os
+import posixpath
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.contrib.staticfiles.utils import get_files
+from django.core.files.storage import FileSystemStorage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from sass_processor.processor import SassProcessor, sass_processor
+
+ASSET_EXTENSIONS = (".js", ".css")
+
+_urls = None
+_lock = threading.Lock()
+
+
+def _load_manifest() -> dict:
+    hashed_files = getattr(staticfiles_storage, "hashed_files", {})
+    return {
+        name: staticfiles_storage.url(name)
+        for name in hashed_files
+        if name.endswith(ASSET_EXTENSIONS)
+    }
+
+
+def asset_url(path: str) -> str:
+    """Return the cacheable URL for the static file at ``path``."""
+    global _urls
+    base, ext = posixpath.splitext(path)
+    if ext in SassProcessor.sass_extensions:
+        if SassProcessor.processor_enabled:
+            return sass_processor(path)
+        path = base + ".css"
+    if _urls is None:
+        with _lock:
+            if _urls is None:
+                _urls = _load_manifest()
+    url = _urls.get(path)
+    if url is None:
+        url = staticfiles_storage.url(path)
+        _urls[path] = url
+    return url
+
+
+@receiver(setting_changed)
+def _reset_urls(setting, **kwargs):
+    global _urls
+    if setting in ("STATIC_URL", "STATIC_ROOT", "STATICFILES_STORAGE", "STORAGES"):
+        _urls = None
+
+
+class CompiledSassFinder(BaseFinder):
+    """Find stylesheets ``build_static`` compiled into ``SASS_BUILD_ROOT``.
+
+    The directory only exists after a build, so unlike ``STATICFILES_DIRS``
+    a missing one is not an error.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=str(settings.SASS_BUILD_ROOT))
+
+    def find(self, path, all=False):
+        if os.path.isfile(self.storage.path(path)):
+            match = self.storage.path(path)
+            return [match] if all else match
+        return []
+
+    def list(self, ignore_patterns):
+        if os.path.isdir(self.storage.location):
+            for path in get_files(self.storage, ignore_patterns):
+                yield path, self.storage
@@ -8,9 +8,10 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.views.generic import CreateView, View
 from django.core.mail import send_mail
 from django.shortcuts import render
-from django.core.cache import cache
 import time
 
+from utils import ratelimit
+
 from .forms import SignUpForm
 
 
@@ -37,13 +38,22 @@ class SignupView(CreateView):
         return super().form_valid(form)
 
 
+def _failed_login_limit(username: str) -> ratelimit.Limit:
+    """Failed-login counter for ``username``; drives the back-off delay."""
+    return ratelimit.Limit(
+        f"failed_login:{username}",
+        3,
+        getattr(settings, "LOGIN_FAILURE_CACHE_TIMEOUT", 300),
+    )
+
+
 class LoginView(DjangoLoginView):
     """Extend session lifetime when "remember me" is checked."""
 
     def form_valid(self, form):
         username = form.cleaned_data.get("username")
         if username:
-            cache.delete(f"failed_login_{username}")
+            ratelimit.reset(_failed_login_limit(username))
 
         remember_me = self.request.POST.get("remember_me")
         if remember_me:
@@ -56,13 +66,7 @@ class LoginView(DjangoLoginView):
 
     def form_invalid(self, form):
         username = self.request.POST.get("username", "")
-        cache_key = f"failed_login_{username}"
-        attempts = cache.get(cache_key, 0) + 1
-        cache.set(
-            cache_key,
-            attempts,
-            getattr(settings, "LOGIN_FAILURE_CACHE_TIMEOUT", 300),
-        )
+        (attempts,) = ratelimit.hit(_failed_login_limit(username))
         time.sleep(min(attempts, 3))
         return super().form_invalid(form)
 
@@ -0,0 +1,164 @@
+"""Two-tier cache backend.
+
+``NearCache`` keeps a small per-process LRU in front of a shared cache alias
+(Redis or the filesystem). Reads that hit the near tier skip the network or
+disk; everything else is delegated to the shared store so all workers see the
+same values. Near entries live for ``NEAR_TIMEOUT`` seconds at most, which
+bounds how long another worker's ``delete`` can go unnoticed.
+
+The near tier stores pickled values, like ``LocMemCache``, so a caller that
+mutates what it read cannot change what later reads see. Integers are
+treated as counters and never enter the near tier: ``incr`` in another
+worker would otherwise go unseen until the entry expires.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MISSING = object()
+
+
+class NearCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = options.get("SHARED_ALIAS", location or "shared")
+        self._near_timeout = float(options.get("NEAR_TIMEOUT", 5))
+        self._near_max_entries = int(options.get("NEAR_MAX_ENTRIES", 512))
+        self._near = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # -- near tier -------------------------------------------------------
+    def _near_key(self, key, version):
+        return self.make_and_validate_key(key, version=version)
+
+    def _near_get(self, key, version):
+        near_key = self._near_key(key, version)
+        with self._lock:
+            entry = self._near.get(near_key)
+            if entry is None:
+                return _MISSING
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._near[near_key]
+                return _MISSING
+            self._near.move_to_end(near_key)
+        return pickle.loads(value)
+
+    def _near_set(self, key, value, version, timeout=DEFAULT_TIMEOUT):
+        if isinstance(value, int) and not isinstance(value, bool):
+            self._near_delete(key, version)
+            return
+        ttl = self._near_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            if timeout <= 0:
+                self._near_delete(key, version)
+                return
+            ttl = min(ttl, timeout)
+        near_key = self._near_key(key, version)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._near[near_key] = (pickled, time.monotonic() + ttl)
+            self._near.move_to_end(near_key)
+            while len(self._near) > self._near_max_entries:
+                self._near.popitem(last=False)
+
+    def _near_delete(self, key, version):
+        near_key = self._near_key(key, version)
+        with self._lock:
+            self._near.pop(near_key, None)
+
+    # -- cache API -------------------------------------------------------
+    def get(self, key, default=None, version=None):
+        value = self._near_get(key, version)
+        if value is not _MISSING:
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self._near_set(key, value, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remote = []
+        for key in keys:
+            value = self._near_get(key, version)
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        if remote:
+            fetched = self.shared.get_many(remote, version=version)
+            for key, value in fetched.items():
+                self._near_set(key, value, version)
+            found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout=self._shared_timeout(timeout), version=version)
+        self._near_set(key, value, version, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout=self._shared_timeout(timeout), version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self._near_set(key, value, version, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout=self._shared_timeout(timeout), version=version)
+        if added:
+            self._near_set(key, value, version, timeout)
+        else:
+            self._near_delete(key, version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout=self._shared_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self._near_delete(key, version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._near_delete(key, version)
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        if self._near_get(key, version) is not _MISSING:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        # Counters are never held in the near tier (see _near_set), so every
+        # worker reads and increments the same value.
+        self._near_delete(key, version)
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._near_delete(key, version)
+        return self.shared.decr(key, delta, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._near.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def _shared_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            return self.default_timeout
+        return timeout
@@ -1,9 +1,8 @@
-import json
-from pathlib import Path
+from typing import Mapping
 
+from .content_registry import get_content
 
-def get_community_content() -> dict:
-    """Load community content spec from JSON."""
-    path = Path(__file__).resolve().parent / "content" / "community.json"
-    with path.open(encoding="utf-8") as f:
-        return json.load(f)
+
+def get_community_content() -> Mapping:
+    """Return the community content spec (read-only, shared between requests)."""
+    return get_content("community")
@@ -0,0 +1,93 @@
+"""Registry for the JSON content blocks in ``coresite/content``.
+
+Each file is parsed once per process and handed out as a read-only view
+(``MappingProxyType`` for objects, tuples for arrays), so callers share one
+copy instead of re-reading or deep-copying it per request. The file's mtime
+is re-checked at most every ``RELOAD_INTERVAL`` seconds and a changed file is
+reloaded in place, so content edits show up without a restart.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional
+
+CONTENT_DIR = Path(__file__).resolve().parent / "content"
+RELOAD_INTERVAL = 2.0
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only version of decoded JSON ``value``."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class _Entry:
+    __slots__ = ("mtime_ns", "checked_at", "value", "derived")
+
+    def __init__(self, mtime_ns: int, value: Any):
+        self.mtime_ns = mtime_ns
+        self.checked_at = time.monotonic()
+        self.value = value
+        # Values computed from ``value`` (e.g. the footer with the year filled
+        # in), dropped whenever the file reloads.
+        self.derived: Dict[Any, Any] = {}
+
+
+_entries: Dict[str, _Entry] = {}
+_lock = threading.Lock()
+
+
+def _path(name: str) -> Path:
+    return CONTENT_DIR / f"{name}.json"
+
+
+def _entry(name: str) -> _Entry:
+    entry = _entries.get(name)
+    now = time.monotonic()
+    if entry is not None and now - entry.checked_at < RELOAD_INTERVAL:
+        return entry
+    path = _path(name)
+    mtime_ns = path.stat().st_mtime_ns
+    if entry is not None and entry.mtime_ns == mtime_ns:
+        entry.checked_at = now
+        return entry
+    with _lock:
+        entry = _entries.get(name)
+        if entry is None or entry.mtime_ns != mtime_ns:
+            with path.open(encoding="utf-8") as f:
+                entry = _Entry(mtime_ns, freeze(json.load(f)))
+            _entries[name] = entry
+    return entry
+
+
+def get_content(name: str) -> Any:
+    """Return the read-only content of ``coresite/content/<name>.json``."""
+    return _entry(name).value
+
+
+def get_derived(name: str, key: Any, build: Callable[[Any], Any]) -> Any:
+    """Return ``build(content)`` for ``name``, computed once per ``key``.
+
+    The result is cached alongside the file and rebuilt after it reloads.
+    """
+    entry = _entry(name)
+    try:
+        return entry.derived[key]
+    except KeyError:
+        value = entry.derived[key] = build(entry.value)
+        return value
+
+
+def clear(name: Optional[str] = None) -> None:
+    """Forget loaded content so the next access re-reads from disk."""
+    with _lock:
+        if name is None:
+            _entries.clear()
+        else:
+            _entries.pop(name, None)
@@ -1,13 +1,141 @@
+"""RSS, Atom and JSON feeds with cached, pre-serialised bodies.
+
+Feed readers poll constantly, so each feed body is built once per content
+version and kept in the cache together with its gzip-compressed copy, a
+content ETag and a Last-Modified stamp (see :func:`serve`). Bodies are built
+from a request for ``SITE_BASE_URL``, so links are canonical whatever host
+was polled. Publishing bumps the feed's page cache group; the receivers in
+``coresite.models`` then rebuild its feeds once the transaction commits, and
+``utils.singleflight`` keeps concurrent polls from rebuilding in parallel.
+"""
+
+import gzip
+import hashlib
+import time
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
 from django.contrib.syndication.views import Feed
-from django.http import JsonResponse
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
 
+from utils import singleflight
+
+from . import page_cache
 from .models import BlogPost, KnowledgeArticle
 
+FEED_CACHE_PREFIX = "feed"
+# Bounds how long a scheduled item can stay out of a feed.
+FEED_CACHE_TIMEOUT = 60 * 60
+
+Builder = Callable[[object], HttpResponse]
+
+
+def _accepts_gzip(header: str) -> bool:
+    """Return ``True`` when the ``Accept-Encoding`` header allows gzip.
+
+    ``gzip;q=0`` (or ``*;q=0`` with no gzip entry) refuses it, so q-values
+    are honoured rather than matching the word anywhere in the header.
+    """
+    wildcard = False
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard = q > 0
+    return wildcard
+
+
+def _canonical_request(path: str):
+    base = urlsplit(settings.SITE_BASE_URL)
+    return RequestFactory().get(path, HTTP_HOST=base.netloc, secure=base.scheme == "https")
+
+
+def _cache_key(name: str) -> str:
+    return f"{FEED_CACHE_PREFIX}:{name}:{getattr(settings, 'BUILD_COMMIT', '')}"
+
+
+def _serialize(name: str, build: Builder) -> dict:
+    response = build(_canonical_request(reverse(name)))
+    body = response.content
+    previous = singleflight.peek(_cache_key(name))
+    if previous and previous["body"] == body:
+        # Unchanged output keeps its validators, so readers still get 304s.
+        etag, last_modified = previous["etag"], previous["last_modified"]
+    else:
+        etag = quote_etag(hashlib.md5(body).hexdigest())
+        last_modified = int(time.time())
+    return {
+        "body": body,
+        "gzip": gzip.compress(body, mtime=0),
+        "content_type": response["Content-Type"],
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+
+
+def cached_feed(name: str, group: str, build: Builder) -> dict:
+    """Return the serialised feed ``name``, building it if stale."""
+    return singleflight.get_or_set(
+        _cache_key(name),
+        lambda: _serialize(name, build),
+        FEED_CACHE_TIMEOUT,
+        version=page_cache.current_version(group),
+    )
+
+
+def serve(request, name: str, group: str, build: Builder) -> HttpResponse:
+    """Answer ``request`` from the cached copy of feed ``name``."""
+    feed = cached_feed(name, group, build)
+    not_modified = get_conditional_response(
+        request, etag=feed["etag"], last_modified=feed["last_modified"]
+    )
+    if not_modified is not None:
+        return not_modified
+    if _accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+        response = HttpResponse(feed["gzip"], content_type=feed["content_type"])
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(feed["body"], content_type=feed["content_type"])
+    response["ETag"] = feed["etag"]
+    response["Last-Modified"] = http_date(feed["last_modified"])
+    response["Vary"] = "Accept-Encoding"
+    return response
+
 
-class BlogRSSFeed(Feed):
+class CachedFeed(Feed):
+    """A syndication feed served through :func:`serve`."""
+
+    url_name = ""
+    group = ""
+
+    def __call__(self, request, *args, **kwargs):
+        return serve(request, self.url_name, self.group, self.generate)
+
+    def generate(self, request):
+        return super().__call__(request)
+
+
+class BlogRSSFeed(CachedFeed):
+    url_name = "blog_rss"
+    group = "blog"
     title = "Technofatty Blog"
     link = "/blog/"
     description = "Latest news and insights from Technofatty."
@@ -32,11 +160,14 @@ class BlogRSSFeed(Feed):
 
 
 class BlogAtomFeed(BlogRSSFeed):
+    url_name = "blog_atom"
     feed_type = Atom1Feed
     subtitle = BlogRSSFeed.description
 
 
-class KnowledgeRSSFeed(Feed):
+class KnowledgeRSSFeed(CachedFeed):
+    url_name = "knowledge_rss"
+    group = "knowledge"
     title = "Technofatty Knowledge"
     link = "/knowledge/"
     description = "Latest knowledge articles from Technofatty."
@@ -63,11 +194,12 @@ class KnowledgeRSSFeed(Feed):
 
 
 class KnowledgeAtomFeed(KnowledgeRSSFeed):
+    url_name = "knowledge_atom"
     feed_type = Atom1Feed
     subtitle = KnowledgeRSSFeed.description
 
 
-def blog_json_feed(request):
+def _blog_json(request):
     posts = BlogPost.published.order_by("-published_at")[:10]
     items = [
         {
@@ -80,7 +212,7 @@ def blog_json_feed(request):
     return JsonResponse({"items": items})
 
 
-def knowledge_json_feed(request):
+def _knowledge_json(request):
     articles = (
         KnowledgeArticle.published.select_related("category").order_by("-published_at")[:10]
     )
@@ -95,3 +227,45 @@ def knowledge_json_feed(request):
         for a in articles
     ]
     return JsonResponse({"items": items})
+
+
+def blog_json_feed(request):
+    return serve(request, "blog_json", "blog", _blog_json)
+
+
+def knowledge_json_feed(request):
+    return serve(request, "knowledge_json", "knowledge", _knowledge_json)
+
+
+# (url name, page cache group, builder) for every cached feed.
+FEEDS: List[Tuple[str, str, Builder]] = [
+    (feed.url_name, feed.group, feed.generate)
+    for feed in (BlogRSSFeed(), BlogAtomFeed(), KnowledgeRSSFeed(), KnowledgeAtomFeed())
+] + [
+    ("blog_json", "blog", _blog_json),
+    ("knowledge_json", "knowledge", _knowledge_json),
+]
+
+
+def refresh(group: str, stale_only: bool = False) -> Dict[str, str]:
+    """Rebuild the feeds for ``group`` now; returns their ETags.
+
+    With ``stale_only``, feeds already built for the current version are
+    left alone, so several saves in one transaction cost one rebuild.
+    """
+    version = page_cache.current_version(group)
+    etags = {}
+    for name, feed_group, build in FEEDS:
+        if feed_group != group:
+            continue
+        feed = singleflight.peek(_cache_key(name), version=version) if stale_only else None
+        if feed is None:
+            feed = _serialize(name, build)
+            singleflight.store(_cache_key(name), feed, FEED_CACHE_TIMEOUT, version)
+        etags[name] = feed["etag"]
+    return etags
+
+
+def schedule_refresh(group: str) -> None:
+    """Rebuild ``group``'s stale feeds once the current transaction commits."""
+    transaction.on_commit(lambda: refresh(group, stale_only=True))
@@ -1,33 +1,26 @@
 """Footer content loader."""
 
-import json
 from datetime import datetime
-from functools import lru_cache
-from pathlib import Path
-from copy import deepcopy
+from types import MappingProxyType
+from typing import Mapping
 
+from .content_registry import get_derived
 
-@lru_cache(maxsize=1)
-def _load_footer_json() -> dict:
-    """Load footer JSON from disk once per process."""
-    path = Path(__file__).resolve().parent / "content" / "footer.json"
-    with path.open(encoding="utf-8") as f:
-        return json.load(f)
 
+def _with_year(content: Mapping, year: str) -> Mapping:
+    meta = content.get("meta", {})
+    copyright = meta.get("copyright")
+    if not copyright:
+        return content
+    meta = MappingProxyType({**meta, "copyright": copyright.replace("{{year}}", year)})
+    return MappingProxyType({**content, "meta": meta})
 
-def get_footer_content() -> dict:
-    """Return footer content with current year injected.
-
-    The JSON is cached in-process to avoid disk I/O on each request. Each call
-    injects the current year so the rendered copyright stays fresh.
-    """
 
-    content = deepcopy(_load_footer_json())
+def get_footer_content() -> Mapping:
+    """Return footer content with the current year injected.
 
+    The result is read-only and shared between requests; it is rebuilt when
+    the year changes or ``footer.json`` is edited.
+    """
     year = str(datetime.now().year)
-    meta = content.get("meta", {})
-    copyright = meta.get("copyright")
-    if copyright:
-        meta["copyright"] = copyright.replace("{{year}}", year)
-
-    return content
+    return get_derived("footer", year, lambda content: _with_year(content, year))
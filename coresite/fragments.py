@@ -0,0 +1,52 @@
+"""Fragment cache for shared template partials.
+
+``{% fragment %}`` blocks (see ``coresite.templatetags.fragments``) render
+once per key. A per-request memo answers repeats within the same response
+and the shared cache answers later requests; a cold key is rendered by one
+request at a time (``utils.singleflight``). Keys cover the fragment name,
+the values the template passes in (typically content objects and
+the active nav section), the visitor's auth state and the build commit, so a deploy
+or a content change produces fresh keys rather than needing invalidation.
+"""
+
+import hashlib
+from typing import Callable, Iterable
+
+from django.conf import settings
+
+from utils import singleflight
+
+KEY_PREFIX = "fragment"
+MEMO_ATTR = "_fragment_memo"
+
+
+def fragment_key(name: str, parts: Iterable) -> str:
+    raw = "|".join([name, getattr(settings, "BUILD_COMMIT", ""), *map(repr, parts)])
+    return f"{KEY_PREFIX}:{name}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def _memo(request) -> dict:
+    if request is None:
+        return {}
+    memo = getattr(request, MEMO_ATTR, None)
+    if memo is None:
+        memo = {}
+        setattr(request, MEMO_ATTR, memo)
+    return memo
+
+
+def get_or_render(request, key: str, render: Callable[[], str], timeout: int = None) -> str:
+    """Return the fragment for ``key``, calling ``render`` only on a miss."""
+    memo = _memo(request)
+    if key in memo:
+        return memo[key]
+    if getattr(settings, "FRAGMENT_CACHE_ENABLED", False):
+        value = singleflight.get_or_set(
+            key,
+            render,
+            timeout if timeout is not None else settings.FRAGMENT_CACHE_TIMEOUT,
+        )
+    else:
+        value = render()
+    memo[key] = value
+    return value
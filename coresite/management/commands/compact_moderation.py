@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from coresite import moderation
+
+
+class Command(BaseCommand):
+    help = "Merge duplicate open reports and prune old moderation history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--audit-days",
+            type=int,
+            default=moderation.AUDIT_RETENTION_DAYS,
+            help="Keep audit log entries this many days (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--report-days",
+            type=int,
+            default=moderation.CLOSED_REPORT_RETENTION_DAYS,
+            help="Keep resolved and dismissed reports this many days (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=moderation.DELETE_BATCH_SIZE,
+            help="Rows deleted per statement (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        merged = moderation.compact_reports()
+        pruned = moderation.prune(
+            audit_days=options["audit_days"],
+            report_days=options["report_days"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Merged {merged} duplicate reports; pruned {pruned['reports']} closed "
+                f"reports and {pruned['audit']} audit entries."
+            )
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from coresite.services import prerender
+
+
+class Command(BaseCommand):
+    help = "Render public pages to static files under PRERENDER_ROOT"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            default=[],
+            help="Render only this path (repeatable)",
+        )
+        parser.add_argument(
+            "--no-prune",
+            action="store_true",
+            help="Keep files for paths that are no longer public",
+        )
+
+    def handle(self, *args, **options):
+        if options["paths"]:
+            stats = prerender.render(options["paths"])
+            stats["pruned"] = 0
+        else:
+            stats = prerender.render_all(prune=not options["no_prune"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {stats['written']} pages to {prerender.root()}; removed "
+                f"{stats['removed'] + stats['pruned']}, {stats['failed']} failed."
+            )
+        )
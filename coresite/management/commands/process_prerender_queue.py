@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from coresite.services import prerender
+
+
+class Command(BaseCommand):
+    help = "Render queued public pages to static files under PRERENDER_ROOT"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of paths to claim per batch",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            claimed, stats = prerender.process_pending(options["batch_size"])
+            total += claimed
+            if claimed:
+                self.stdout.write(
+                    f"Rendered {claimed} queued paths: wrote {stats['written']}, "
+                    f"removed {stats['removed']}, {stats['failed']} failed."
+                )
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Rendered {total} queued paths."))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from coresite.services import social_images
+
+
+class Command(BaseCommand):
+    help = "Render queued social images for blog posts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Number of jobs to claim per batch",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            claimed, applied = social_images.process_pending(options["batch_size"])
+            total += applied
+            if claimed:
+                self.stdout.write(f"Rendered {applied} of {claimed} queued images.")
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Rendered {total} social images."))
@@ -1,19 +1,55 @@
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import connections
 from django.utils import timezone
-from coresite.models import KnowledgeArticle, StatusChoices
+
+from coresite.services import scheduled_publishing
 
 
 class Command(BaseCommand):
     help = "Publish scheduled knowledge articles whose publish time has arrived"
 
-    def handle(self, *args, **options):
-        now = timezone.now()
-        articles = KnowledgeArticle.objects.filter(
-            status=StatusChoices.DRAFT, published_at__isnull=False, published_at__lte=now
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=scheduled_publishing.BATCH_SIZE,
+            help="Number of articles to publish per UPDATE",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running, waking when the next article is due",
         )
-        count = 0
-        for article in articles:
-            article.status = StatusChoices.PUBLISHED
-            article.save()
-            count += 1
-        self.stdout.write(self.style.SUCCESS(f"Published {count} articles."))
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=60.0,
+            help="Longest wait between checks in --watch mode, so newly "
+            "scheduled articles are picked up",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            count = scheduled_publishing.publish_all_due(batch_size=options["batch_size"])
+            total += count
+            if not options["watch"]:
+                break
+            if count:
+                self.stdout.write(f"Published {count} articles.")
+            time.sleep(self._seconds_until_next(options["max_sleep"]))
+        self.stdout.write(self.style.SUCCESS(f"Published {total} articles."))
+
+    def _seconds_until_next(self, max_sleep):
+        upcoming = scheduled_publishing.next_due()
+        # Don't hold a database connection open while idle.
+        connections.close_all()
+        if upcoming is None:
+            return max_sleep
+        remaining = (upcoming - timezone.now()).total_seconds()
+        if remaining <= 0:
+            # Due but not published: another worker holds its row lock.
+            return 1.0
+        return min(max_sleep, remaining)
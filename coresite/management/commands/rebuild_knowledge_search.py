@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from coresite.models import KnowledgeArticle
+from coresite.services import knowledge_search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for knowledge articles"
+
+    def handle(self, *args, **options):
+        articles = KnowledgeArticle.objects.prefetch_related("tags").iterator(chunk_size=500)
+        count = knowledge_search.rebuild(articles)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} articles."))
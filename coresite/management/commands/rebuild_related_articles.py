@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from coresite.services import related_articles
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored related-article lists for every knowledge article"
+
+    def handle(self, *args, **options):
+        count = related_articles.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Stored {count} related-article links."))
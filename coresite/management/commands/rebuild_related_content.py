@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from coresite.services import related_content
+
+
+class Command(BaseCommand):
+    help = "Rebuild the cross-type related content tag index"
+
+    def handle(self, *args, **options):
+        count = related_content.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} tagged items."))
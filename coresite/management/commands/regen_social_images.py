@@ -1,7 +1,20 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from django.core.management.base import BaseCommand
 
-from coresite.models import BlogPost
-from coresite.services.social_images import generate_social_images
+from coresite import page_cache
+from coresite.models import BlogPost, JobStatusChoices, SocialImageJob
+from coresite.services.social_images import (
+    existing_social_images,
+    render_card,
+    social_image_paths,
+    store_social_images,
+)
+
+IMAGE_FIELDS = ["og_image_url", "twitter_image_url"]
 
 
 class Command(BaseCommand):
@@ -14,14 +27,88 @@ class Command(BaseCommand):
             action="store_true",
             help="Overwrite existing files even if they exist",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Render processes to use (1 renders in this process)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Posts rendered and saved per batch",
+        )
 
     def handle(self, *args, **options):
-        qs = BlogPost.objects.all()
+        qs = BlogPost.objects.only("pk", "slug", "title", "meta_title", *IMAGE_FIELDS)
         if options.get("slug"):
             qs = qs.filter(slug=options["slug"])
-        for post in qs:
-            og_url, twitter_url = generate_social_images(post, force=options.get("force"))
-            BlogPost.objects.filter(pk=post.pk).update(
-                og_image_url=og_url, twitter_image_url=twitter_url
+        force = options.get("force")
+        started = time.monotonic()
+
+        # Images are content-addressed: an existing file for the same hash is
+        # already correct, so only missing cards are rendered.
+        pending, updated = [], []
+        skipped = 0
+        for post in qs.order_by("pk"):
+            text, og_path, twitter_path = social_image_paths(post)
+            existing = None if force else existing_social_images(og_path, twitter_path)
+            if existing is None:
+                pending.append((post, text, og_path, twitter_path))
+                continue
+            skipped += 1
+            if (post.og_image_url, post.twitter_image_url) != existing:
+                post.og_image_url, post.twitter_image_url = existing
+                updated.append(post)
+        self._save(updated)
+
+        rendered = 0
+        workers = max(1, options["workers"])
+        batch_size = max(1, options["batch_size"])
+        executor = None
+        if workers > 1 and len(pending) > 1:
+            # ``spawn`` keeps the parent's database connection out of the children.
+            executor = ProcessPoolExecutor(
+                max_workers=min(workers, len(pending)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        try:
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                texts = [text for _, text, _, _ in batch]
+                if executor is not None:
+                    images = executor.map(render_card, texts, chunksize=4)
+                else:
+                    images = map(render_card, texts)
+                posts = []
+                for (post, _, og_path, twitter_path), image_bytes in zip(batch, images):
+                    post.og_image_url, post.twitter_image_url = store_social_images(
+                        og_path, twitter_path, image_bytes, force=force
+                    )
+                    posts.append(post)
+                self._save(posts)
+                rendered += len(posts)
+                self.stdout.write(f"Rendered {rendered}/{len(pending)} posts")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        elapsed = time.monotonic() - started
+        rate = rendered / elapsed if elapsed else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {rendered} posts, skipped {skipped} up to date "
+                f"in {elapsed:.1f}s ({rate:.1f} posts/s, {workers} workers)."
             )
-            self.stdout.write(f"Generated images for {post.slug}")
+        )
+
+    def _save(self, posts):
+        if not posts:
+            return
+        # ``bulk_update`` skips BlogPost.save, so nothing is re-queued.
+        BlogPost.objects.bulk_update(posts, IMAGE_FIELDS)
+        SocialImageJob.objects.filter(
+            post__in=posts, status=JobStatusChoices.PENDING
+        ).update(status=JobStatusChoices.DONE)
+        page_cache.bump_version("blog")
@@ -1,9 +1,10 @@
 from django.conf import settings
 from django.core.signing import BadSignature
 from django.http import HttpResponse
-from django.core.cache import cache
 import re
 
+from utils import ratelimit
+
 
 class ConsentMiddleware:
     """Attach CONSENT_GRANTED flag to each request."""
@@ -42,15 +43,13 @@ class StaticCacheControlMiddleware:
         return response
 
 
-PENDING_POST_QUEUE = []
-
-
 class PostRateLimitMiddleware:
     """Rate limit and link throttle for community posts.
 
     - Limits posts to 1 per minute per user/IP.
     - Users with fewer than 3 approved posts may include only one link.
-    - Unverified users' first posts are queued for moderation.
+    - Unverified users' first posts are stored as pending threads for
+      moderation.
     """
 
     def __init__(self, get_response):
@@ -64,10 +63,8 @@ class PostRateLimitMiddleware:
                 if getattr(user, "is_authenticated", False)
                 else request.META.get("REMOTE_ADDR", "")
             )
-            key = f"post:rate:{identifier}"
-            if cache.get(key):
+            if not ratelimit.consume(ratelimit.Limit(f"post:{identifier}", 1, 60)):
                 return HttpResponse("Too many posts", status=429)
-            cache.set(key, 1, 60)
 
             body = request.POST.get("body", "")
             if getattr(user, "approved_posts", 0) < 3:
@@ -77,11 +74,14 @@ class PostRateLimitMiddleware:
             if getattr(user, "approved_posts", 0) == 0 and not getattr(
                 user, "is_verified", False
             ):
-                PENDING_POST_QUEUE.append({
-                    "user": user,
-                    "title": request.POST.get("title", ""),
-                    "body": body,
-                })
+                from .models import PostStatusChoices, Thread
+
+                Thread.objects.create(
+                    title=request.POST.get("title", "")[:200] or body[:80] or "Untitled",
+                    body=body,
+                    author=getattr(user, "username", "") or "anonymous",
+                    status=PostStatusChoices.PENDING,
+                )
                 return HttpResponse("Post queued", status=202)
 
         return self.get_response(request)
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_blog_tags(apps, schema_editor):
+    BlogPost = apps.get_model("coresite", "BlogPost")
+    BlogTag = apps.get_model("coresite", "BlogTag")
+
+    tags_by_slug = {}
+    for post in BlogPost.objects.only("pk", "tags").iterator():
+        tag_ids = []
+        for item in post.tags or []:
+            slug = slugify(item.get("slug") or item.get("title") or "")
+            if not slug:
+                continue
+            tag = tags_by_slug.get(slug)
+            if tag is None:
+                tag, _ = BlogTag.objects.get_or_create(
+                    slug=slug,
+                    defaults={
+                        "title": item.get("title") or slug,
+                        "description": item.get("description", ""),
+                    },
+                )
+                tags_by_slug[slug] = tag
+            tag_ids.append(tag.pk)
+        post.blog_tags.set(tag_ids)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coresite", "0014_blogpost_primary_goal"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogTag",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("title", models.CharField(max_length=100)),
+                ("slug", models.SlugField(unique=True)),
+                ("description", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="blog_tags",
+            field=models.ManyToManyField(
+                blank=True, editable=False, related_name="posts", to="coresite.blogtag"
+            ),
+        ),
+        migrations.RunPython(backfill_blog_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+FTS_TABLE = "coresite_knowledgearticle_fts"
+
+
+def create_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS knart_search_vector_gin "
+            "ON coresite_knowledgearticle USING gin (search_vector);"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(title, blurb, tags, tokenize='porter unicode61');"
+        )
+
+
+def drop_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS knart_search_vector_gin;")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE};")
+
+
+def backfill_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in ("postgresql", "sqlite"):
+        return
+    KnowledgeArticle = apps.get_model("coresite", "KnowledgeArticle")
+    with schema_editor.connection.cursor() as cursor:
+        for article in KnowledgeArticle.objects.prefetch_related("tags").iterator(chunk_size=500):
+            tags = " ".join(t.name for t in article.tags.all())
+            if vendor == "postgresql":
+                cursor.execute(
+                    "UPDATE coresite_knowledgearticle SET search_vector = "
+                    "setweight(to_tsvector('english', %s), 'A') || "
+                    "setweight(to_tsvector('english', %s), 'B') || "
+                    "setweight(to_tsvector('english', %s), 'C') WHERE id = %s",
+                    [article.title, article.blurb, tags, article.pk],
+                )
+            else:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, blurb, tags) VALUES (%s, %s, %s, %s)",
+                    [article.pk, article.title, article.blurb, tags],
+                )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coresite", "0015_blogtag"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="knowledgearticle",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
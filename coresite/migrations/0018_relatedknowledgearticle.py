@@ -0,0 +1,51 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from coresite.services import related_articles
+
+    related_articles.rebuild_all(apps=apps)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coresite", "0017_socialimagejob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedKnowledgeArticle",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="coresite.knowledgearticle",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_from",
+                        to="coresite.knowledgearticle",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["article", "rank"],
+                "indexes": [
+                    models.Index(fields=["article", "rank"], name="knrel_article_rank_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=["article", "related"], name="knrel_unique_pair"),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+from django.db import migrations, models
+
+# Tags previously hard-coded in ``coresite.views`` for tools and case studies.
+TOOL_TAGS = {
+    "tf-cli": ["deployment"],
+    "roi-calculator": ["scaling"],
+    "content-ideator": ["community"],
+}
+
+CASE_STUDY_TAGS = {
+    "acme": ["scaling"],
+    "alpha": ["deployment"],
+    "beta": ["scaling"],
+}
+
+
+def seed_tags_and_index(apps, schema_editor):
+    from coresite.services import related_content
+
+    KnowledgeTag = apps.get_model("coresite", "KnowledgeTag")
+    for model_name, mapping in (("Tool", TOOL_TAGS), ("CaseStudy", CASE_STUDY_TAGS)):
+        model = apps.get_model("coresite", model_name)
+        for obj in model.objects.filter(slug__in=mapping):
+            tags = [
+                KnowledgeTag.objects.get_or_create(
+                    slug=slug, defaults={"name": slug.replace("-", " ").title()}
+                )[0]
+                for slug in mapping[obj.slug]
+            ]
+            obj.tags.add(*tags)
+    related_content.rebuild_all(apps=apps)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coresite", "0018_relatedknowledgearticle"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tool",
+            name="tags",
+            field=models.ManyToManyField(blank=True, related_name="tools", to="coresite.knowledgetag"),
+        ),
+        migrations.AddField(
+            model_name="casestudy",
+            name="tags",
+            field=models.ManyToManyField(blank=True, related_name="case_studies", to="coresite.knowledgetag"),
+        ),
+        migrations.CreateModel(
+            name="TaggedContent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("tag", models.SlugField(max_length=100)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("knowledge", "Knowledge"),
+                            ("blog", "Blog"),
+                            ("tools", "Tools"),
+                            ("case_studies", "Case studies"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("title", models.CharField(max_length=200)),
+                ("url", models.CharField(max_length=255)),
+                ("published_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["tag", "kind", "published_at"], name="tagged_content_tag_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=["kind", "object_id", "tag"], name="tagged_content_unique"),
+                ],
+            },
+        ),
+        migrations.RunPython(seed_tags_and_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,239 @@
+from datetime import datetime, timezone
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+# Placeholder threads previously hard-coded in ``coresite.views``.
+THREADS = [
+    {
+        "title": "How do I deploy Technofatty?",
+        "slug": "deploy-technofatty",
+        "tags": ["deployment"],
+        "replies": 3,
+        "updated": datetime(2024, 1, 15),
+        "answered": True,
+        "author": "Priya",
+    },
+    {
+        "title": "Scaling best practices?",
+        "slug": "scaling-best-practices",
+        "tags": ["scaling"],
+        "replies": 0,
+        "updated": datetime(2024, 2, 10),
+        "answered": False,
+        "author": "Liam",
+    },
+    {
+        "title": "API authentication options",
+        "slug": "api-authentication-options",
+        "tags": ["api", "security"],
+        "replies": 1,
+        "updated": datetime(2024, 2, 5),
+        "answered": False,
+        "author": "Ava",
+    },
+    {
+        "title": "How do I contribute to Technofatty?",
+        "slug": "contribute-to-technofatty",
+        "tags": ["community"],
+        "replies": 1,
+        "updated": datetime(2024, 3, 5),
+        "answered": True,
+        "author": "Mia",
+    },
+]
+
+
+THREAD_DETAILS = {
+    "deploy-technofatty": {
+        "title": "How do I deploy Technofatty?",
+        "body": "What's the best way to deploy the platform?",
+        "author": "Priya",
+        "created": datetime(2024, 1, 10),
+        "answers": [
+            {
+                "id": 1,
+                "author": "Sam",
+                "body": "Use Docker Compose for a quick start.",
+                "is_staff": True,
+                "accepted": True,
+                "created": datetime(2024, 1, 16),
+            },
+            {
+                "id": 2,
+                "author": "Alex",
+                "body": "Kubernetes works well once you scale.",
+                "is_staff": False,
+                "accepted": False,
+                "created": datetime(2024, 1, 17),
+            },
+            {
+                "id": 3,
+                "author": "Priya",
+                "body": "Thanks everyone, the Docker route worked!",
+                "is_staff": False,
+                "accepted": False,
+                "created": datetime(2024, 1, 18),
+            },
+        ],
+    },
+    "scaling-best-practices": {
+        "title": "Scaling best practices?",
+        "body": "How should I scale Technofatty for growing workloads?",
+        "author": "Liam",
+        "created": datetime(2024, 2, 1),
+        "answers": [],
+    },
+    "api-authentication-options": {
+        "title": "API authentication options",
+        "body": "Which authentication methods does the API support?",
+        "author": "Ava",
+        "created": datetime(2024, 2, 3),
+        "answers": [
+            {
+                "id": 1,
+                "author": "Tom",
+                "body": "OAuth2 and API keys are both available.",
+                "is_staff": False,
+                "accepted": False,
+                "created": datetime(2024, 2, 6),
+            }
+        ],
+    },
+    "contribute-to-technofatty": {
+        "title": "How do I contribute to Technofatty?",
+        "body": "I'd like to help. Where should I start?",
+        "author": "Mia",
+        "created": datetime(2024, 3, 1),
+        "answers": [
+            {
+                "id": 1,
+                "author": "Zoe",
+                "body": "Check out our CONTRIBUTING guide and join discussions in this community.",
+                "is_staff": True,
+                "accepted": True,
+                "created": datetime(2024, 3, 6),
+            }
+        ],
+    },
+}
+
+
+def _aware(value):
+    return value.replace(tzinfo=timezone.utc)
+
+
+def seed_threads(apps, schema_editor):
+    Thread = apps.get_model("coresite", "Thread")
+    Answer = apps.get_model("coresite", "Answer")
+    KnowledgeTag = apps.get_model("coresite", "KnowledgeTag")
+    for summary in THREADS:
+        detail = THREAD_DETAILS[summary["slug"]]
+        if Thread.objects.filter(slug=summary["slug"]).exists():
+            continue
+        thread = Thread.objects.create(
+            title=summary["title"],
+            slug=summary["slug"],
+            body=detail["body"],
+            author=summary["author"],
+            status="published",
+            reply_count=len(detail["answers"]),
+            answered=any(a["accepted"] for a in detail["answers"]),
+            last_activity_at=_aware(summary["updated"]),
+        )
+        Thread.objects.filter(pk=thread.pk).update(created_at=_aware(detail["created"]))
+        thread.tags.add(
+            *[
+                KnowledgeTag.objects.get_or_create(
+                    slug=slug, defaults={"name": slug.replace("-", " ").title()}
+                )[0]
+                for slug in summary["tags"]
+            ]
+        )
+        for item in detail["answers"]:
+            answer = Answer.objects.create(
+                thread=thread,
+                author=item["author"],
+                body=item["body"],
+                is_staff=item["is_staff"],
+                accepted=item["accepted"],
+                status="published",
+            )
+            Answer.objects.filter(pk=answer.pk).update(created_at=_aware(item["created"]))
+
+
+STATUS_CHOICES = [
+    ("pending", "Pending review"),
+    ("published", "Published"),
+    ("rejected", "Rejected"),
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coresite", "0019_taggedcontent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Thread",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("title", models.CharField(max_length=200)),
+                ("slug", models.SlugField(blank=True, unique=True)),
+                ("body", models.TextField(blank=True)),
+                ("author", models.CharField(blank=True, max_length=100)),
+                ("status", models.CharField(choices=STATUS_CHOICES, default="published", max_length=20)),
+                ("reply_count", models.PositiveIntegerField(default=0, editable=False)),
+                ("answered", models.BooleanField(default=False, editable=False)),
+                (
+                    "last_activity_at",
+                    models.DateTimeField(default=django.utils.timezone.now, editable=False),
+                ),
+                (
+                    "tags",
+                    models.ManyToManyField(blank=True, related_name="threads", to="coresite.knowledgetag"),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["status", "-last_activity_at", "-id"], name="thread_latest_idx"),
+                    models.Index(
+                        fields=["status", "answered", "-last_activity_at", "-id"],
+                        name="thread_answered_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="Answer",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("author", models.CharField(blank=True, max_length=100)),
+                ("body", models.TextField()),
+                ("is_staff", models.BooleanField(default=False)),
+                ("accepted", models.BooleanField(default=False)),
+                ("status", models.CharField(choices=STATUS_CHOICES, default="published", max_length=20)),
+                (
+                    "thread",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="answers",
+                        to="coresite.thread",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at", "id"],
+                "indexes": [
+                    models.Index(fields=["thread", "status", "created_at"], name="answer_thread_idx"),
+                ],
+            },
+        ),
+        migrations.RunPython(seed_threads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coresite", "0020_thread_answer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ModerationReport",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("reporter", models.CharField(max_length=150)),
+                ("target_type", models.CharField(max_length=20)),
+                ("target_key", models.CharField(max_length=200)),
+                ("target", models.JSONField(default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("open", "Open"), ("resolved", "Resolved"), ("dismissed", "Dismissed")],
+                        default="open",
+                        max_length=20,
+                    ),
+                ),
+                ("report_count", models.PositiveIntegerField(default=1)),
+                ("resolved_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["status", "-created_at", "-id"], name="modreport_status_idx"),
+                    models.Index(fields=["target_type", "target_key", "status"], name="modreport_target_idx"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ModerationAuditEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("user", models.CharField(max_length=150)),
+                ("action", models.CharField(max_length=50)),
+                ("target_type", models.CharField(blank=True, max_length=20)),
+                ("target_key", models.CharField(blank=True, max_length=200)),
+                ("target", models.JSONField(default=dict)),
+            ],
+            options={
+                "verbose_name_plural": "moderation audit entries",
+                "indexes": [
+                    models.Index(fields=["-created_at", "-id"], name="modaudit_created_idx"),
+                ],
+            },
+        ),
+    ]
@@ -4,11 +4,13 @@ from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.contrib.postgres.search import SearchVectorField
 from django.dispatch import receiver
-from django.core.cache import cache
 import math
 
+from . import page_cache
+
 
 class StatusChoices(models.TextChoices):
     DRAFT = "draft", "Draft"
@@ -115,6 +117,10 @@ class KnowledgeTag(models.Model):
         return self.name
 
 
+# KnowledgeArticle fields that feed related article scores.
+RELATED_ARTICLE_FIELDS = ("category_id", "status", "published_at")
+
+
 class KnowledgeArticle(TimestampedModel):
     category = models.ForeignKey(
         KnowledgeCategory, related_name="articles", on_delete=models.CASCADE
@@ -159,6 +165,8 @@ class KnowledgeArticle(TimestampedModel):
     twitter_title = models.CharField(max_length=255, blank=True)
     twitter_description = models.TextField(blank=True)
     twitter_image_url = models.URLField(blank=True)
+    # Maintained by coresite.services.knowledge_search on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
     objects = models.Manager()
     published = PublishedManager()
 
@@ -191,16 +199,33 @@ class KnowledgeArticle(TimestampedModel):
         if self.content:
             words = len(self.content.split())
             self.reading_time = max(1, math.ceil(words / 200)) if words else None
+        original = None
+        if self.pk:
+            original = (
+                self.__class__.objects.filter(pk=self.pk)
+                .values(*RELATED_ARTICLE_FIELDS)
+                .first()
+            )
         if self.status == StatusChoices.PUBLISHED:
-            original = None
-            if self.pk:
-                original = self.__class__.objects.filter(pk=self.pk).values("status", "published_at").first()
             if original and original["status"] == StatusChoices.PUBLISHED and original["published_at"]:
                 self.published_at = original["published_at"]
             elif self.published_at is None:
                 self.published_at = timezone.now()
         self.full_clean()
+        from .services import knowledge_search, related_articles
+
+        # Related lists only depend on these fields and the tags, which the
+        # m2m receivers handle; copy edits leave every list as it is.
+        rescore = original is None or any(
+            original[field] != getattr(self, field) for field in RELATED_ARTICLE_FIELDS
+        )
+        # A category change or unpublish drops the article from its old
+        # neighbours' lists.
+        previous = related_articles.affected([self.pk]) if rescore and original else set()
         super().save(*args, **kwargs)
+        knowledge_search.update_article(self)
+        if rescore:
+            related_articles.rebuild(previous | related_articles.affected([self.pk]))
 
     class Meta:
         indexes = [
@@ -209,6 +234,41 @@ class KnowledgeArticle(TimestampedModel):
         ]
 
 
+class RelatedKnowledgeArticle(models.Model):
+    """Precomputed "related articles" entry, maintained by
+    ``coresite.services.related_articles``."""
+
+    article = models.ForeignKey(
+        KnowledgeArticle, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(
+        KnowledgeArticle, on_delete=models.CASCADE, related_name="related_from"
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["article", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["article", "related"], name="knrel_unique_pair"),
+        ]
+        indexes = [
+            models.Index(fields=["article", "rank"], name="knrel_article_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} -> {self.related_id} (#{self.rank})"
+
+
+class BlogTag(models.Model):
+    title = models.CharField(max_length=100)
+    slug = models.SlugField(unique=True)
+    description = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.title
+
+
 class BlogPost(TimestampedModel):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True, blank=True)
@@ -223,6 +283,11 @@ class BlogPost(TimestampedModel):
     category_slug = models.SlugField(max_length=100, blank=True)
     category_title = models.CharField(max_length=100, blank=True)
     tags = models.JSONField(default=list, blank=True)
+    # Relational index of ``tags``; rebuilt from the JSON list on save so tag
+    # lookups hit the join table instead of scanning every post's JSON.
+    blog_tags = models.ManyToManyField(
+        BlogTag, blank=True, editable=False, related_name="posts"
+    )
     meta_title = models.CharField(max_length=255, blank=True)
     meta_description = models.TextField(blank=True)
     canonical_url = models.URLField(blank=True)
@@ -274,14 +339,47 @@ class BlogPost(TimestampedModel):
             prev = BlogPost.objects.filter(pk=self.pk).values("meta_title").first()
             if prev and prev.get("meta_title") != self.meta_title:
                 regen = True
-        if not self.og_image_url or not self.twitter_image_url or regen:
-            from .services.social_images import generate_social_images
-
-            og_url, twitter_url = generate_social_images(self, force=regen)
-            self.og_image_url = og_url
-            self.twitter_image_url = twitter_url
+        from .services import social_images
+
+        placeholder = social_images.placeholder_url()
+        queue_images = (
+            regen
+            or not self.og_image_url
+            or not self.twitter_image_url
+            or self.og_image_url == placeholder
+        )
+        if queue_images:
+            # Rendering happens in the ``process_social_images`` worker; serve
+            # the placeholder until it swaps the real images in.
+            self.og_image_url = placeholder
+            self.twitter_image_url = placeholder
         self.full_clean()
         super().save(*args, **kwargs)
+        if queue_images:
+            social_images.enqueue(self, force=regen)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "tags" in update_fields:
+            self.sync_blog_tags()
+
+    def sync_blog_tags(self):
+        """Mirror the JSON ``tags`` list into ``blog_tags``."""
+        tag_objs = []
+        for item in self.tags or []:
+            slug = slugify(item.get("slug") or item.get("title") or "")
+            if not slug:
+                continue
+            tag, created = BlogTag.objects.get_or_create(
+                slug=slug,
+                defaults={
+                    "title": item.get("title") or slug,
+                    "description": item.get("description", ""),
+                },
+            )
+            if not created and item.get("description") and not tag.description:
+                tag.description = item["description"]
+                tag.save(update_fields=["description"])
+            tag_objs.append(tag)
+        self.blog_tags.set(tag_objs)
 
 
 class Tool(TimestampedModel):
@@ -294,6 +392,7 @@ class Tool(TimestampedModel):
     is_published = models.BooleanField(default=False)
     is_premium = models.BooleanField(default=False)
     display_order = models.PositiveIntegerField(default=0)
+    tags = models.ManyToManyField(KnowledgeTag, blank=True, related_name="tools")
 
     objects = ToolQuerySet.as_manager()
 
@@ -332,6 +431,7 @@ class CaseStudy(TimestampedModel):
     image = models.ImageField(upload_to="case_studies/", blank=True, null=True)
     display_order = models.PositiveIntegerField(default=0)
     is_published = models.BooleanField(default=False)
+    tags = models.ManyToManyField(KnowledgeTag, blank=True, related_name="case_studies")
 
     def __str__(self):
         return self.title
@@ -357,6 +457,42 @@ class CaseStudy(TimestampedModel):
         ]
 
 
+class ContentKindChoices(models.TextChoices):
+    KNOWLEDGE = "knowledge", "Knowledge"
+    BLOG = "blog", "Blog"
+    TOOLS = "tools", "Tools"
+    CASE_STUDIES = "case_studies", "Case studies"
+
+
+class TaggedContent(models.Model):
+    """Inverted tag index across knowledge, blog, tools and case studies.
+
+    One row per (tag slug, published item), with the title and URL copied in
+    so related-content blocks never touch the source tables. Maintained by
+    ``coresite.services.related_content``.
+    """
+
+    tag = models.SlugField(max_length=100)
+    kind = models.CharField(max_length=20, choices=ContentKindChoices.choices)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=200)
+    url = models.CharField(max_length=255)
+    published_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id", "tag"], name="tagged_content_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["tag", "kind", "published_at"], name="tagged_content_tag_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.tag}: {self.kind} {self.title}"
+
+
 def _generate_unique_slug(value: str, queryset, fallback: str = "item"):
     """Return a slugified string unique within the given queryset.
 
@@ -387,13 +523,253 @@ def set_blogpost_slug(sender, instance, **kwargs):
         )
 
 
-SITEMAP_CACHE_KEY = "sitemap_xml"
+# Page-cache group each model's pages depend on; see coresite/page_cache.py.
+PAGE_CACHE_GROUPS = {
+    BlogPost: "blog",
+    KnowledgeArticle: "knowledge",
+    KnowledgeCategory: "knowledge",
+    CaseStudy: "case_studies",
+    Tool: "tools",
+    SiteImage: "site_images",
+}
+
+
+def _next_scheduled(model):
+    """When the next published ``model`` with a future ``published_at`` appears."""
+
+    def next_change():
+        return (
+            model.objects.filter(status=StatusChoices.PUBLISHED, published_at__gt=timezone.now())
+            .order_by("published_at")
+            .values_list("published_at", flat=True)
+            .first()
+        )
+
+    return next_change
+
+
+page_cache.register_schedule(PAGE_CACHE_GROUPS[BlogPost], _next_scheduled(BlogPost))
+page_cache.register_schedule(PAGE_CACHE_GROUPS[KnowledgeArticle], _next_scheduled(KnowledgeArticle))
 
 
 @receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=KnowledgeArticle)
+@receiver(post_save, sender=KnowledgeCategory)
 @receiver(post_save, sender=CaseStudy)
-def clear_sitemap_cache(**kwargs):
-    cache.delete(SITEMAP_CACHE_KEY)
+@receiver(post_save, sender=Tool)
+@receiver(post_save, sender=SiteImage)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=KnowledgeArticle)
+@receiver(post_delete, sender=KnowledgeCategory)
+@receiver(post_delete, sender=CaseStudy)
+@receiver(post_delete, sender=Tool)
+@receiver(post_delete, sender=SiteImage)
+def bump_page_cache_version(sender, **kwargs):
+    page_cache.bump_version(PAGE_CACHE_GROUPS[sender])
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=KnowledgeArticle)
+@receiver(post_save, sender=KnowledgeCategory)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=KnowledgeArticle)
+@receiver(post_delete, sender=KnowledgeCategory)
+def refresh_feeds(sender, **kwargs):
+    from . import feeds
+
+    feeds.schedule_refresh(PAGE_CACHE_GROUPS[sender])
+
+
+@receiver(pre_save, sender=BlogPost)
+@receiver(pre_save, sender=KnowledgeArticle)
+@receiver(pre_save, sender=KnowledgeCategory)
+@receiver(pre_save, sender=CaseStudy)
+@receiver(pre_save, sender=Tool)
+@receiver(pre_save, sender=SiteImage)
+def stash_prerender_paths(sender, instance, **kwargs):
+    """Remember the saved copy's pages so renamed or unpublished ones go."""
+    from .services import prerender
+
+    if prerender.enabled():
+        instance._prerender_previous = prerender.previous_paths(instance) or set()
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=KnowledgeArticle)
+@receiver(post_save, sender=KnowledgeCategory)
+@receiver(post_save, sender=CaseStudy)
+@receiver(post_save, sender=Tool)
+@receiver(post_save, sender=SiteImage)
+def prerender_saved(sender, instance, **kwargs):
+    from .services import prerender
+
+    if prerender.enabled():
+        previous = instance.__dict__.pop("_prerender_previous", set())
+        prerender.schedule(previous, obj=instance)
+
+
+@receiver(pre_delete, sender=BlogPost)
+@receiver(pre_delete, sender=KnowledgeArticle)
+@receiver(pre_delete, sender=KnowledgeCategory)
+@receiver(pre_delete, sender=CaseStudy)
+@receiver(pre_delete, sender=Tool)
+@receiver(pre_delete, sender=SiteImage)
+def prerender_deleted(sender, instance, **kwargs):
+    from .services import prerender
+
+    if prerender.enabled():
+        prerender.schedule(prerender.paths_for(instance))
+
+
+@receiver(m2m_changed, sender=KnowledgeArticle.tags.through)
+def reindex_article_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        # post_clear carries no pk_set, so note the tag's articles first.
+        instance._search_pending = set(instance.articles.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    from .services import knowledge_search
+
+    if not reverse:
+        knowledge_search.update_article(instance)
+        return
+    article_ids = set(pk_set or ()) | instance.__dict__.pop("_search_pending", set())
+    if article_ids:
+        knowledge_search.rebuild(KnowledgeArticle.objects.filter(pk__in=article_ids))
+
+
+@receiver(m2m_changed, sender=KnowledgeArticle.tags.through)
+def refresh_related_articles(sender, instance, action, reverse, pk_set, **kwargs):
+    from .services import related_articles
+
+    if not reverse:
+        article_ids = {instance.pk}
+    elif action == "pre_clear":
+        article_ids = set(instance.articles.values_list("pk", flat=True))
+    else:
+        article_ids = set(pk_set or ())
+    if action in ("pre_remove", "pre_clear"):
+        # Articles that only shared the outgoing tags are unreachable once the
+        # rows are gone, so collect them before the change.
+        instance._related_pending = related_articles.affected(article_ids)
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    pending = instance.__dict__.pop("_related_pending", set())
+    related_articles.rebuild(related_articles.affected(article_ids) | pending)
+    page_cache.bump_version(PAGE_CACHE_GROUPS[KnowledgeArticle])
+
+
+@receiver(post_save, sender=KnowledgeArticle)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Tool)
+@receiver(post_save, sender=CaseStudy)
+def index_related_content(sender, instance, **kwargs):
+    from .services import related_content
+
+    related_content.index(instance)
+
+
+@receiver(post_delete, sender=KnowledgeArticle)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=Tool)
+@receiver(post_delete, sender=CaseStudy)
+def remove_related_content(sender, instance, **kwargs):
+    from .services import related_content
+
+    related_content.remove(related_content.kind_of(instance), instance.pk)
+
+
+def _tagged_items(through, model, tag):
+    """Return the ``model`` rows linked to ``tag`` through ``through``."""
+    item_field = next(f for f in through._meta.fields if f.related_model is model)
+    tag_field = next(f for f in through._meta.fields if f.related_model is type(tag))
+    ids = through.objects.filter(**{tag_field.attname: tag.pk}).values(item_field.attname)
+    return model.objects.filter(pk__in=ids)
+
+
+@receiver(m2m_changed, sender=KnowledgeArticle.tags.through)
+@receiver(m2m_changed, sender=BlogPost.blog_tags.through)
+@receiver(m2m_changed, sender=Tool.tags.through)
+@receiver(m2m_changed, sender=CaseStudy.tags.through)
+def reindex_related_content_tags(sender, instance, action, reverse, model, pk_set, **kwargs):
+    from .services import related_content
+
+    if reverse and action == "pre_clear":
+        instance._related_content_pending = list(_tagged_items(sender, model, instance))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        related_content.index(instance)
+    elif action == "post_clear":
+        for item in instance.__dict__.pop("_related_content_pending", []):
+            related_content.index(item)
+    else:
+        for item in model.objects.filter(pk__in=pk_set or ()):
+            related_content.index(item)
+
+
+@receiver(post_save, sender=KnowledgeTag)
+@receiver(post_save, sender=BlogTag)
+@receiver(post_save, sender=KnowledgeCategory)
+def reindex_related_content_parents(sender, instance, created, **kwargs):
+    """Tag slugs and category status/slug are copied into the index."""
+    if created:
+        return
+    from .services import related_content
+
+    for accessor in ("articles", "posts", "tools", "case_studies"):
+        manager = getattr(instance, accessor, None)
+        if manager is not None:
+            for item in manager.all():
+                related_content.index(item)
+
+
+@receiver(post_save, sender=KnowledgeTag)
+def reindex_tagged_articles(sender, instance, created, **kwargs):
+    if created:
+        return
+    from .services import knowledge_search
+
+    knowledge_search.rebuild(instance.articles.all())
+
+
+@receiver(pre_delete, sender=KnowledgeTag)
+def collect_tagged_articles(sender, instance, **kwargs):
+    # The through rows go with the tag without an m2m_changed signal.
+    instance._search_pending = set(instance.articles.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=KnowledgeTag)
+def reindex_after_tag_delete(sender, instance, **kwargs):
+    from .services import knowledge_search
+
+    article_ids = instance.__dict__.pop("_search_pending", set())
+    if article_ids:
+        knowledge_search.rebuild(KnowledgeArticle.objects.filter(pk__in=article_ids))
+
+
+@receiver(pre_delete, sender=KnowledgeArticle)
+def collect_related_articles(sender, instance, **kwargs):
+    from .services import related_articles
+
+    instance._related_pending = related_articles.affected([instance.pk]) - {instance.pk}
+
+
+@receiver(post_delete, sender=KnowledgeArticle)
+def refresh_related_after_delete(sender, instance, **kwargs):
+    from .services import related_articles
+
+    related_articles.rebuild(instance.__dict__.pop("_related_pending", set()))
+
+
+@receiver(post_delete, sender=KnowledgeArticle)
+def remove_article_from_search(sender, instance, **kwargs):
+    from .services import knowledge_search
+
+    knowledge_search.remove_article(instance.pk)
 
 
 class ContactEvent(models.Model):
@@ -414,3 +790,265 @@ class ContactEvent(models.Model):
 
     def __str__(self):
         return f"{self.event_type} @ {self.timestamp}"
+
+
+class JobStatusChoices(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
+class SocialImageJob(TimestampedModel):
+    """Queued social image render for a blog post.
+
+    One row per post; re-saving a post re-queues its existing row. See
+    ``coresite.services.social_images`` for the worker side.
+    """
+
+    post = models.OneToOneField(
+        BlogPost, on_delete=models.CASCADE, related_name="social_image_job"
+    )
+    status = models.CharField(
+        max_length=20, choices=JobStatusChoices.choices, default=JobStatusChoices.PENDING
+    )
+    force = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="socialjob_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.post} ({self.status})"
+
+
+class PrerenderJob(TimestampedModel):
+    """Queued pre-render of one public path.
+
+    One row per path; a later change re-queues the existing row. See
+    ``coresite.services.prerender`` for the worker side.
+    """
+
+    path = models.CharField(max_length=500, unique=True)
+    status = models.CharField(
+        max_length=20, choices=JobStatusChoices.choices, default=JobStatusChoices.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="prerenderjob_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.path} ({self.status})"
+
+
+class PostStatusChoices(models.TextChoices):
+    PENDING = "pending", "Pending review"
+    PUBLISHED = "published", "Published"
+    REJECTED = "rejected", "Rejected"
+
+
+class Thread(TimestampedModel):
+    """Community question.
+
+    ``reply_count``, ``answered`` and ``last_activity_at`` are denormalized
+    from published answers by :meth:`refresh_reply_stats`, so the hub can
+    filter and sort on indexed columns without touching ``Answer``.
+    """
+
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(unique=True, blank=True)
+    body = models.TextField(blank=True)
+    author = models.CharField(max_length=100, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=PostStatusChoices.choices,
+        default=PostStatusChoices.PUBLISHED,
+    )
+    tags = models.ManyToManyField(KnowledgeTag, blank=True, related_name="threads")
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
+    answered = models.BooleanField(default=False, editable=False)
+    last_activity_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    objects = models.Manager()
+    published = PublishedManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "-last_activity_at", "-id"], name="thread_latest_idx"
+            ),
+            models.Index(
+                fields=["status", "answered", "-last_activity_at", "-id"],
+                name="thread_answered_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse("community_thread", kwargs={"slug": self.slug})
+
+    def save(self, *args, **kwargs):
+        if not self.slug and self.title:
+            self.slug = _generate_unique_slug(
+                self.title, Thread.objects.exclude(pk=self.pk), fallback="thread"
+            )
+        super().save(*args, **kwargs)
+
+    def refresh_reply_stats(self):
+        """Recompute the denormalized answer columns from published answers."""
+        stats = self.answers.filter(status=PostStatusChoices.PUBLISHED).aggregate(
+            count=models.Count("pk"),
+            accepted=models.Count("pk", filter=models.Q(accepted=True)),
+            latest=models.Max("created_at"),
+        )
+        self.reply_count = stats["count"]
+        self.answered = bool(stats["accepted"])
+        self.last_activity_at = max(filter(None, [self.created_at, stats["latest"]]))
+        Thread.objects.filter(pk=self.pk).update(
+            reply_count=self.reply_count,
+            answered=self.answered,
+            last_activity_at=self.last_activity_at,
+        )
+
+
+class Answer(TimestampedModel):
+    thread = models.ForeignKey(Thread, on_delete=models.CASCADE, related_name="answers")
+    author = models.CharField(max_length=100, blank=True)
+    body = models.TextField()
+    is_staff = models.BooleanField(default=False)
+    accepted = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=20,
+        choices=PostStatusChoices.choices,
+        default=PostStatusChoices.PUBLISHED,
+    )
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["thread", "status", "created_at"], name="answer_thread_idx"),
+        ]
+
+    def __str__(self):
+        return f"Answer by {self.author or 'anonymous'} on {self.thread}"
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def refresh_thread_reply_stats(sender, instance, **kwargs):
+    thread = Thread.objects.filter(pk=instance.thread_id).first()
+    if thread is not None:
+        thread.refresh_reply_stats()
+
+
+# Content pages list related threads, ordered by activity.
+PAGE_CACHE_GROUPS[Thread] = "community"
+PAGE_CACHE_GROUPS[Answer] = "community"
+
+
+@receiver(post_save, sender=Thread)
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Thread)
+@receiver(post_delete, sender=Answer)
+def bump_community_version(sender, **kwargs):
+    page_cache.bump_version(PAGE_CACHE_GROUPS[sender])
+
+
+@receiver(m2m_changed, sender=Thread.tags.through)
+def bump_thread_tags_version(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        page_cache.bump_version(PAGE_CACHE_GROUPS[Thread])
+
+
+@receiver(post_save, sender=Thread)
+@receiver(post_save, sender=Answer)
+@receiver(pre_delete, sender=Thread)
+@receiver(pre_delete, sender=Answer)
+def prerender_thread_changed(sender, instance, **kwargs):
+    """Re-render the pages listing the thread; its tags are unchanged by a save."""
+    from .services import prerender
+
+    if prerender.enabled():
+        prerender.schedule(prerender.paths_for(instance))
+
+
+@receiver(m2m_changed, sender=Thread.tags.through)
+def prerender_thread_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    from .services import prerender
+
+    if not prerender.enabled():
+        return
+    if reverse:
+        slugs = [instance.slug]
+    elif action == "pre_clear":
+        instance._prerender_tags = list(instance.tags.values_list("slug", flat=True))
+        return
+    elif action == "post_clear":
+        slugs = instance.__dict__.pop("_prerender_tags", [])
+    else:
+        slugs = KnowledgeTag.objects.filter(pk__in=pk_set or ()).values_list("slug", flat=True)
+    if action in ("post_add", "post_remove", "post_clear"):
+        prerender.schedule(prerender.discussion_pages(slugs))
+
+
+class ReportStatusChoices(models.TextChoices):
+    OPEN = "open", "Open"
+    RESOLVED = "resolved", "Resolved"
+    DISMISSED = "dismissed", "Dismissed"
+
+
+class ModerationReport(models.Model):
+    """A visitor report against a thread or answer.
+
+    Reports are append-only on the write path; ``compact_moderation`` folds
+    repeat reports of the same target into ``report_count``.
+    """
+
+    created_at = models.DateTimeField(default=timezone.now)
+    reporter = models.CharField(max_length=150)
+    target_type = models.CharField(max_length=20)
+    target_key = models.CharField(max_length=200)
+    target = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=20,
+        choices=ReportStatusChoices.choices,
+        default=ReportStatusChoices.OPEN,
+    )
+    report_count = models.PositiveIntegerField(default=1)
+    resolved_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at", "-id"], name="modreport_status_idx"),
+            models.Index(fields=["target_type", "target_key", "status"], name="modreport_target_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.target_type} {self.target_key} ({self.status})"
+
+
+class ModerationAuditEntry(models.Model):
+    created_at = models.DateTimeField(default=timezone.now)
+    user = models.CharField(max_length=150)
+    action = models.CharField(max_length=50)
+    target_type = models.CharField(max_length=20, blank=True)
+    target_key = models.CharField(max_length=200, blank=True)
+    target = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name_plural = "moderation audit entries"
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="modaudit_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.action} {self.target_type} {self.target_key}"
@@ -1,27 +1,134 @@
-"""Simple in-memory moderation utilities."""
+"""Moderation reports and audit log, stored in the database.
 
-from datetime import datetime
+Every worker writes to the same tables, so the queue survives restarts and
+stays bounded in memory. The write path only inserts rows (batched with
+``bulk_create``); deduplication and retention happen offline in the
+``compact_moderation`` command.
+"""
 
-REPORT_QUEUE = []
-AUDIT_LOG = []
+from datetime import timedelta
+from typing import Iterable
 
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+# Defaults for ``compact_moderation``.
+AUDIT_RETENTION_DAYS = 365
+CLOSED_REPORT_RETENTION_DAYS = 90
+DELETE_BATCH_SIZE = 1000
 
-def log_action(user, action, target):
-    AUDIT_LOG.append(
-        {
-            "timestamp": datetime.utcnow(),
-            "user": getattr(user, "username", "anonymous"),
-            "action": action,
-            "target": target,
-        }
-    )
 
+def _username(user) -> str:
+    return getattr(user, "username", "") or "anonymous"
 
-def queue_report(user, target):
-    entry = {
-        "timestamp": datetime.utcnow(),
-        "user": getattr(user, "username", "anonymous"),
+
+def _target_fields(target: dict) -> dict:
+    return {
+        "target_type": str(target.get("type", ""))[:20],
+        "target_key": ":".join(
+            str(target[key]) for key in ("thread", "id") if key in target
+        )[:200],
         "target": target,
     }
-    REPORT_QUEUE.append(entry)
-    log_action(user, "report", target)
+
+
+def log_actions(user, action: str, targets: Iterable[dict], now=None) -> None:
+    """Record ``action`` by ``user`` against each of ``targets`` in one insert."""
+    from .models import ModerationAuditEntry
+
+    now = now or timezone.now()
+    ModerationAuditEntry.objects.bulk_create(
+        [
+            ModerationAuditEntry(
+                created_at=now, user=_username(user), action=action, **_target_fields(target)
+            )
+            for target in targets
+        ]
+    )
+
+
+def log_action(user, action: str, target: dict) -> None:
+    log_actions(user, action, [target])
+
+
+def queue_reports(user, targets: Iterable[dict]) -> None:
+    """Open a report for each of ``targets`` and log them, in two inserts."""
+    from .models import ModerationReport
+
+    targets = list(targets)
+    now = timezone.now()
+    with transaction.atomic():
+        ModerationReport.objects.bulk_create(
+            [
+                ModerationReport(created_at=now, reporter=_username(user), **_target_fields(target))
+                for target in targets
+            ]
+        )
+        log_actions(user, "report", targets, now=now)
+
+
+def queue_report(user, target: dict) -> None:
+    queue_reports(user, [target])
+
+
+def _delete_in_batches(queryset, batch_size: int) -> int:
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += queryset.model.objects.filter(pk__in=ids).delete()[0]
+
+
+def compact_reports() -> int:
+    """Fold repeat open reports of a target into its oldest open report.
+
+    Returns how many duplicate rows were removed.
+    """
+    from .models import ModerationReport, ReportStatusChoices
+
+    open_reports = ModerationReport.objects.filter(status=ReportStatusChoices.OPEN)
+    groups = list(
+        open_reports.values("target_type", "target_key")
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+        .values_list("target_type", "target_key")
+    )
+    removed = 0
+    for target_type, target_key in groups:
+        with transaction.atomic():
+            rows = list(
+                open_reports.select_for_update()
+                .filter(target_type=target_type, target_key=target_key)
+                .order_by("id")
+                .values_list("pk", "report_count")
+            )
+            if len(rows) < 2:
+                continue
+            ModerationReport.objects.filter(pk=rows[0][0]).update(
+                report_count=sum(count for _, count in rows)
+            )
+            ModerationReport.objects.filter(pk__in=[pk for pk, _ in rows[1:]]).delete()
+            removed += len(rows) - 1
+    return removed
+
+
+def prune(
+    audit_days: int = AUDIT_RETENTION_DAYS,
+    report_days: int = CLOSED_REPORT_RETENTION_DAYS,
+    batch_size: int = DELETE_BATCH_SIZE,
+    now=None,
+) -> dict:
+    """Delete audit entries and closed reports past their retention window."""
+    from .models import ModerationAuditEntry, ModerationReport, ReportStatusChoices
+
+    now = now or timezone.now()
+    audit = ModerationAuditEntry.objects.filter(created_at__lt=now - timedelta(days=audit_days))
+    reports = ModerationReport.objects.exclude(status=ReportStatusChoices.OPEN).filter(
+        created_at__lt=now - timedelta(days=report_days)
+    )
+    return {
+        "audit": _delete_in_batches(audit, batch_size),
+        "reports": _delete_in_batches(reports, batch_size),
+    }
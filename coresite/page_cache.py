@@ -0,0 +1,263 @@
+"""Whole-page cache for anonymous visitors.
+
+Views opt in with :func:`cache_public_page`, naming the content groups they
+render. Each group has a version token in the cache; saving a model bumps the
+token for its group (see the receivers in ``coresite.models``), which moves
+every dependent page to a fresh key instead of deleting entries one by one.
+
+Entries are keyed on host, path, the sorted query string, the consent flag
+and the group versions. CSRF tokens are swapped for a placeholder before
+storing and re-issued per request on a hit, so cached forms keep working.
+
+The same version tokens double as validators: :func:`conditional_on` answers
+``If-None-Match``/``If-Modified-Since`` with a 304 before the view runs.
+
+Some content appears without a save: a post published with a future
+``published_at`` becomes visible when that time passes. Groups with such
+content register a :func:`register_schedule` callback; the next scheduled
+time is cached next to the version token and the group is bumped once it
+has passed.
+"""
+
+import hashlib
+import re
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.views.decorators.http import condition
+
+VERSION_KEY_PREFIX = "page_cache:version"
+SCHEDULE_KEY_PREFIX = "page_cache:next_change"
+PAGE_KEY_PREFIX = "page_cache:page"
+CSRF_PLACEHOLDER = "__page_cache_csrf__"
+
+_CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+# Response headers that are per-request and must not be replayed.
+_SKIP_HEADERS = {"vary", "set-cookie", "content-length"}
+
+
+def _version_key(group: str) -> str:
+    return f"{VERSION_KEY_PREFIX}:{group}"
+
+
+# Group -> callable returning when its content next changes on its own.
+_schedules: Dict[str, Callable[[], Optional[datetime]]] = {}
+
+
+def register_schedule(group: str, next_change: Callable[[], Optional[datetime]]) -> None:
+    """Bump ``group`` whenever the time returned by ``next_change`` passes.
+
+    ``next_change`` returns the next moment content in ``group`` changes
+    without a save, or ``None``. It runs after each bump of the group, not on
+    every request.
+    """
+    _schedules[group] = next_change
+
+
+def _schedule_key(group: str) -> str:
+    return f"{SCHEDULE_KEY_PREFIX}:{group}"
+
+
+def _next_change(group: str) -> float:
+    upcoming = _schedules[group]()
+    stamp = upcoming.timestamp() if upcoming else float("inf")
+    cache.set(_schedule_key(group), stamp, None)
+    return stamp
+
+
+def _bump(group: str) -> str:
+    token = str(time.time_ns())
+    cache.set(_version_key(group), token, None)
+    if group in _schedules:
+        cache.delete(_schedule_key(group))
+    return token
+
+
+def bump_version(group: str) -> None:
+    """Invalidate every cached page that depends on ``group``."""
+    _bump(group)
+
+
+def _version_tokens(groups: Iterable[str]) -> List[str]:
+    groups = list(groups)
+    keys = [_version_key(group) for group in groups]
+    scheduled = [group for group in groups if group in _schedules]
+    found = cache.get_many(keys + [_schedule_key(group) for group in scheduled])
+    for group in scheduled:
+        boundary = found.get(_schedule_key(group))
+        if boundary is None:
+            boundary = _next_change(group)
+        if boundary <= time.time():
+            found[_version_key(group)] = _bump(group)
+            _next_change(group)
+    missing = {key: str(time.time_ns()) for key in keys if key not in found}
+    for key, value in missing.items():
+        if not cache.add(key, value, None):
+            value = cache.get(key, value)
+        found[key] = value
+    return [found[key] for key in keys]
+
+
+def _versions(groups: Iterable[str]) -> str:
+    return ":".join(_version_tokens(groups))
+
+
+def current_version(*groups: str) -> str:
+    """Return a token that changes whenever any of ``groups`` is bumped."""
+    return _versions(groups)
+
+
+def _build_datetime() -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(settings.BUILD_DATETIME)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def last_modified(*groups: str) -> datetime:
+    """Return when content in ``groups`` (or the deployed code) last changed.
+
+    Version tokens are nanosecond timestamps written by :func:`bump_version`,
+    so this costs one cache read and no queries.
+    """
+    newest = max(int(token) for token in _version_tokens(groups))
+    stamp = datetime.fromtimestamp(newest / 1e9, tz=timezone.utc)
+    built = _build_datetime()
+    if built and built.tzinfo and built > stamp:
+        stamp = built
+    return stamp
+
+
+def _page_key(request, groups) -> str:
+    query = "&".join(
+        f"{key}={value}"
+        for key, values in sorted(request.GET.lists())
+        for value in values
+    )
+    raw = "|".join(
+        [
+            request.scheme,
+            request.get_host(),
+            request.path,
+            query,
+            "consent" if getattr(request, "CONSENT_GRANTED", False) else "no-consent",
+            _versions(groups),
+        ]
+    )
+    return f"{PAGE_KEY_PREFIX}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def _cacheable_request(request) -> bool:
+    if not getattr(settings, "PAGE_CACHE_ENABLED", False):
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if "preview" in request.GET:
+        return False
+    # Sessions and pending messages make the page visitor-specific.
+    if settings.SESSION_COOKIE_NAME in request.COOKIES or "messages" in request.COOKIES:
+        return False
+    user = getattr(request, "user", None)
+    return not getattr(user, "is_authenticated", False)
+
+
+def _cacheable_response(response) -> bool:
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    cache_control = response.get("Cache-Control", "")
+    return "private" not in cache_control and "no-store" not in cache_control
+
+
+def mask_csrf(content: str) -> str:
+    """Swap CSRF form tokens in ``content`` for ``CSRF_PLACEHOLDER``."""
+    return _CSRF_INPUT_RE.sub(rf"\g<1>{CSRF_PLACEHOLDER}\g<2>", content)
+
+
+def _freeze(response) -> dict:
+    content = response.content.decode(response.charset)
+    return {
+        "status": response.status_code,
+        "content": mask_csrf(content),
+        "headers": [
+            (name, value)
+            for name, value in response.items()
+            if name.lower() not in _SKIP_HEADERS
+        ],
+    }
+
+
+def _restore(request, frozen: dict) -> HttpResponse:
+    content = frozen["content"]
+    if CSRF_PLACEHOLDER in content:
+        content = content.replace(CSRF_PLACEHOLDER, get_token(request))
+    response = HttpResponse(content, status=frozen["status"])
+    for name, value in frozen["headers"]:
+        response[name] = value
+    response["X-Page-Cache"] = "hit"
+    return response
+
+
+def cache_public_page(*groups: str, timeout: int = None):
+    """Serve the decorated view from the page cache for anonymous visitors.
+
+    ``groups`` name the content the view renders; saving any model in one of
+    those groups invalidates the cached copy.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                return view(request, *args, **kwargs)
+            key = _page_key(request, groups)
+            frozen = cache.get(key)
+            if frozen is not None:
+                return _restore(request, frozen)
+            response = view(request, *args, **kwargs)
+            if _cacheable_response(response):
+                cache.set(
+                    key,
+                    _freeze(response),
+                    timeout if timeout is not None else settings.PAGE_CACHE_TIMEOUT,
+                )
+                response["X-Page-Cache"] = "miss"
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+def conditional_on(*groups: str):
+    """Answer conditional GETs for a view whose content comes from ``groups``.
+
+    ``Last-Modified`` and a strong ``ETag`` are derived from the group
+    versions, so a matching ``If-None-Match``/``If-Modified-Since`` returns
+    304 before the view runs. The ETag also covers the build, consent state
+    and login state, which change the rendered page without touching content.
+    """
+
+    def _etag(request, *args, **kwargs):
+        user = getattr(request, "user", None)
+        raw = "|".join(
+            [
+                request.get_full_path(),
+                _versions(groups),
+                getattr(settings, "BUILD_COMMIT", ""),
+                "consent" if getattr(request, "CONSENT_GRANTED", False) else "no-consent",
+                "auth" if getattr(user, "is_authenticated", False) else "anon",
+            ]
+        )
+        return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+    def _last_modified(request, *args, **kwargs):
+        return last_modified(*groups)
+
+    return condition(etag_func=_etag, last_modified_func=_last_modified)
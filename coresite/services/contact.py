@@ -1,19 +1,33 @@
 import hashlib
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from utils.events import BufferedSink
 
 logger = logging.getLogger(__name__)
 
 
+def _write_events(records: List[Dict[str, Any]]) -> None:
+    from coresite.models import ContactEvent
+
+    for record in records:
+        logger.info(record)
+    ContactEvent.objects.bulk_create(
+        [
+            ContactEvent(
+                event_type=record["event"], meta=record["meta"], ip_hash=record["ip_hash"]
+            )
+            for record in records
+        ]
+    )
+
+
+sink = BufferedSink("contact", _write_events)
+
+
 def contact_event(event_type: str, meta: Dict[str, Any]) -> None:
-    """Log a contact event and optionally persist it."""
+    """Log a contact event and queue it for persistence."""
     meta = dict(meta)
     ip = meta.pop("ip", "")
     ip_hash = hashlib.sha256(ip.encode()).hexdigest() if ip else ""
-    logger.info({"event": event_type, "meta": meta, "ip_hash": ip_hash})
-    try:
-        from coresite.models import ContactEvent
-
-        ContactEvent.objects.create(event_type=event_type, meta=meta, ip_hash=ip_hash)
-    except Exception:
-        pass
+    sink.emit({"event": event_type, "meta": meta, "ip_hash": ip_hash})
@@ -0,0 +1,125 @@
+"""Full-text search over knowledge articles.
+
+PostgreSQL keeps a weighted ``tsvector`` in ``KnowledgeArticle.search_vector``
+backed by a GIN index. SQLite mirrors the searchable text into an FTS5 table
+keyed by article id. Other backends fall back to ``icontains`` matching.
+"""
+
+import re
+from typing import Iterable, List
+
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, QuerySet, Value, When
+
+FTS_TABLE = "coresite_knowledgearticle_fts"
+SEARCH_CONFIG = "english"
+
+# Column weights: title matches outrank blurb matches, which outrank tags.
+FTS_WEIGHTS = (10.0, 4.0, 2.0)
+
+# SQLite returns ranked ids to the ORM; cap them so the follow-up query stays
+# small however broad the search term is.
+MAX_RESULTS = 500
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _terms(query: str) -> List[str]:
+    return _TERM_RE.findall(query.lower())
+
+
+def _tag_names(article) -> str:
+    return " ".join(tag.name for tag in article.tags.all())
+
+
+def update_article(article) -> None:
+    """Refresh the search index entry for ``article``."""
+    if not article.pk:
+        return
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import SearchVector
+
+        vector = (
+            SearchVector(Value(article.title), weight="A", config=SEARCH_CONFIG)
+            + SearchVector(Value(article.blurb), weight="B", config=SEARCH_CONFIG)
+            + SearchVector(Value(_tag_names(article)), weight="C", config=SEARCH_CONFIG)
+        )
+        type(article).objects.filter(pk=article.pk).update(search_vector=vector)
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, blurb, tags) VALUES (%s, %s, %s, %s)",
+                [article.pk, article.title, article.blurb, _tag_names(article)],
+            )
+
+
+def remove_article(pk: int) -> None:
+    """Drop ``pk`` from the SQLite shadow table.
+
+    PostgreSQL needs no cleanup because the vector lives on the row itself.
+    """
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild(articles: Iterable) -> int:
+    """Reindex every article in ``articles`` and return how many were written."""
+    count = 0
+    for article in articles:
+        update_article(article)
+        count += 1
+    return count
+
+
+def search(queryset: QuerySet, query: str) -> QuerySet:
+    """Filter ``queryset`` to articles matching ``query``, best matches first."""
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        ts_query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+        return (
+            queryset.filter(search_vector=ts_query)
+            .annotate(search_rank=SearchRank(F("search_vector"), ts_query))
+            .order_by("-search_rank", "-published_at")
+        )
+
+    if connection.vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s",
+                [match, MAX_RESULTS],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return queryset.none()
+        ranking = Case(
+            *[When(pk=pk, then=Value(pos)) for pos, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return (
+            queryset.filter(pk__in=ids)
+            .annotate(search_rank=ranking)
+            .order_by("search_rank", "-published_at")
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(title__icontains=term)
+            | Q(blurb__icontains=term)
+            | Q(tags__name__icontains=term)
+        )
+    return queryset.filter(condition).distinct()
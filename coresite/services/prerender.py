@@ -0,0 +1,413 @@
+"""Publish-time pre-rendering of public pages to static files.
+
+Public pages only change when an editor saves content, so they can be
+rendered once and served by the web server without reaching Django. Each
+path is requested through the full middleware stack as an anonymous visitor
+without consent and written under ``PRERENDER_ROOT``:
+
+* HTML pages go to ``<path>/index.html``;
+* feeds go to ``<path>/index.xml`` or ``<path>/index.json``;
+* paths with an extension (``/sitemap.xml``, ``/robots.txt``) keep their name.
+
+Paths that now 404, 410 or redirect have their files removed; other errors
+keep the last good copy. CSRF tokens are
+replaced with ``page_cache.CSRF_PLACEHOLDER``; ``main.js`` fetches a real
+token from ``/csrf/`` before such a form is submitted.
+
+``python manage.py prerender`` renders everything. With
+``PRERENDER_ENABLED`` on, the receivers in ``coresite.models`` queue the
+pages affected by each save as ``PrerenderJob`` rows once the transaction
+commits, and the ``process_prerender_queue`` worker renders them off the
+request path.
+"""
+
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from coresite import page_cache
+from coresite.services import sitemaps
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILES = {
+    "html": "index.html",
+    "xml": "index.xml",
+    "json": "index.json",
+}
+
+# Responses meaning the page is no longer served from a static copy.
+GONE_STATUSES = {301, 302, 404, 410}
+
+# Hub pages that list content but have no model of their own.
+HUB_PAGES = [
+    "home",
+    "case_studies",
+    "tools",
+    "resources",
+    "about",
+    "support",
+    "legal",
+]
+KNOWLEDGE_PAGES = [
+    "knowledge",
+    "knowledge_guides",
+    "knowledge_signals",
+    "knowledge_glossary",
+    "knowledge_quick_wins",
+    "knowledge_rss",
+    "knowledge_atom",
+    "knowledge_json",
+]
+BLOG_PAGES = ["blog", "blog_rss", "blog_atom", "blog_json"]
+
+# Set on the worker's requests so views can skip side effects meant for real
+# visitors, such as newsletter_block_view events.
+PRERENDER_HEADER = "HTTP_X_TF_PRERENDER"
+
+MAX_ATTEMPTS = 3
+# Running jobs older than this are assumed to belong to a dead worker.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def root() -> Path:
+    return Path(settings.PRERENDER_ROOT)
+
+
+def _kind(content_type: str) -> str:
+    if "json" in content_type:
+        return "json"
+    if "xml" in content_type:
+        return "xml"
+    return "html"
+
+
+def _targets(path: str) -> List[Path]:
+    """Return every file ``path`` may have been written to."""
+    base = root().resolve()
+    relative = path.lstrip("/")
+    if relative and not relative.endswith("/"):
+        candidates = [base / relative]
+    else:
+        candidates = [base / relative / name for name in INDEX_FILES.values()]
+    for candidate in candidates:
+        if base not in candidate.resolve().parents:
+            raise ValueError(f"Refusing to write outside PRERENDER_ROOT: {path}")
+    return candidates
+
+
+def target(path: str, content_type: str) -> Path:
+    """Return the file ``path`` is written to for ``content_type``."""
+    candidates = _targets(path)
+    if len(candidates) == 1:
+        return candidates[0]
+    return candidates[list(INDEX_FILES).index(_kind(content_type))]
+
+
+def _write(dest: Path, content: bytes) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=".prerender-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _remove(path: str) -> bool:
+    removed = False
+    for candidate in _targets(path):
+        if candidate.exists():
+            candidate.unlink()
+            removed = True
+    return removed
+
+
+def _client() -> Client:
+    base = urlsplit(settings.SITE_BASE_URL)
+    return Client(
+        raise_request_exception=False,
+        HTTP_HOST=base.netloc,
+        secure=base.scheme == "https",
+        **{PRERENDER_HEADER: "1"},
+    )
+
+
+def is_prerender_request(request) -> bool:
+    """Return ``True`` for requests made by the pre-render worker."""
+    return request.META.get(PRERENDER_HEADER) == "1"
+
+
+def render(paths: Iterable[str]) -> Dict[str, int]:
+    """Render ``paths`` to disk; returns counts of written/removed/failed."""
+    client = _client()
+    stats = {"written": 0, "removed": 0, "failed": 0}
+    for path in sorted(set(paths)):
+        response = client.get(path)
+        if response.status_code == 200 and not response.streaming:
+            content = response.content
+            kind = _kind(response.get("Content-Type", ""))
+            if kind == "html":
+                charset = response.charset
+                content = page_cache.mask_csrf(content.decode(charset)).encode(charset)
+            for candidate in _targets(path):
+                if candidate.exists() and candidate != target(path, kind):
+                    candidate.unlink()
+            _write(target(path, kind), content)
+            stats["written"] += 1
+        elif response.status_code in GONE_STATUSES:
+            if _remove(path):
+                stats["removed"] += 1
+        else:
+            # Keep serving the last good copy rather than a hole.
+            logger.warning("Pre-render of %s failed with %s", path, response.status_code)
+            stats["failed"] += 1
+    return stats
+
+
+def _sitemap_paths() -> List[str]:
+    paths = ["/sitemap.xml"]
+    paths.extend(sitemaps.shard_path(name, page) for name, page, _ in sitemaps.shards())
+    return paths
+
+
+def _tag_pages(tags: Iterable[str]) -> Set[str]:
+    """Blog posts and tag pages whose related blocks draw on ``tags``."""
+    from coresite.models import ContentKindChoices, TaggedContent
+
+    tags = [tag for tag in tags if tag]
+    if not tags:
+        return set()
+    rows = TaggedContent.objects.filter(tag__in=tags, kind=ContentKindChoices.BLOG)
+    paths = set(rows.values_list("url", flat=True))
+    paths.update(reverse("blog_tag", kwargs={"tag_slug": tag}) for tag in tags)
+    return paths
+
+
+def discussion_pages(tags: Iterable[str]) -> Set[str]:
+    """Content pages whose related discussions draw on ``tags``."""
+    from coresite.models import TaggedContent
+
+    tags = [tag for tag in tags if tag]
+    if not tags:
+        return set()
+    return set(TaggedContent.objects.filter(tag__in=tags).values_list("url", flat=True))
+
+
+def paths_for(obj) -> Set[str]:
+    """Return the public paths whose output depends on ``obj``."""
+    from coresite.models import (
+        Answer,
+        BlogPost,
+        CaseStudy,
+        KnowledgeArticle,
+        KnowledgeCategory,
+        SiteImage,
+        Thread,
+        Tool,
+    )
+
+    if isinstance(obj, Answer):
+        obj = obj.thread
+    if isinstance(obj, Thread):
+        return discussion_pages(obj.tags.values_list("slug", flat=True))
+    if isinstance(obj, SiteImage):
+        return {reverse("home")}
+    paths = set(_sitemap_paths())
+    if isinstance(obj, BlogPost):
+        paths.update(reverse(name) for name in BLOG_PAGES)
+        if obj.slug:
+            paths.add(reverse("blog_post", kwargs={"post_slug": obj.slug}))
+        if obj.category_slug:
+            paths.add(reverse("blog_category", kwargs={"category_slug": obj.category_slug}))
+        paths.update(
+            reverse("blog_tag", kwargs={"tag_slug": slug})
+            for slug in obj.blog_tags.values_list("slug", flat=True)
+        )
+    elif isinstance(obj, KnowledgeArticle):
+        paths.update(reverse(name) for name in KNOWLEDGE_PAGES)
+        paths.add(reverse("knowledge_category", kwargs={"category_slug": obj.category.slug}))
+        if obj.slug:
+            paths.add(obj.get_absolute_url())
+        # Articles listing this one under "related".
+        paths.update(
+            article.get_absolute_url()
+            for article in KnowledgeArticle.objects.filter(
+                related_links__related=obj
+            ).select_related("category")
+        )
+        paths.update(_tag_pages(obj.tags.values_list("slug", flat=True)))
+    elif isinstance(obj, KnowledgeCategory):
+        paths.update(reverse(name) for name in KNOWLEDGE_PAGES)
+        if obj.slug:
+            paths.add(reverse("knowledge_category", kwargs={"category_slug": obj.slug}))
+        # Article pages show their category's title and slug.
+        paths.update(
+            article.get_absolute_url()
+            for article in obj.articles.select_related("category").only(
+                "slug", "category__slug"
+            )
+        )
+    elif isinstance(obj, (CaseStudy, Tool)):
+        hub = "case_studies" if isinstance(obj, CaseStudy) else "tools"
+        paths.update([reverse("home"), reverse(hub)])
+        if obj.slug:
+            paths.add(obj.get_absolute_url())
+        paths.update(_tag_pages(obj.tags.values_list("slug", flat=True)))
+    return paths
+
+
+def all_paths() -> Set[str]:
+    """Return every public path that can be pre-rendered."""
+    from coresite.models import BlogPost, BlogTag, CaseStudy, Tool
+
+    paths = {reverse(name) for name in HUB_PAGES + KNOWLEDGE_PAGES + BLOG_PAGES}
+    paths.update(_sitemap_paths())
+    paths.add("/robots.txt")
+    for name in ("knowledge-categories", "knowledge"):
+        section = sitemaps.get_section(name)
+        for obj in section.queryset().iterator(chunk_size=500):
+            paths.add(section.entry(obj)[0])
+    for post in BlogPost.published.only("slug", "category_slug").iterator(chunk_size=500):
+        paths.add(reverse("blog_post", kwargs={"post_slug": post.slug}))
+        if post.category_slug:
+            paths.add(reverse("blog_category", kwargs={"category_slug": post.category_slug}))
+    for slug in BlogTag.objects.filter(posts__isnull=False).values_list("slug", flat=True).distinct():
+        paths.add(reverse("blog_tag", kwargs={"tag_slug": slug}))
+    for model in (CaseStudy, Tool):
+        for obj in model.objects.filter(is_published=True).only("slug").iterator(chunk_size=500):
+            paths.add(obj.get_absolute_url())
+    return paths
+
+
+def render_all(prune: bool = True) -> Dict[str, int]:
+    """Render every public path; with ``prune``, delete files for other paths."""
+    paths = all_paths()
+    stats = render(paths)
+    stats["pruned"] = 0
+    if prune and root().exists():
+        keep = set()
+        for path in paths:
+            keep.update(_targets(path))
+        for dirpath, _, filenames in os.walk(root().resolve()):
+            for filename in filenames:
+                candidate = Path(dirpath) / filename
+                if candidate not in keep:
+                    candidate.unlink()
+                    stats["pruned"] += 1
+    return stats
+
+
+def enabled() -> bool:
+    return getattr(settings, "PRERENDER_ENABLED", False)
+
+
+def enqueue(paths: Iterable[str]) -> int:
+    """Queue (or re-queue) ``paths`` for the worker; returns how many."""
+    from coresite.models import JobStatusChoices, PrerenderJob
+
+    jobs = [
+        PrerenderJob(path=path, status=JobStatusChoices.PENDING)
+        for path in sorted(set(paths))
+    ]
+    PrerenderJob.objects.bulk_create(
+        jobs,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["path"],
+        update_fields=["status", "attempts", "last_error", "updated_at"],
+    )
+    return len(jobs)
+
+
+def schedule(paths: Iterable[str] = (), obj=None) -> None:
+    """Queue ``paths`` plus the pages of ``obj`` once the transaction commits."""
+    paths = set(paths)
+
+    def run():
+        pending = set(paths)
+        if obj is not None:
+            pending |= paths_for(obj)
+        enqueue(pending)
+
+    transaction.on_commit(run)
+
+
+def claim_jobs(limit: int) -> List:
+    """Mark up to ``limit`` runnable jobs as running and return them.
+
+    Rows are locked with ``SKIP LOCKED`` where the database supports it, so
+    several workers can drain the queue without picking the same path.
+    """
+    from coresite.models import JobStatusChoices, PrerenderJob
+
+    now = timezone.now()
+    runnable = Q(status=JobStatusChoices.PENDING) | Q(
+        status=JobStatusChoices.RUNNING,
+        updated_at__lt=now - STALE_AFTER,
+        attempts__lt=MAX_ATTEMPTS,
+    )
+    with transaction.atomic():
+        ids = list(
+            PrerenderJob.objects.select_for_update(skip_locked=True)
+            .filter(runnable)
+            .order_by("updated_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+        PrerenderJob.objects.filter(pk__in=ids).update(
+            status=JobStatusChoices.RUNNING,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+    return list(PrerenderJob.objects.filter(pk__in=ids))
+
+
+def process_pending(limit: int = 50) -> Tuple[int, Dict[str, int]]:
+    """Render one batch of queued paths. Returns ``(claimed, stats)``.
+
+    Jobs re-queued while rendering stay pending, so the newer change is
+    rendered again by the next batch.
+    """
+    from coresite.models import JobStatusChoices, PrerenderJob
+
+    jobs = claim_jobs(limit)
+    if not jobs:
+        return 0, {"written": 0, "removed": 0, "failed": 0}
+    claimed = PrerenderJob.objects.filter(
+        pk__in=[job.pk for job in jobs],
+        status=JobStatusChoices.RUNNING,
+        updated_at=jobs[0].updated_at,
+    )
+    try:
+        stats = render(job.path for job in jobs)
+    except Exception as exc:
+        logger.exception("Pre-render of %d queued path(s) failed", len(jobs))
+        claimed.filter(attempts__gte=MAX_ATTEMPTS).update(
+            status=JobStatusChoices.FAILED, last_error=str(exc)[:1000]
+        )
+        claimed.update(status=JobStatusChoices.PENDING, last_error=str(exc)[:1000])
+        return len(jobs), {"written": 0, "removed": 0, "failed": len(jobs)}
+    claimed.update(status=JobStatusChoices.DONE, last_error="")
+    return len(jobs), stats
+
+
+def previous_paths(obj) -> Optional[Set[str]]:
+    """Return the paths of the saved copy of ``obj``, before an edit."""
+    if not obj.pk:
+        return None
+    previous = type(obj).objects.filter(pk=obj.pk).first()
+    return paths_for(previous) if previous is not None else None
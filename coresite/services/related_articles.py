@@ -0,0 +1,158 @@
+"""Precomputed "related articles" for knowledge articles.
+
+Each article keeps its top ``STORED_LIMIT`` neighbours in
+``RelatedKnowledgeArticle``, ranked by shared tags, same category and
+recency. Changing an article's category, status, publish date or tags, or
+deleting it, recomputes the lists that can change: its own and, when it is
+or was published, those of every article sharing a tag or category with it
+(see :func:`affected` and the receivers in ``coresite.models``). Edits to
+other fields rebuild nothing. The article page reads its list with one
+indexed query.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+STORED_LIMIT = 10
+TAG_WEIGHT = 3.0
+CATEGORY_WEIGHT = 2.0
+# Recency adds up to 1 point, halving every ``RECENCY_HALF_LIFE_DAYS``; it
+# mostly breaks ties between equally related articles.
+RECENCY_HALF_LIFE_DAYS = 90.0
+
+PUBLISHED = "published"
+
+
+def _models(apps=None):
+    if apps is None:
+        from coresite.models import KnowledgeArticle, RelatedKnowledgeArticle
+    else:
+        KnowledgeArticle = apps.get_model("coresite", "KnowledgeArticle")
+        RelatedKnowledgeArticle = apps.get_model("coresite", "RelatedKnowledgeArticle")
+    return KnowledgeArticle, RelatedKnowledgeArticle
+
+
+def _tag_sets(Article, ids) -> Dict[int, Set[int]]:
+    pairs = Article.tags.through.objects.filter(knowledgearticle_id__in=ids)
+    tags = defaultdict(set)
+    for article_id, tag_id in pairs.values_list("knowledgearticle_id", "knowledgetag_id"):
+        tags[article_id].add(tag_id)
+    return tags
+
+
+def _recency(published_at, now) -> float:
+    if published_at is None:
+        return 0.0
+    age_days = max((now - published_at).total_seconds() / 86400, 0.0)
+    return 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def _rank(source, candidates, now) -> List[Tuple[int, float]]:
+    source_id, category_id, tags = source
+    scored = []
+    for cand_id, (cand_category, published_at, cand_tags) in candidates.items():
+        if cand_id == source_id:
+            continue
+        shared = len(tags & cand_tags)
+        same_category = cand_category == category_id
+        if not shared and not same_category:
+            continue
+        score = shared * TAG_WEIGHT + (CATEGORY_WEIGHT if same_category else 0.0)
+        scored.append((score + _recency(published_at, now), cand_id))
+    scored.sort(reverse=True)
+    return [(cand_id, score) for score, cand_id in scored[:STORED_LIMIT]]
+
+
+def rebuild(article_ids: Iterable[int], apps=None) -> int:
+    """Recompute stored related lists for ``article_ids``; returns rows written."""
+    Article, Relation = _models(apps)
+    article_ids = set(article_ids)
+    if not article_ids:
+        return 0
+    now = timezone.now()
+    sources = list(
+        Article.objects.filter(pk__in=article_ids).values_list("id", "category_id")
+    )
+    source_tags = _tag_sets(Article, article_ids)
+    category_ids = {category_id for _, category_id in sources}
+    tag_ids = set().union(*source_tags.values())
+    # Only articles sharing a category or tag can score, so fetch just those.
+    # Scheduled articles are included; the read query hides them until due.
+    published = (
+        Article.objects.filter(status=PUBLISHED)
+        .filter(Q(category_id__in=category_ids) | Q(tags__in=tag_ids))
+        .values_list("id", "category_id", "published_at")
+        .distinct()
+    )
+    candidates = {pk: (category_id, published_at) for pk, category_id, published_at in published}
+    candidate_tags = _tag_sets(Article, candidates)
+    candidates = {
+        pk: (category_id, published_at, candidate_tags.get(pk, set()))
+        for pk, (category_id, published_at) in candidates.items()
+    }
+    rows = []
+    for pk, category_id in sources:
+        ranked = _rank((pk, category_id, source_tags.get(pk, set())), candidates, now)
+        for rank, (related_id, score) in enumerate(ranked):
+            rows.append(Relation(article_id=pk, related_id=related_id, rank=rank, score=score))
+    with transaction.atomic():
+        Relation.objects.filter(article_id__in=article_ids).delete()
+        Relation.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def rebuild_all(batch_size: int = 200, apps=None) -> int:
+    """Recompute every stored related list in batches; returns rows written."""
+    Article, _ = _models(apps)
+    ids = list(Article.objects.order_by("pk").values_list("pk", flat=True))
+    return sum(rebuild(ids[i : i + batch_size], apps=apps) for i in range(0, len(ids), batch_size))
+
+
+def neighbours(article_ids: Iterable[int]) -> Set[int]:
+    """Return ``article_ids`` plus every article sharing a category or tag with them."""
+    from coresite.models import KnowledgeArticle
+
+    article_ids = set(article_ids)
+    if not article_ids:
+        return set()
+    sources = KnowledgeArticle.objects.filter(pk__in=article_ids)
+    category_ids = sources.values_list("category_id", flat=True)
+    tag_ids = KnowledgeArticle.tags.through.objects.filter(
+        knowledgearticle_id__in=article_ids
+    ).values_list("knowledgetag_id", flat=True)
+    related = (
+        KnowledgeArticle.objects.filter(Q(category_id__in=category_ids) | Q(tags__in=tag_ids))
+        .values_list("id", flat=True)
+        .distinct()
+    )
+    return article_ids | set(related)
+
+
+def affected(article_ids: Iterable[int]) -> Set[int]:
+    """Return the articles whose stored lists can change with ``article_ids``.
+
+    Only published articles are candidates, so a draft's neighbours are
+    unaffected by it.
+    """
+    from coresite.models import KnowledgeArticle
+
+    article_ids = set(article_ids)
+    if not article_ids:
+        return set()
+    published = KnowledgeArticle.objects.filter(pk__in=article_ids, status=PUBLISHED)
+    return article_ids | neighbours(published.values_list("pk", flat=True))
+
+
+def related_articles(article, limit: int = 3):
+    """Return up to ``limit`` published articles related to ``article``."""
+    from coresite.models import KnowledgeArticle
+
+    return list(
+        KnowledgeArticle.published.filter(related_from__article=article)
+        .select_related("category")
+        .order_by("related_from__rank")[:limit]
+    )
@@ -0,0 +1,220 @@
+"""Cross-type related content over a shared tag taxonomy.
+
+Knowledge articles, tools and case studies are tagged with ``KnowledgeTag``;
+blog posts keep their own ``BlogTag`` rows, which share the same slugs. Every
+published item is copied into ``TaggedContent`` once per tag, giving an
+inverted index from tag slug to items. :func:`related` reads that index for a
+tag set and caches the top items per kind, so related blocks cost one cache
+read per request however large the catalogue grows.
+
+The receivers in ``coresite.models`` call :func:`index` and :func:`remove`
+whenever an item or its tags change; each change bumps the
+``related_content`` page cache group, which marks the cached results stale.
+One request then recomputes each result while the rest wait for it
+(``utils.singleflight``).
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from coresite import page_cache
+from utils import singleflight
+
+GROUP = "related_content"
+CACHE_PREFIX = "related_content"
+# Bounds how long a scheduled item can stay hidden after its publish time.
+CACHE_TIMEOUT = 3600
+
+# Items shown per kind by the "Related across TF" blocks.
+DEFAULT_LIMITS = {"knowledge": 2, "tools": 1, "case_studies": 1}
+
+KNOWLEDGE = "knowledge"
+BLOG = "blog"
+TOOLS = "tools"
+CASE_STUDIES = "case_studies"
+
+PUBLISHED = "published"
+
+_MODELS = {
+    KNOWLEDGE: "KnowledgeArticle",
+    BLOG: "BlogPost",
+    TOOLS: "Tool",
+    CASE_STUDIES: "CaseStudy",
+}
+
+
+def kind_of(obj) -> Optional[str]:
+    """Return the index kind for ``obj``, or ``None`` if it is not indexed."""
+    name = type(obj).__name__
+    for kind, model_name in _MODELS.items():
+        if model_name == name:
+            return kind
+    return None
+
+
+def _entry(kind: str, obj) -> Optional[dict]:
+    """Return the indexed fields for ``obj``, or ``None`` if it is not public.
+
+    Works with historical models, so URLs are reversed here rather than via
+    ``get_absolute_url``.
+    """
+    if kind == KNOWLEDGE:
+        if obj.status != PUBLISHED or not obj.published_at or obj.category.status != PUBLISHED:
+            return None
+        url = reverse(
+            "knowledge_article",
+            kwargs={"category_slug": obj.category.slug, "article_slug": obj.slug},
+        )
+        tags = obj.tags.values_list("slug", flat=True)
+    elif kind == BLOG:
+        if obj.status != PUBLISHED or not obj.published_at:
+            return None
+        url = reverse("blog_post", kwargs={"post_slug": obj.slug})
+        tags = obj.blog_tags.values_list("slug", flat=True)
+    else:
+        if not obj.is_published:
+            return None
+        name = "tool_detail" if kind == TOOLS else "case_study_detail"
+        url = reverse(name, kwargs={"slug": obj.slug})
+        tags = obj.tags.values_list("slug", flat=True)
+    return {
+        "title": obj.title,
+        "url": url,
+        "published_at": getattr(obj, "published_at", None),
+        "tags": sorted(set(tags)),
+    }
+
+
+def _store(kind: str, obj, apps) -> int:
+    TaggedContent = apps.get_model("coresite", "TaggedContent")
+    entry = _entry(kind, obj)
+    rows = []
+    if entry:
+        rows = [
+            TaggedContent(
+                tag=tag,
+                kind=kind,
+                object_id=obj.pk,
+                title=entry["title"],
+                url=entry["url"],
+                published_at=entry["published_at"],
+            )
+            for tag in entry["tags"]
+        ]
+    with transaction.atomic():
+        TaggedContent.objects.filter(kind=kind, object_id=obj.pk).delete()
+        TaggedContent.objects.bulk_create(rows)
+    return len(rows)
+
+
+def index(obj) -> int:
+    """Rewrite the index rows for ``obj``; returns how many were stored."""
+    from django.apps import apps
+
+    kind = kind_of(obj)
+    if kind is None or not obj.pk:
+        return 0
+    count = _store(kind, obj, apps)
+    page_cache.bump_version(GROUP)
+    return count
+
+
+def index_many(objs: Iterable) -> int:
+    """Like :func:`index` for several items, bumping the cache group once."""
+    from django.apps import apps
+
+    count = 0
+    for obj in objs:
+        kind = kind_of(obj)
+        if kind is not None and obj.pk:
+            count += _store(kind, obj, apps)
+    page_cache.bump_version(GROUP)
+    return count
+
+
+def remove(kind: str, pk: int) -> None:
+    """Drop every index row for the ``kind`` item ``pk``."""
+    from coresite.models import TaggedContent
+
+    TaggedContent.objects.filter(kind=kind, object_id=pk).delete()
+    page_cache.bump_version(GROUP)
+
+
+def rebuild_all(apps=None) -> int:
+    """Reindex every item of every kind; returns how many rows were stored.
+
+    Pass ``apps`` from a data migration to run against historical models.
+    """
+    live = apps is None
+    if live:
+        from django.apps import apps
+    count = 0
+    for kind, model_name in _MODELS.items():
+        queryset = apps.get_model("coresite", model_name).objects.all()
+        if kind == KNOWLEDGE:
+            queryset = queryset.select_related("category")
+        for obj in queryset.iterator(chunk_size=500):
+            count += _store(kind, obj, apps)
+    if live:
+        page_cache.bump_version(GROUP)
+    return count
+
+
+def _cache_key(tags: List[str], limits: Dict[str, int]) -> str:
+    raw = "|".join(
+        [
+            ",".join(tags),
+            ",".join(f"{kind}={limit}" for kind, limit in sorted(limits.items())),
+        ]
+    )
+    return f"{CACHE_PREFIX}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def _query(tags: List[str], limits: Dict[str, int]) -> Dict[str, List[dict]]:
+    from coresite.models import TaggedContent
+
+    rows = (
+        TaggedContent.objects.filter(tag__in=tags, kind__in=list(limits))
+        .filter(Q(published_at__isnull=True) | Q(published_at__lte=timezone.now()))
+        .values_list("kind", "object_id", "title", "url", "published_at")
+    )
+    items = {}
+    shared = defaultdict(int)
+    for kind, object_id, title, url, published_at in rows:
+        items[(kind, object_id)] = (title, url, published_at)
+        shared[(kind, object_id)] += 1
+    ranked = sorted(
+        items,
+        key=lambda key: (shared[key], items[key][2].timestamp() if items[key][2] else 0.0),
+        reverse=True,
+    )
+    result = {kind: [] for kind in limits}
+    for kind, object_id in ranked:
+        if len(result[kind]) < limits[kind]:
+            title, url, _ = items[(kind, object_id)]
+            result[kind].append({"title": title, "url": url})
+    return result
+
+
+def related(tags: Iterable[str], limits: Optional[Dict[str, int]] = None) -> Dict[str, List[dict]]:
+    """Return ``{kind: [{"title", "url"}, ...]}`` for items sharing ``tags``.
+
+    Items sharing more tags rank first, then newer items. ``limits`` maps
+    each kind to show onto its item count (defaults to ``DEFAULT_LIMITS``).
+    """
+    limits = dict(DEFAULT_LIMITS if limits is None else limits)
+    tags = sorted({tag for tag in tags if tag})
+    if not tags:
+        return {kind: [] for kind in limits}
+    return singleflight.get_or_set(
+        _cache_key(tags, limits),
+        lambda: _query(tags, limits),
+        CACHE_TIMEOUT,
+        version=page_cache.current_version(GROUP),
+    )
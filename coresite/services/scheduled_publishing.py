@@ -0,0 +1,106 @@
+"""Promote scheduled knowledge articles when their publish time arrives.
+
+Editors schedule an article by saving it as a draft with a future
+``published_at``. :func:`publish_due` flips every due draft to published
+with one ``UPDATE`` per batch, then runs the work ``KnowledgeArticle.save``
+and its receivers would have done once for the whole batch: related lists,
+the related content index, page cache, sitemap and feed invalidation, and
+queueing pre-rendered pages.
+
+``python manage.py publish_scheduled_articles --watch`` runs it as a
+long-lived process that sleeps until the next scheduled ``published_at``.
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from coresite import feeds, page_cache
+from coresite.services import prerender, related_articles, related_content
+
+logger = logging.getLogger(__name__)
+
+GROUP = "knowledge"
+BATCH_SIZE = 500
+
+
+def _scheduled():
+    from coresite.models import KnowledgeArticle, StatusChoices
+
+    return KnowledgeArticle.objects.filter(
+        status=StatusChoices.DRAFT, published_at__isnull=False
+    )
+
+
+def next_due() -> Optional[datetime]:
+    """Return the earliest ``published_at`` among scheduled drafts."""
+    return (
+        _scheduled().order_by("published_at").values_list("published_at", flat=True).first()
+    )
+
+
+def publish_due(now: Optional[datetime] = None, batch_size: int = BATCH_SIZE) -> List[int]:
+    """Publish up to ``batch_size`` due drafts; returns their ids."""
+    from coresite.models import KnowledgeArticle, StatusChoices
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        ids = list(
+            _scheduled()
+            .filter(published_at__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by("published_at", "pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        KnowledgeArticle.objects.filter(pk__in=ids).update(
+            status=StatusChoices.PUBLISHED, updated_at=now
+        )
+        transaction.on_commit(lambda: _after_publish(ids), robust=True)
+    return ids
+
+
+def publish_all_due(now: Optional[datetime] = None, batch_size: int = BATCH_SIZE) -> int:
+    """Publish every due draft in batches; returns how many were published."""
+    total = 0
+    while True:
+        ids = publish_due(now, batch_size)
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+
+
+def _enqueue_prerender(articles) -> None:
+    if prerender.enabled():
+        paths = set()
+        for article in articles:
+            paths |= prerender.paths_for(article)
+        prerender.enqueue(paths)
+
+
+def _after_publish(ids: List[int]) -> None:
+    """Run the batch's follow-up steps; one failing does not skip the rest.
+
+    The rows are already published, so a failure is logged rather than
+    raised into the ``--watch`` loop.
+    """
+    from coresite.models import KnowledgeArticle
+
+    articles = list(KnowledgeArticle.objects.filter(pk__in=ids).select_related("category"))
+    steps = [
+        ("page cache", lambda: page_cache.bump_version(GROUP)),
+        ("related articles", lambda: related_articles.rebuild(related_articles.neighbours(ids))),
+        ("related content", lambda: related_content.index_many(articles)),
+        ("feeds", lambda: feeds.refresh(GROUP, stale_only=True)),
+        ("pre-render", lambda: _enqueue_prerender(articles)),
+    ]
+    for name, step in steps:
+        try:
+            step()
+        except Exception:
+            logger.exception("Updating %s after publishing %d articles failed", name, len(ids))
+    logger.info("Published %d scheduled articles", len(ids))
@@ -0,0 +1,246 @@
+"""Sharded XML sitemaps.
+
+``/sitemap.xml`` is a sitemap index pointing at one or more shards per
+section (``/sitemap-blog-1.xml``, ``/sitemap-knowledge-1.xml`` ...). Each
+shard holds at most ``SHARD_SIZE`` URLs, is built by streaming its rows with
+``.iterator()`` and is cached against its section's page cache version, so an
+edit to a blog post only rebuilds the index and the blog shards. Rebuilds go
+through ``utils.singleflight``: one worker regenerates a shard while the
+others wait for it.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, Max, QuerySet
+from django.urls import reverse
+
+from coresite import page_cache
+from utils import singleflight
+
+# Well under the protocol's 50,000 URL limit, so a shard rebuild stays cheap.
+SHARD_SIZE = 5000
+CACHE_PREFIX = "sitemap"
+# Bounds how long a scheduled item can stay out of the sitemap.
+CACHE_TIMEOUT = 60 * 60
+
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# Shard for the hand-listed hub pages; it has no model behind it.
+PAGES = "pages"
+
+Entry = Tuple[str, Optional[datetime], str, str]
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    group: str
+    queryset: Callable[[], QuerySet]
+    entry: Callable[[object], Entry]
+
+
+def top_level_urls() -> List[dict]:
+    """Hub pages listed ahead of the content sections."""
+    paths = [
+        ("/", "1.0"),
+        ("/knowledge/", "0.8"),
+        ("/blog/", "0.8"),
+        ("/resources/", "0.8"),
+    ]
+    if settings.CASE_STUDIES_INDEXABLE:
+        paths.append(("/case-studies/", "0.7"))
+    if settings.TOOLS_INDEXABLE:
+        paths.append(("/tools/", "0.7"))
+    # Legacy endpoints like /services/, /signup/, /community/join/ and
+    # /signals/<slug>/ are intentionally omitted to keep retired paths out.
+    paths.append(("/community/", "0.8"))
+    return [
+        {"loc": f"{settings.SITE_BASE_URL}{path}", "priority": priority, "changefreq": "weekly"}
+        for path, priority in paths
+    ]
+
+
+def _blog():
+    from coresite.models import BlogPost
+
+    return BlogPost.published.only("slug", "updated_at")
+
+
+def _knowledge_categories():
+    from coresite.models import KnowledgeCategory
+
+    return KnowledgeCategory.published.only("slug", "updated_at")
+
+
+def _knowledge():
+    from coresite.models import KnowledgeArticle, StatusChoices
+
+    return (
+        KnowledgeArticle.published.filter(category__status=StatusChoices.PUBLISHED)
+        .select_related("category")
+        .only("slug", "updated_at", "category__slug")
+    )
+
+
+def _case_studies():
+    from coresite.models import CaseStudy
+
+    return CaseStudy.objects.filter(is_published=True).only("slug", "updated_at")
+
+
+def _tools():
+    from coresite.models import Tool
+
+    return Tool.objects.published().only("slug", "updated_at")
+
+
+def _entry(priority: str) -> Callable[[object], Entry]:
+    def build(obj) -> Entry:
+        return obj.get_absolute_url(), obj.updated_at, priority, "monthly"
+
+    return build
+
+
+def _category_entry(obj) -> Entry:
+    url = reverse("knowledge_category", kwargs={"category_slug": obj.slug})
+    return url, obj.updated_at, "0.6", "weekly"
+
+
+def sections() -> List[Section]:
+    """Return the content sections currently listed in the sitemap."""
+    result = [
+        Section("blog", "blog", _blog, _entry("0.5")),
+        Section("knowledge-categories", "knowledge", _knowledge_categories, _category_entry),
+        Section("knowledge", "knowledge", _knowledge, _entry("0.5")),
+    ]
+    if settings.CASE_STUDIES_INDEXABLE:
+        result.append(Section("case-studies", "case_studies", _case_studies, _entry("0.5")))
+    if settings.TOOLS_INDEXABLE:
+        result.append(Section("tools", "tools", _tools, _entry("0.5")))
+    return result
+
+
+def get_section(name: str) -> Optional[Section]:
+    for section in sections():
+        if section.name == name:
+            return section
+    return None
+
+
+def groups_for(name: str) -> List[str]:
+    """Return the page cache groups the shard ``name`` depends on."""
+    section = get_section(name)
+    return [section.group] if section else []
+
+
+def _lastmod(value: Optional[datetime]) -> str:
+    return f"    <lastmod>{value.date().isoformat()}</lastmod>\n" if value else ""
+
+
+def _urlset(entries: Iterable[Entry]) -> Iterator[str]:
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for loc, lastmod, priority, changefreq in entries:
+        yield (
+            "  <url>\n"
+            f"    <loc>{escape(loc)}</loc>\n"
+            f"    <changefreq>{changefreq}</changefreq>\n"
+            f"{_lastmod(lastmod)}"
+            f"    <priority>{priority}</priority>\n"
+            "  </url>\n"
+        )
+    yield "</urlset>\n"
+
+
+def _cache_key(*parts: str) -> str:
+    return ":".join((CACHE_PREFIX,) + parts)
+
+
+def _settings_token() -> str:
+    """Settings that change which sections and hub pages are listed."""
+    return "|".join(
+        [
+            getattr(settings, "BUILD_COMMIT", ""),
+            str(settings.CASE_STUDIES_INDEXABLE),
+            str(settings.TOOLS_INDEXABLE),
+        ]
+    )
+
+
+def _build_pages() -> str:
+    entries = [
+        (url["loc"], None, url["priority"], url["changefreq"]) for url in top_level_urls()
+    ]
+    return "".join(_urlset(entries))
+
+
+def _build_shard(section: Section, page: int) -> Optional[str]:
+    start = (page - 1) * SHARD_SIZE
+    rows = section.queryset().order_by("pk")[start : start + SHARD_SIZE]
+    base = settings.SITE_BASE_URL
+    entries = []
+    for obj in rows.iterator(chunk_size=500):
+        loc, lastmod, priority, changefreq = section.entry(obj)
+        entries.append((f"{base}{loc}", lastmod, priority, changefreq))
+    if not entries and page != 1:
+        return None
+    return "".join(_urlset(entries))
+
+
+def shard_xml(name: str, page: int) -> Optional[str]:
+    """Return the XML for one shard, or ``None`` if it does not exist."""
+    if name == PAGES:
+        if page != 1:
+            return None
+        return singleflight.get_or_set(
+            _cache_key(name, "1", _settings_token()), _build_pages, CACHE_TIMEOUT
+        )
+    section = get_section(name)
+    if section is None or page < 1:
+        return None
+    return singleflight.get_or_set(
+        _cache_key(name, str(page), _settings_token()),
+        lambda: _build_shard(section, page),
+        CACHE_TIMEOUT,
+        version=page_cache.current_version(section.group),
+    )
+
+
+def shards() -> List[Tuple[str, int, Optional[datetime]]]:
+    """Return ``(section, page, lastmod)`` for every shard in the index."""
+    result = [(PAGES, 1, None)]
+    for section in sections():
+        stats = section.queryset().aggregate(count=Count("pk"), lastmod=Max("updated_at"))
+        pages = max(1, -(-stats["count"] // SHARD_SIZE))
+        for page in range(1, pages + 1):
+            result.append((section.name, page, stats["lastmod"]))
+    return result
+
+
+def shard_path(name: str, page: int) -> str:
+    return f"/sitemap-{name}-{page}.xml"
+
+
+def _build_index() -> str:
+    base = settings.SITE_BASE_URL
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n', f'<sitemapindex xmlns="{XMLNS}">\n']
+    for name, page, lastmod in shards():
+        loc = escape(f"{base}{shard_path(name, page)}")
+        parts.append(f"  <sitemap>\n    <loc>{loc}</loc>\n{_lastmod(lastmod)}  </sitemap>\n")
+    parts.append("</sitemapindex>\n")
+    return "".join(parts)
+
+
+def index_xml() -> str:
+    """Return the sitemap index listing every shard."""
+    groups = sorted({section.group for section in sections()})
+    return singleflight.get_or_set(
+        _cache_key("index", _settings_token()),
+        _build_index,
+        CACHE_TIMEOUT,
+        version=page_cache.current_version(*groups),
+    )
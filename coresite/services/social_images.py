@@ -1,13 +1,31 @@
+"""Branded social card images for blog posts.
+
+``BlogPost.save`` never renders inline: it points the post at a static
+placeholder and enqueues a :class:`~coresite.models.SocialImageJob`. The
+``process_social_images`` worker renders each card once and writes the same
+PNG as both the OG and Twitter variants.
+"""
+
 import hashlib
+import logging
+from datetime import timedelta
+from functools import lru_cache
 from io import BytesIO
-from typing import Tuple
+from typing import List, Tuple
 from urllib.parse import urljoin
 
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
 from PIL import Image, ImageDraw, ImageFont
 
+from coresite import page_cache
+
+logger = logging.getLogger(__name__)
+
 IMAGE_SIZE = getattr(settings, "SOCIAL_IMAGE_SIZE", (1200, 630))
 BACKGROUND_COLOR = getattr(settings, "SOCIAL_BG_COLOR", (15, 23, 42))
 TITLE_COLOR = getattr(settings, "SOCIAL_TITLE_COLOR", (255, 255, 255))
@@ -18,75 +36,229 @@ FONT_PATH = getattr(
     "SOCIAL_FONT_PATH",
     "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
 )
+TITLE_FONT_SIZE = 80
+BRAND_FONT_SIZE = 40
+CARD_MARGIN = 60
+PLACEHOLDER_PATH = getattr(
+    settings, "SOCIAL_IMAGE_PLACEHOLDER", "coresite/img/social-placeholder.png"
+)
+
+# Jobs are retried this many times before being left as failed.
+MAX_ATTEMPTS = 3
+# A running job older than this is assumed to belong to a dead worker.
+STALE_AFTER = timedelta(minutes=10)
 
+# Fonts, word widths and the branded background are cached per process, so
+# rendering a card only measures new words and draws the title.
+@lru_cache(maxsize=8)
 def _get_font(size: int) -> ImageFont.ImageFont:
     try:
         return ImageFont.truetype(FONT_PATH, size)
     except Exception:
         return ImageFont.load_default()
 
-def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: int):
-    words = text.split()
+@lru_cache(maxsize=4096)
+def _text_width(size: int, text: str) -> float:
+    return _get_font(size).getlength(text)
+
+def _wrap_text(text: str, size: int, max_width: int):
+    """Greedy word wrap, adding cached word widths instead of re-measuring lines."""
+    space = _text_width(size, " ")
     lines = []
-    line = ""
-    for word in words:
-        test_line = f"{line} {word}".strip()
-        width = draw.textbbox((0, 0), test_line, font=font)[2]
-        if width <= max_width:
-            line = test_line
+    line = []
+    width = 0.0
+    for word in text.split():
+        word_width = _text_width(size, word)
+        candidate = width + space + word_width if line else word_width
+        if candidate <= max_width or not line:
+            line.append(word)
+            width = candidate
         else:
-            if line:
-                lines.append(line)
-            line = word
+            lines.append(" ".join(line))
+            line = [word]
+            width = word_width
     if line:
-        lines.append(line)
+        lines.append(" ".join(line))
     return lines
 
-def _create_image_bytes(text: str) -> bytes:
+@lru_cache(maxsize=1)
+def _base_card() -> Image.Image:
     img = Image.new("RGB", IMAGE_SIZE, BACKGROUND_COLOR)
     draw = ImageDraw.Draw(img)
-    title_font = _get_font(80)
-    brand_font = _get_font(40)
-    margin = 60
-    max_width = IMAGE_SIZE[0] - 2 * margin
-    lines = _wrap_text(draw, text, title_font, max_width)
-    draw.multiline_text((margin, margin), "\n".join(lines), fill=TITLE_COLOR, font=title_font)
-    brand_pos = (margin, IMAGE_SIZE[1] - margin - 40)
-    draw.text(brand_pos, BRAND_TEXT, fill=BRAND_COLOR, font=brand_font)
+    brand_pos = (CARD_MARGIN, IMAGE_SIZE[1] - CARD_MARGIN - BRAND_FONT_SIZE)
+    draw.text(brand_pos, BRAND_TEXT, fill=BRAND_COLOR, font=_get_font(BRAND_FONT_SIZE))
+    return img
+
+def render_card(text: str) -> bytes:
+    """Render the PNG card for ``text``. Pure, so it can run in a worker process."""
+    img = _base_card().copy()
+    draw = ImageDraw.Draw(img)
+    max_width = IMAGE_SIZE[0] - 2 * CARD_MARGIN
+    lines = _wrap_text(text, TITLE_FONT_SIZE, max_width)
+    draw.multiline_text(
+        (CARD_MARGIN, CARD_MARGIN),
+        "\n".join(lines),
+        fill=TITLE_COLOR,
+        font=_get_font(TITLE_FONT_SIZE),
+    )
     buffer = BytesIO()
     img.save(buffer, format="PNG")
     return buffer.getvalue()
 
-def generate_social_images(post, force: bool = False) -> Tuple[str, str]:
-    text = getattr(post, "meta_title", None) or post.title
-    slug = getattr(post, "slug", "post")
-    filename_base = slug.replace("/", "-")
-    title_hash = hashlib.md5(text.encode("utf-8")).hexdigest()[:8]
-    filename_base = f"{filename_base}-{title_hash}"
+def _render_hash(text: str) -> str:
+    """Hash everything that affects the rendered card, not just the text.
 
-    og_name = f"{filename_base}_og.png"
-    twitter_name = f"{filename_base}_twitter.png"
+    A branding change (colours, font, size) therefore yields new filenames,
+    while unchanged cards keep theirs and can be skipped.
+    """
+    raw = "|".join(
+        [
+            text,
+            repr(IMAGE_SIZE),
+            repr(BACKGROUND_COLOR),
+            repr(TITLE_COLOR),
+            repr(BRAND_COLOR),
+            BRAND_TEXT,
+            FONT_PATH,
+        ]
+    )
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()[:8]
 
-    og_path = f"social/{og_name}"
-    twitter_path = f"social/{twitter_name}"
+def social_image_paths(post) -> Tuple[str, str, str]:
+    """Return ``(text, og_path, twitter_path)`` for ``post``'s social card."""
+    text = getattr(post, "meta_title", None) or post.title
+    slug = getattr(post, "slug", "post")
+    filename_base = f"{slug.replace('/', '-')}-{_render_hash(text)}"
+    return text, f"social/{filename_base}_og.png", f"social/{filename_base}_twitter.png"
 
+def store_social_images(
+    og_path: str, twitter_path: str, image_bytes: bytes, force: bool = False
+) -> Tuple[str, str]:
+    """Write ``image_bytes`` as both variants and return their absolute URLs."""
     if force:
         if default_storage.exists(og_path):
             default_storage.delete(og_path)
         if default_storage.exists(twitter_path):
             default_storage.delete(twitter_path)
+    og_storage_path = default_storage.save(og_path, ContentFile(image_bytes))
+    twitter_storage_path = default_storage.save(twitter_path, ContentFile(image_bytes))
+    return (
+        _absolute(default_storage.url(og_storage_path)),
+        _absolute(default_storage.url(twitter_storage_path)),
+    )
 
-    og_bytes = _create_image_bytes(text)
-    twitter_bytes = _create_image_bytes(text)
-    og_storage_path = default_storage.save(og_path, ContentFile(og_bytes))
-    twitter_storage_path = default_storage.save(twitter_path, ContentFile(twitter_bytes))
+def existing_social_images(og_path: str, twitter_path: str):
+    """Return URLs for already-rendered variants, or ``None`` if either is missing."""
+    if default_storage.exists(og_path) and default_storage.exists(twitter_path):
+        return (
+            _absolute(default_storage.url(og_path)),
+            _absolute(default_storage.url(twitter_path)),
+        )
+    return None
 
-    og_url = default_storage.url(og_storage_path)
-    twitter_url = default_storage.url(twitter_storage_path)
+def generate_social_images(post, force: bool = False) -> Tuple[str, str]:
+    text, og_path, twitter_path = social_image_paths(post)
+    if not force:
+        existing = existing_social_images(og_path, twitter_path)
+        if existing:
+            return existing
+    # Both cards share a size, so one render serves both variants.
+    return store_social_images(og_path, twitter_path, render_card(text), force)
 
+def _absolute(url: str) -> str:
     base_url = getattr(settings, "SITE_BASE_URL", "").rstrip("/")
     if base_url:
-        og_url = urljoin(base_url + "/", og_url.lstrip("/"))
-        twitter_url = urljoin(base_url + "/", twitter_url.lstrip("/"))
+        return urljoin(base_url + "/", url.lstrip("/"))
+    return url
+
+def placeholder_url() -> str:
+    """URL served for a post's social images until the worker renders them."""
+    # Unhashed on purpose: the URL is stored on the post and must survive
+    # redeploys that change the static manifest.
+    return _absolute(f"{settings.STATIC_URL}{PLACEHOLDER_PATH}")
+
+def enqueue(post, force: bool = False) -> None:
+    """Queue (or re-queue) social image rendering for ``post``."""
+    from coresite.models import JobStatusChoices, SocialImageJob
+
+    SocialImageJob.objects.update_or_create(
+        post=post,
+        defaults={
+            "status": JobStatusChoices.PENDING,
+            "force": force,
+            "attempts": 0,
+            "last_error": "",
+        },
+    )
+
+def claim_jobs(limit: int) -> List:
+    """Mark up to ``limit`` runnable jobs as running and return them.
+
+    Rows are locked with ``SKIP LOCKED`` where the database supports it, so
+    several workers can drain the queue without picking the same job.
+    """
+    from coresite.models import JobStatusChoices, SocialImageJob
+
+    now = timezone.now()
+    runnable = Q(status=JobStatusChoices.PENDING) | Q(
+        status=JobStatusChoices.RUNNING,
+        updated_at__lt=now - STALE_AFTER,
+        attempts__lt=MAX_ATTEMPTS,
+    )
+    with transaction.atomic():
+        ids = list(
+            SocialImageJob.objects.select_for_update(skip_locked=True)
+            .filter(runnable)
+            .order_by("updated_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+        SocialImageJob.objects.filter(pk__in=ids).update(
+            status=JobStatusChoices.RUNNING,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+    return list(SocialImageJob.objects.filter(pk__in=ids).select_related("post"))
+
+def run_job(job) -> bool:
+    """Render images for ``job`` and swap them onto its post.
+
+    The result is only applied if the job was not re-queued while rendering;
+    otherwise the newer job will overwrite the post shortly. Returns whether
+    the images were applied.
+    """
+    from coresite.models import BlogPost, JobStatusChoices, SocialImageJob
+
+    try:
+        og_url, twitter_url = generate_social_images(job.post, force=job.force)
+    except Exception as exc:
+        logger.exception("Social image render failed for post %s", job.post_id)
+        status = (
+            JobStatusChoices.FAILED
+            if job.attempts >= MAX_ATTEMPTS
+            else JobStatusChoices.PENDING
+        )
+        SocialImageJob.objects.filter(pk=job.pk, updated_at=job.updated_at).update(
+            status=status, last_error=str(exc)[:1000]
+        )
+        return False
+
+    with transaction.atomic():
+        current = SocialImageJob.objects.filter(
+            pk=job.pk,
+            status=JobStatusChoices.RUNNING,
+            updated_at=job.updated_at,
+        ).update(status=JobStatusChoices.DONE, last_error="")
+        if not current:
+            return False
+        # ``update`` skips BlogPost.save so the post is not re-queued.
+        BlogPost.objects.filter(pk=job.post_id).update(
+            og_image_url=og_url, twitter_image_url=twitter_url
+        )
+    page_cache.bump_version("blog")
+    return True
 
-    return og_url, twitter_url
+def process_pending(limit: int = 20) -> Tuple[int, int]:
+    """Run one batch of queued jobs. Returns ``(claimed, applied)``."""
+    jobs = claim_jobs(limit)
+    applied = sum(1 for job in jobs if run_job(job))
+    return len(jobs), applied
@@ -1,9 +1,8 @@
-import json
-from pathlib import Path
+from typing import Mapping
 
+from .content_registry import get_content
 
-def get_signals_content() -> dict:
-    """Load signals content spec from JSON."""
-    path = Path(__file__).resolve().parent / "content" / "signals.json"
-    with path.open() as f:
-        return json.load(f)
+
+def get_signals_content() -> Mapping:
+    """Return the signals content spec (read-only, shared between requests)."""
+    return get_content("signals")
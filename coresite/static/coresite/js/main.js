@@ -70,6 +70,23 @@ document.addEventListener('DOMContentLoaded', function () {
     backdrop.addEventListener('click', closeMenu);
   }
 
+  // Pre-rendered pages ship a placeholder CSRF token; swap in a real one
+  // (and its cookie) from /csrf/ before the form is posted.
+  const CSRF_PLACEHOLDER = '__page_cache_csrf__';
+  document.addEventListener('submit', (event) => {
+    const form = event.target;
+    const tokenInput = form.querySelector('input[name="csrfmiddlewaretoken"]');
+    if (!tokenInput || tokenInput.value !== CSRF_PLACEHOLDER) return;
+    event.preventDefault();
+    fetch('/csrf/', { credentials: 'same-origin' })
+      .then((res) => res.json())
+      .then((data) => {
+        tokenInput.value = data.token;
+        form.submit();
+      })
+      .catch(() => form.dispatchEvent(new CustomEvent('newsletter:error')));
+  }, true);
+
   const newsletterForm = document.getElementById('newsletter_form');
   if (newsletterForm) {
     const submitBtn = newsletterForm.querySelector('button[type="submit"]');
@@ -1,9 +1,8 @@
-import json
-from pathlib import Path
+from typing import Mapping
 
+from .content_registry import get_content
 
-def get_support_content() -> dict:
-    """Load support content spec from JSON."""
-    path = Path(__file__).resolve().parent / "content" / "support.json"
-    with path.open(encoding="utf-8") as f:
-        return json.load(f)
+
+def get_support_content() -> Mapping:
+    """Return the support content spec (read-only, shared between requests)."""
+    return get_content("support")
@@ -0,0 +1,11 @@
+from django import template
+
+from coresite.assets import asset_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def asset(path):
+    """Hashed URL for a static script or stylesheet, e.g. ``{% asset 'coresite/js/main.js' %}``."""
+    return asset_url(path)
@@ -0,0 +1,45 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from coresite.fragments import fragment_key, get_or_render
+
+register = template.Library()
+
+
+class FragmentNode(template.Node):
+    def __init__(self, name, vary_on, nodelist):
+        self.name = name
+        self.vary_on = vary_on
+        self.nodelist = nodelist
+
+    def render(self, context):
+        request = context.get("request")
+        user = context.get("user") or getattr(request, "user", None)
+        parts = [var.resolve(context) for var in self.vary_on]
+        parts.append("auth" if getattr(user, "is_authenticated", False) else "anon")
+        key = fragment_key(self.name.resolve(context), parts)
+        return mark_safe(
+            get_or_render(request, key, lambda: self.nodelist.render(context))
+        )
+
+
+@register.tag(name="fragment")
+def do_fragment(parser, token):
+    """Cache the enclosed template block.
+
+    Usage: ``{% fragment "name" value1 value2 %}...{% endfragment %}``. The
+    block is re-rendered when any of the values, the login state or the
+    deployed build changes.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' takes a fragment name and optional values to vary on"
+        )
+    nodelist = parser.parse(("endfragment",))
+    parser.delete_first_token()
+    return FragmentNode(
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+        nodelist,
+    )
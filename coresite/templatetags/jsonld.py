@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from django import template
 from django.conf import settings
+from django.utils.safestring import mark_safe
 
 from utils.jsonld import render_jsonld
 from utils.urls import ensure_absolute
@@ -18,16 +20,27 @@ class JsonLDNode(template.Node):
         raw = self.nodelist.render(context).strip()
         if not raw:
             return ""
-        data = json.loads(raw)
 
         request = context.get("request")
         base = request.build_absolute_uri("/") if request else getattr(
             settings, "SITE_BASE_URL", ""
         )
 
-        if not _absolutize_urls(data, base):
-            return ""
-        return render_jsonld(data)
+        return mark_safe(_render_block(raw, base))
+
+
+@lru_cache(maxsize=256)
+def _render_block(raw: str, base: str) -> str:
+    """Return the ``<script>`` tag for a rendered block.
+
+    Blocks repeat across requests (per-page templates with the same objects),
+    so a small in-process memo skips JSON parsing, URL rewriting and
+    serialising without hashing the block or a cache round trip.
+    """
+    data = json.loads(raw)
+    if not _absolutize_urls(data, base):
+        return ""
+    return str(render_jsonld(data))
 
 
 def _absolutize_urls(value, base: str) -> bool:
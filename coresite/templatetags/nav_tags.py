@@ -1,6 +1,8 @@
 from django import template
+from django.urls import NoReverseMatch, reverse
 
-from utils.nav import is_active
+from coresite.context_processors import NAV_LINKS
+from utils.nav import _normalize, is_active
 
 register = template.Library()
 
@@ -9,3 +11,29 @@ register = template.Library()
 def nav_active(request_path: str, link_url: str) -> bool:
     """Return True when ``link_url`` should be marked active for ``request_path``."""
     return is_active(request_path, link_url)
+
+
+def _nav_urls():
+    names = set()
+    for link in NAV_LINKS:
+        names.update(filter(None, (link.get("url"), link.get("alt_url"))))
+    urls = []
+    for name in sorted(names):
+        try:
+            urls.append(reverse(name))
+        except NoReverseMatch:
+            continue
+    return urls
+
+
+@register.filter(name="nav_section")
+def nav_section(request_path: str) -> str:
+    """Return a short key for the nav state ``request_path`` produces.
+
+    The header and footer only vary on which nav links are active and on
+    whether the page is the home page, so fragments key on this rather than
+    on the raw path and the number of cache entries stays bounded.
+    """
+    if _normalize(request_path) == "/":
+        return "home"
+    return "|".join(url for url in _nav_urls() if is_active(request_path, url))
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from coresite.assets import asset_url
+
+
+@pytest.fixture
+def manifest(settings, tmp_path):
+    (tmp_path / "staticfiles.json").write_text(
+        json.dumps(
+            {
+                "version": "1.1",
+                "paths": {
+                    "coresite/js/main.js": "coresite/js/main.0123456789ab.js",
+                    "coresite/js/consent.js": "coresite/js/consent.0123456789ab.js",
+                    "coresite/js/nav-home.js": "coresite/js/nav-home.0123456789ab.js",
+                    "coresite/scss/main.css": "coresite/scss/main.0123456789ab.css",
+                },
+            }
+        )
+    )
+    settings.STATIC_ROOT = str(tmp_path)
+    settings.STATICFILES_STORAGE = (
+        "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+    )
+
+
+def test_asset_url_uses_hashed_manifest_names(manifest):
+    assert asset_url("coresite/js/main.js") == "/static/coresite/js/main.0123456789ab.js"
+    assert asset_url("coresite/scss/main.scss") == "/static/coresite/scss/main.0123456789ab.css"
+
+
+@pytest.mark.django_db
+def test_pages_reference_hashed_scripts_without_timestamps(client, manifest):
+    html = client.get(reverse("home")).content.decode()
+    assert "/static/coresite/js/main.0123456789ab.js" in html
+    assert "/static/coresite/js/nav-home.0123456789ab.js" in html
+    assert "/static/coresite/scss/main.0123456789ab.css" in html
+    assert "?v=" not in html
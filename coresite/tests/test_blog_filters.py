@@ -57,3 +57,52 @@ def test_blog_filters_by_category_tag_time(client, settings):
     content = res.content.decode()
     assert "Old Music" in content and "Recent Post" not in content
 
+
+def _published_post(title, slug, published_at, category, tags):
+    return BlogPost.objects.create(
+        title=title,
+        slug=slug,
+        status=StatusChoices.PUBLISHED,
+        excerpt="ex",
+        content="ct",
+        published_at=published_at,
+        category_slug=category.lower(),
+        category_title=category,
+        tags=tags,
+        meta_title=title,
+        meta_description="Desc",
+        canonical_url=f"https://technofatty.com/blog/{slug}/",
+        og_image_url="https://example.com/og.png",
+        twitter_image_url="https://example.com/tw.png",
+        primary_goal=PrimaryGoalChoices.NEWSLETTER,
+    )
+
+
+@pytest.mark.django_db
+def test_blog_filters_and_facets_run_in_database(client, settings):
+    settings.SITE_BASE_URL = "https://technofatty.com"
+    now = timezone.now()
+    old = now - timezone.timedelta(days=400)
+    _published_post("Fresh Tech", "fresh-tech", now, "Tech", [{"slug": "django", "title": "Django"}])
+    _published_post("Vintage Music", "vintage-music", old, "Music", [{"slug": "guitar", "title": "Guitar"}])
+
+    res = client.get(reverse("blog"), {"tag": "guitar"})
+    titles = [p.title for p in res.context["page_posts"]]
+    assert titles == ["Vintage Music"]
+    assert "content" in res.context["page_posts"][0].get_deferred_fields()
+
+    res = client.get(reverse("blog"), {"time": str(old.year), "category": "music"})
+    assert [p.title for p in res.context["page_posts"]] == ["Vintage Music"]
+
+    res = client.get(reverse("blog"), {"time": "not-a-year"})
+    assert res.context["page_posts"] == []
+
+    assert res.context["categories"] == [
+        {"slug": "music", "title": "Music"},
+        {"slug": "tech", "title": "Tech"},
+    ]
+    assert res.context["tags"] == [
+        {"slug": "django", "title": "Django"},
+        {"slug": "guitar", "title": "Guitar"},
+    ]
+    assert res.context["times"] == sorted({str(now.year), str(old.year)}, reverse=True)
@@ -3,11 +3,31 @@ from django.urls import reverse
 from django.utils import timezone
 from django.core.management import call_command
 
-from coresite.models import BlogPost, StatusChoices, PrimaryGoalChoices
+from coresite.models import (
+    BlogPost,
+    KnowledgeArticle,
+    KnowledgeCategory,
+    KnowledgeTag,
+    StatusChoices,
+    PrimaryGoalChoices,
+)
 
 
 @pytest.mark.django_db
 def test_blog_post_renders_related_content(client):
+    category = KnowledgeCategory.objects.create(
+        title="Guides", slug="guides", status=StatusChoices.PUBLISHED
+    )
+    article = KnowledgeArticle.objects.create(
+        category=category,
+        title="Deploying TF",
+        slug="deploying-tf",
+        status=StatusChoices.PUBLISHED,
+        published_at=timezone.now(),
+    )
+    article.tags.add(
+        KnowledgeTag.objects.get_or_create(slug="deployment", defaults={"name": "Deployment"})[0]
+    )
     post = BlogPost.objects.create(
         title="Tag Post",
         slug="tag-post",
@@ -28,6 +48,7 @@ def test_blog_post_renders_related_content(client):
     content = res.content.decode()
     assert "Related across TF" in content
     assert "From Knowledge" in content
+    assert "/knowledge/guides/deploying-tf/" in content
 
 
 @pytest.mark.django_db
@@ -1,7 +1,7 @@
 import pytest
 from django.urls import reverse
 from django.utils import timezone
-from coresite.models import BlogPost, StatusChoices, PrimaryGoalChoices
+from coresite.models import BlogPost, BlogTag, StatusChoices, PrimaryGoalChoices
 
 
 @pytest.mark.django_db
@@ -38,3 +38,36 @@ def test_blog_tag_page_renders_description_cta_and_related(client, settings):
     assert "Related across TF" in content
     assert '"@type": "ItemList"' in content
     assert '<link rel="canonical" href="http://testserver/blog/tag/deployment/">' in content
+
+
+@pytest.mark.django_db
+def test_blog_tags_mirrored_into_relational_index(client):
+    post = BlogPost.objects.create(
+        title="Indexed Post",
+        slug="indexed-post",
+        status=StatusChoices.PUBLISHED,
+        published_at=timezone.now(),
+        meta_title="Indexed Post",
+        meta_description="Desc",
+        category_slug="general",
+        category_title="General",
+        excerpt="excerpt",
+        canonical_url="https://technofatty.com/blog/indexed-post/",
+        og_image_url="https://example.com/og.png",
+        twitter_image_url="https://example.com/tw.png",
+        tags=[
+            {"slug": "deployment", "title": "Deployment", "description": "About deployment"},
+            {"slug": "scaling", "title": "Scaling"},
+        ],
+    )
+    assert sorted(post.blog_tags.values_list("slug", flat=True)) == ["deployment", "scaling"]
+    assert BlogTag.objects.get(slug="deployment").description == "About deployment"
+
+    response = client.get(reverse("blog_tag", args=["deployment"]))
+    assert "About deployment" in response.content.decode()
+    assert [p.slug for p in response.context["posts"]] == ["indexed-post"]
+
+    post.tags = [{"slug": "scaling", "title": "Scaling"}]
+    post.save()
+    assert list(post.blog_tags.values_list("slug", flat=True)) == ["scaling"]
+    assert list(BlogPost.objects.filter(blog_tags__slug="deployment")) == []
@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+import json
+from io import StringIO
+
+import brotli
+from django.core.management import call_command
+
+SCRIPT = "/* note */\nfunction greet(name) {\n    return 'hi ' + name;\n}\n" * 20
+
+
+def _static_settings(settings, tmp_path):
+    source, root = tmp_path / "src", tmp_path / "root"
+    settings.STATIC_ROOT = str(root)
+    settings.STATICFILES_DIRS = [str(source)]
+    settings.STATICFILES_FINDERS = ["django.contrib.staticfiles.finders.FileSystemFinder"]
+    settings.STATICFILES_STORAGE = "coresite.storage.MinifiedManifestStaticFilesStorage"
+    settings.STATIC_MINIFY_PREFIXES = ["coresite/"]
+    return source, root
+
+
+def test_project_assets_are_minified_before_hashing(settings, tmp_path):
+    source, root = _static_settings(settings, tmp_path)
+    for name, content in [
+        ("coresite/js/app.js", SCRIPT),
+        ("coresite/js/vendor.min.js", SCRIPT),
+        ("admin/js/admin.js", SCRIPT),
+    ]:
+        (source / name).parent.mkdir(parents=True, exist_ok=True)
+        (source / name).write_text(content)
+
+    call_command("build_static", skip_sass=True, stdout=StringIO())
+
+    manifest = json.loads((root / "staticfiles.json").read_text())["paths"]
+    hashed = (root / manifest["coresite/js/app.js"]).read_bytes()
+    assert b"/* note */" not in hashed
+    assert len(hashed) < len(SCRIPT)
+    assert hashlib.md5(hashed).hexdigest()[:12] in manifest["coresite/js/app.js"]
+    assert (root / manifest["coresite/js/vendor.min.js"]).read_text() == SCRIPT
+    assert (root / manifest["admin/js/admin.js"]).read_text() == SCRIPT
+
+    compressed = root / (manifest["coresite/js/app.js"] + ".gz")
+    assert gzip.decompress(compressed.read_bytes()) == hashed
+    br = root / (manifest["coresite/js/app.js"] + ".br")
+    assert brotli.decompress(br.read_bytes()) == hashed
+
+
+def test_non_utf8_files_are_not_minified(settings, tmp_path):
+    from coresite.storage import MinifiedManifestStaticFilesStorage
+
+    (tmp_path / "latin1.css").write_bytes("a { content: '\xe9'; }\n".encode("latin-1"))
+    storage = MinifiedManifestStaticFilesStorage(location=str(tmp_path))
+    assert not storage._minify("latin1.css")
+
+
+def test_precompress_skips_small_and_fresh_files(settings, tmp_path):
+    settings.STATIC_ROOT = str(tmp_path)
+    (tmp_path / "app.abc123.js").write_text(SCRIPT)
+    (tmp_path / "tiny.css").write_text("a { color: red; }\n")
+
+    out = StringIO()
+    call_command("build_static", skip_sass=True, skip_collect=True, stdout=out)
+    assert (tmp_path / "app.abc123.js.gz").exists()
+    # Too small to be worth a compressed sibling.
+    assert not (tmp_path / "tiny.css.gz").exists()
+
+    out = StringIO()
+    call_command("build_static", skip_sass=True, skip_collect=True, stdout=out)
+    assert "Wrote 0 precompressed files." in out.getvalue()
+
+
+def test_sass_compiles_outside_the_source_tree(settings, tmp_path):
+    source = tmp_path / "static" / "coresite" / "scss"
+    source.mkdir(parents=True)
+    (source / "main.scss").write_text("$c: red;\na { color: $c; }\n")
+    (source / "_partial.scss").write_text("b { color: blue; }\n")
+    settings.SASS_PROCESSOR_ROOT = tmp_path / "static"
+    settings.SASS_PROCESSOR_INCLUDE_DIRS = []
+    settings.SASS_BUILD_ROOT = tmp_path / "build"
+    settings.STATIC_ROOT = str(tmp_path / "root")
+
+    call_command("build_static", skip_collect=True, stdout=StringIO())
+
+    assert (tmp_path / "build" / "coresite" / "scss" / "main.css").read_text().startswith("a{color:red}")
+    assert not (source / "main.css").exists()
+    assert not (tmp_path / "build" / "coresite" / "scss" / "_partial.css").exists()
+
+    from coresite.assets import CompiledSassFinder
+
+    assert CompiledSassFinder().find("coresite/scss/main.css").endswith("main.css")
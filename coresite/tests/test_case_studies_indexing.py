@@ -56,18 +56,22 @@ def test_case_study_detail_view_indexable(client):
 
 @pytest.mark.django_db
 def test_sitemap_excludes_case_studies_when_not_indexable(client, settings):
-    study = CaseStudy.objects.create(title="Alpha", summary="Summary", is_published=True)
-    res = client.get(reverse("sitemap_xml"))
-    xml = res.content.decode()
-    assert f"{settings.SITE_BASE_URL}/case-studies/" not in xml
-    assert f"{settings.SITE_BASE_URL}{study.get_absolute_url()}" not in xml
+    CaseStudy.objects.create(title="Alpha", summary="Summary", is_published=True)
+    xml = client.get(reverse("sitemap_xml")).content.decode()
+    assert "sitemap-case-studies-1.xml" not in xml
+    pages = client.get(reverse("sitemap_section", args=["pages", 1])).content.decode()
+    assert f"{settings.SITE_BASE_URL}/case-studies/" not in pages
+    res = client.get(reverse("sitemap_section", args=["case-studies", 1]))
+    assert res.status_code == 404
 
 
 @override_settings(CASE_STUDIES_INDEXABLE=True)
 @pytest.mark.django_db
 def test_sitemap_includes_case_studies_when_indexable(client, settings):
     study = CaseStudy.objects.create(title="Alpha", summary="Summary", is_published=True)
-    res = client.get(reverse("sitemap_xml"))
-    xml = res.content.decode()
-    assert f"{settings.SITE_BASE_URL}/case-studies/" in xml
-    assert f"{settings.SITE_BASE_URL}{study.get_absolute_url()}" in xml
+    xml = client.get(reverse("sitemap_xml")).content.decode()
+    assert f"{settings.SITE_BASE_URL}/sitemap-case-studies-1.xml" in xml
+    pages = client.get(reverse("sitemap_section", args=["pages", 1])).content.decode()
+    assert f"{settings.SITE_BASE_URL}/case-studies/" in pages
+    shard = client.get(reverse("sitemap_section", args=["case-studies", 1])).content.decode()
+    assert f"{settings.SITE_BASE_URL}{study.get_absolute_url()}" in shard
@@ -1,3 +1,7 @@
+import pytest
+
+
+@pytest.mark.django_db
 def test_thread_page_has_code_of_conduct_link(client):
     res = client.get('/community/t/deploy-technofatty/')
     html = res.content.decode()
@@ -13,6 +13,7 @@ def _extract_json(html: str) -> dict:
     return json.loads(match.group(1))
 
 
+@pytest.mark.django_db
 @override_settings(SITE_BASE_URL="https://technofatty.com")
 def test_community_hub_has_canonical_and_jsonld(client):
     res = client.get("/community/")
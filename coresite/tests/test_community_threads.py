@@ -0,0 +1,98 @@
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from coresite.models import Answer, KnowledgeTag, PostStatusChoices, Thread
+
+
+@pytest.fixture
+def threads(db):
+    Thread.objects.all().delete()
+    now = timezone.now()
+    tag, _ = KnowledgeTag.objects.get_or_create(slug="scaling", defaults={"name": "Scaling"})
+    created = []
+    for i in range(25):
+        thread = Thread.objects.create(title=f"Thread {i}", body="body")
+        Thread.objects.filter(pk=thread.pk).update(last_activity_at=now - timedelta(hours=i))
+        if i % 2:
+            thread.tags.add(tag)
+        created.append(thread)
+    return created
+
+
+def _query(url):
+    return {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+
+
+@pytest.mark.django_db
+def test_answers_maintain_denormalized_counts():
+    thread = Thread.objects.create(title="Counting", body="?")
+    answer = Answer.objects.create(thread=thread, body="One")
+    Answer.objects.create(thread=thread, body="Pending", status=PostStatusChoices.PENDING)
+    thread.refresh_from_db()
+    assert (thread.reply_count, thread.answered) == (1, False)
+    assert thread.last_activity_at == answer.created_at
+
+    answer.accepted = True
+    answer.save()
+    thread.refresh_from_db()
+    assert thread.answered
+
+    answer.delete()
+    thread.refresh_from_db()
+    assert (thread.reply_count, thread.answered) == (0, False)
+
+
+def test_keyset_pages_walk_forward_and_back(client, threads):
+    res = client.get(reverse("community"))
+    assert [t.title for t in res.context["threads"]][:2] == ["Thread 0", "Thread 1"]
+    assert res.context["num_pages"] == 3
+
+    seen = [t.pk for t in res.context["threads"]]
+    next_url = res.context["next_page_url"]
+    while next_url:
+        params = _query(next_url)
+        assert "after" in params
+        res = client.get(reverse("community"), params)
+        seen += [t.pk for t in res.context["threads"]]
+        next_url = res.context["next_page_url"]
+    assert seen == [t.pk for t in threads]
+    assert res.context["page_number"] == 3
+
+    res = client.get(reverse("community"), _query(res.context["prev_page_url"]))
+    assert [t.title for t in res.context["threads"]][0] == "Thread 10"
+    assert res.context["canonical_url"] == "/community/?page=2"
+
+
+def test_numbered_links_and_tag_filter(client, threads):
+    res = client.get(reverse("community"), {"page": 2})
+    assert [t.title for t in res.context["threads"]][0] == "Thread 10"
+
+    res = client.get(reverse("community"), {"tag": "scaling"})
+    titles = [t.title for t in res.context["threads"]]
+    assert titles[:2] == ["Thread 1", "Thread 3"]
+    assert res.context["num_pages"] == 2
+    assert "tag=scaling" in res.context["next_page_url"]
+
+
+def test_unanswered_filter_uses_denormalized_flag(client, threads):
+    Answer.objects.create(thread=threads[0], body="Done", accepted=True)
+    res = client.get(reverse("community"), {"filter": "unanswered"})
+    assert threads[0].pk not in [t.pk for t in res.context["threads"]]
+
+
+def test_thread_count_cached_until_threads_change(client, threads):
+    cursor = _query(client.get(reverse("community")).context["next_page_url"])
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get(reverse("community"), cursor)
+    assert not [q for q in ctx.captured_queries if "COUNT(" in q["sql"]]
+    assert res.context["num_pages"] == 3
+
+    for i in range(25, 31):
+        Thread.objects.create(title=f"Thread {i}", body="body")
+    assert client.get(reverse("community")).context["num_pages"] == 4
@@ -0,0 +1,93 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from coresite.models import CaseStudy
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_matching_etag_returns_304_without_queries(client, django_assert_num_queries):
+    CaseStudy.objects.create(title="Gamma", is_published=True)
+    first = client.get(reverse("case_studies"))
+    assert first.status_code == 200
+    assert first["ETag"]
+    assert first["Last-Modified"]
+
+    with django_assert_num_queries(0):
+        res = client.get(reverse("case_studies"), HTTP_IF_NONE_MATCH=first["ETag"])
+    assert res.status_code == 304
+
+    res = client.get(
+        reverse("case_studies"), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+    )
+    assert res.status_code == 304
+
+
+@pytest.mark.django_db
+def test_content_change_invalidates_validators(client):
+    study = CaseStudy.objects.create(title="Gamma", is_published=True)
+    etag = client.get(reverse("case_studies"))["ETag"]
+
+    study.title = "Delta"
+    study.save()
+    res = client.get(reverse("case_studies"), HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert "Delta" in res.content.decode()
+
+
+@pytest.mark.django_db
+def test_scheduled_item_going_live_invalidates_validators(client):
+    from datetime import timedelta
+    import time
+
+    from django.utils import timezone
+
+    from coresite.models import KnowledgeArticle, KnowledgeCategory, StatusChoices
+
+    category = KnowledgeCategory.objects.create(
+        title="Ops", slug="ops", status=StatusChoices.PUBLISHED
+    )
+    KnowledgeArticle.objects.create(
+        category=category,
+        title="Embargoed launch",
+        slug="embargoed-launch",
+        status=StatusChoices.PUBLISHED,
+        published_at=timezone.now() + timedelta(seconds=0.3),
+    )
+    url = reverse("knowledge_category", args=["ops"])
+    first = client.get(url)
+    assert "Embargoed launch" not in first.content.decode()
+    assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    time.sleep(0.4)
+    res = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert res.status_code == 200
+    assert "Embargoed launch" in res.content.decode()
+
+
+@pytest.mark.django_db
+def test_etag_varies_with_consent_and_path(client):
+    etag = client.get(reverse("case_studies"))["ETag"]
+    assert client.get(reverse("case_studies") + "?page=2")["ETag"] != etag
+
+    client.get(reverse("consent_accept"))
+    res = client.get(reverse("case_studies"), HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name", ["blog_rss", "blog_atom", "blog_json", "knowledge_rss", "knowledge_json", "sitemap_xml"]
+)
+def test_feeds_and_sitemap_answer_conditional_requests(client, name):
+    first = client.get(reverse(name))
+    assert first.status_code == 200
+    res = client.get(reverse(name), HTTP_IF_NONE_MATCH=first["ETag"])
+    assert res.status_code == 304
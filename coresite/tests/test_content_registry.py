@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from coresite import content_registry
+from coresite.footer import get_footer_content
+
+
+@pytest.fixture
+def content_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_registry, "CONTENT_DIR", tmp_path)
+    monkeypatch.setattr(content_registry, "RELOAD_INTERVAL", 0)
+    content_registry.clear()
+    yield tmp_path
+    content_registry.clear()
+
+
+def test_content_is_loaded_once_and_read_only(content_dir):
+    (content_dir / "block.json").write_text(json.dumps({"cards": [{"title": "A"}]}))
+    first = content_registry.get_content("block")
+    assert content_registry.get_content("block") is first
+    assert first["cards"][0]["title"] == "A"
+    with pytest.raises(TypeError):
+        first["cards"][0]["title"] = "B"
+
+
+def test_changed_file_is_reloaded(content_dir):
+    path = content_dir / "block.json"
+    path.write_text(json.dumps({"headline": "Old"}))
+    assert content_registry.get_content("block")["headline"] == "Old"
+
+    path.write_text(json.dumps({"headline": "New"}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert content_registry.get_content("block")["headline"] == "New"
+
+
+def test_footer_year_is_injected_without_copying():
+    content_registry.clear()
+    footer = get_footer_content()
+    assert "{{year}}" not in footer["meta"].get("copyright", "")
+    assert get_footer_content() is footer
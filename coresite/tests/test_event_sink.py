@@ -0,0 +1,90 @@
+import json
+import threading
+
+from django.test import TestCase, override_settings
+
+from coresite.models import ContactEvent
+from coresite.services import contact
+from coresite.services.contact import contact_event
+from newsletter import utils as newsletter_utils
+from utils.events import BufferedSink
+
+
+@override_settings(EVENT_BUFFER_ENABLED=True)
+class BufferedSinkTests(TestCase):
+    def test_buffers_until_flush(self):
+        batches = []
+        sink = BufferedSink("test", batches.append, max_size=100, flush_interval=60)
+        sink.emit({"n": 1})
+        sink.emit({"n": 2})
+        self.assertEqual(batches, [])
+        self.assertEqual(sink.flush(), 2)
+        self.assertEqual(batches, [[{"n": 1}, {"n": 2}]])
+        self.assertEqual(sink.flush(), 0)
+
+    def test_worker_flushes_when_full(self):
+        written = threading.Event()
+        batches = []
+
+        def write(records):
+            batches.append(records)
+            written.set()
+
+        sink = BufferedSink("test", write, max_size=3, flush_interval=60)
+        for n in range(3):
+            sink.emit({"n": n})
+        self.assertTrue(written.wait(5))
+        self.assertEqual([len(batch) for batch in batches], [3])
+
+    def test_writes_immediately_when_disabled(self):
+        batches = []
+        sink = BufferedSink("test", batches.append)
+        with self.settings(EVENT_BUFFER_ENABLED=False):
+            sink.emit({"n": 1})
+        self.assertEqual(batches, [[{"n": 1}]])
+        self.assertEqual(len(sink), 0)
+
+    def test_drops_oldest_records_when_writer_stalls(self):
+        batches = []
+        sink = BufferedSink("test", batches.append, max_size=100, flush_interval=60, max_len=2)
+        for n in range(5):
+            sink.emit({"n": n})
+        self.assertEqual(len(sink), 2)
+        self.assertEqual(sink.dropped, 3)
+        with self.assertLogs("utils.events", "WARNING"):
+            sink.flush()
+        self.assertEqual(batches, [[{"n": 3}, {"n": 4}]])
+
+    def test_write_errors_are_logged_not_raised(self):
+        def write(records):
+            raise RuntimeError("down")
+
+        sink = BufferedSink("test", write, flush_interval=60)
+        sink.emit({"n": 1})
+        with self.assertLogs("utils.events", "ERROR"):
+            self.assertEqual(sink.flush(), 1)
+
+
+@override_settings(EVENT_BUFFER_ENABLED=True, EVENT_BUFFER_FLUSH_INTERVAL=60)
+class EventSinkIntegrationTests(TestCase):
+    def test_contact_events_are_bulk_created_on_flush(self):
+        contact_event("submitted_success", {"ip": "1.2.3.4"})
+        contact_event("throttle_hit", {"ip": "1.2.3.4"})
+        self.assertEqual(ContactEvent.objects.count(), 0)
+        with self.assertNumQueries(1):
+            contact.sink.flush()
+        self.assertEqual(
+            sorted(ContactEvent.objects.values_list("event_type", flat=True)),
+            ["submitted_success", "throttle_hit"],
+        )
+
+    def test_homepage_views_are_written_to_event_log(self):
+        import tempfile
+
+        with tempfile.NamedTemporaryFile("r", suffix=".jsonl") as fh:
+            with self.settings(EVENT_LOG_PATH=fh.name):
+                self.client.get("/")
+                self.client.get("/")
+                newsletter_utils.sink.flush()
+            lines = [json.loads(line) for line in fh.read().splitlines()]
+        self.assertEqual([line["event"] for line in lines], ["newsletter_block_view"] * 2)
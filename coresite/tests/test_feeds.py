@@ -9,6 +9,7 @@ from coresite.models import (
     StatusChoices,
     PrimaryGoalChoices,
 )
+from coresite.feeds import _accepts_gzip
 
 
 @pytest.mark.django_db
@@ -121,3 +122,101 @@ def test_knowledge_json_feed(client):
     response = client.get(reverse("knowledge_json"))
     assert response.status_code == 200
     assert "items" in response.json()
+
+
+@pytest.fixture
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _knowledge_article(slug):
+    category, _ = KnowledgeCategory.objects.get_or_create(
+        slug="feedcat", defaults={"title": "FeedCat", "status": StatusChoices.PUBLISHED}
+    )
+    return KnowledgeArticle.objects.create(
+        category=category,
+        title=slug.title(),
+        slug=slug,
+        status=StatusChoices.PUBLISHED,
+        published_at=timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+def test_feed_body_is_cached_with_etag_and_gzip(
+    client, settings, django_assert_num_queries, clear_cache
+):
+    import gzip
+
+    _knowledge_article("cached-art")
+    first = client.get(reverse("knowledge_rss"))
+    assert b"cached-art" in first.content
+    assert first["ETag"] and first["Last-Modified"]
+    assert first["Vary"] == "Accept-Encoding"
+    # Built for the canonical host, not the polled one.
+    assert f"{settings.SITE_BASE_URL}/knowledge/feedcat/cached-art/" in first.content.decode()
+
+    with django_assert_num_queries(0):
+        again = client.get(reverse("knowledge_rss"), HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert again["Content-Encoding"] == "gzip"
+    assert gzip.decompress(again.content) == first.content
+    assert again["ETag"] == first["ETag"]
+
+    res = client.get(reverse("knowledge_rss"), HTTP_IF_NONE_MATCH=first["ETag"])
+    assert res.status_code == 304
+
+
+@pytest.mark.django_db
+def test_publish_rebuilds_feed(client, clear_cache, django_capture_on_commit_callbacks):
+    etag = client.get(reverse("knowledge_json"))["ETag"]
+    with django_capture_on_commit_callbacks(execute=True):
+        _knowledge_article("fresh-art")
+
+    with pytest.MonkeyPatch.context() as mp:
+        from coresite import feeds
+
+        mp.setattr(feeds, "_serialize", lambda *a: pytest.fail("rebuilt on read"))
+        res = client.get(reverse("knowledge_json"))
+    assert res["ETag"] != etag
+    assert "Fresh-Art" in [item["title"] for item in res.json()["items"]]
+
+
+@pytest.mark.django_db
+def test_unrelated_publish_keeps_feed_etag(client, clear_cache):
+    from coresite.models import CaseStudy
+    from coresite.page_cache import bump_version
+
+    etag = client.get(reverse("knowledge_rss"))["ETag"]
+    bump_version("knowledge")
+    CaseStudy.objects.create(title="Elsewhere", is_published=True)
+    res = client.get(reverse("knowledge_rss"), HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate", True),
+        ("deflate, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, identity", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("br", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip_honours_q_values(header, expected):
+    assert _accepts_gzip(header) is expected
+
+
+@pytest.mark.django_db
+def test_feed_not_gzipped_when_refused(client, clear_cache):
+    _knowledge_article("plain-art")
+    res = client.get(reverse("knowledge_rss"), HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+    assert not res.has_header("Content-Encoding")
+    assert b"plain-art" in res.content
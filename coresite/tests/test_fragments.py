@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import RequestFactory
+
+from coresite.footer import get_footer_content
+from coresite.fragments import fragment_key
+from coresite.templatetags.jsonld import _render_block
+from coresite.templatetags.nav_tags import nav_section
+from utils import singleflight
+
+TEMPLATE = Template(
+    '{% load fragments %}{% fragment "demo" value %}{{ counter.bump }}{% endfragment %}'
+)
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def bump(self):
+        self.calls += 1
+        return self.calls
+
+
+class FakeUser:
+    is_authenticated = True
+
+
+def _render(request, counter, value="a", user=None):
+    return TEMPLATE.render(
+        Context({"request": request, "counter": counter, "value": value, "user": user or AnonymousUser()})
+    )
+
+
+@pytest.fixture
+def fragment_cache(settings):
+    settings.FRAGMENT_CACHE_ENABLED = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_fragment_rendered_once_across_requests(fragment_cache):
+    counter = Counter()
+    request = RequestFactory().get("/")
+    assert _render(request, counter) == "1"
+    assert _render(request, counter) == "1"
+    assert _render(RequestFactory().get("/"), counter) == "1"
+    assert counter.calls == 1
+
+
+def test_fragment_varies_on_values_and_auth(fragment_cache):
+    counter = Counter()
+    assert _render(RequestFactory().get("/"), counter, value="a") == "1"
+    assert _render(RequestFactory().get("/"), counter, value="b") == "2"
+    assert _render(RequestFactory().get("/"), counter, user=FakeUser()) == "3"
+
+
+def test_request_memo_works_without_shared_cache(settings):
+    settings.FRAGMENT_CACHE_ENABLED = False
+    counter = Counter()
+    request = RequestFactory().get("/")
+    assert _render(request, counter) == "1"
+    assert _render(request, counter) == "1"
+    assert _render(RequestFactory().get("/"), counter) == "2"
+
+
+@pytest.mark.django_db
+def test_site_footer_stored_in_fragment_cache(client, fragment_cache):
+    client.get("/about/")
+    key = fragment_key("footer", [get_footer_content(), nav_section("/about/"), "anon"])
+    assert 'class="footer"' in singleflight.peek(key)
+
+
+def test_nav_section_is_bounded():
+    assert nav_section("/") == "home"
+    assert nav_section("/tools/") == nav_section("/tools/some-tool/") == "/tools/"
+    assert nav_section("/no-such-page/") == nav_section("/wp-admin.php") == ""
+
+
+@pytest.mark.django_db
+def test_unknown_paths_share_header_fragment(client, fragment_cache):
+    client.get("/no-such-page/")
+    client.get("/another-missing-page/")
+    key = fragment_key("header_nav", ["", "anon"])
+    assert "site-header" in singleflight.peek(key)
+
+
+def test_jsonld_block_memoised_in_process():
+    _render_block.cache_clear()
+    raw = '{"@type": "WebPage", "url": "/about/"}'
+    first = _render_block(raw, "https://example.com/")
+    assert _render_block(raw, "https://example.com/") == first
+    assert '"url":"https://example.com/about/"' in first
+    assert _render_block.cache_info().hits == 1
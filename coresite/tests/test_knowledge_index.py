@@ -212,3 +212,71 @@ def test_filtered_results_set_noindex_header(client):
     res = client.get(reverse("knowledge") + f"?category={category.slug}")
     assert res["X-Robots-Tag"] == "noindex,follow"
     assert '<meta name="robots" content="noindex,follow">' in res.content.decode()
+
+
+@pytest.mark.django_db
+def test_knowledge_search_ranks_title_matches_and_tracks_edits(client):
+    category = KnowledgeCategory.objects.create(
+        title="General", slug="general", status=StatusChoices.PUBLISHED
+    )
+    blurb_match = KnowledgeArticle.objects.create(
+        category=category,
+        title="Pipelines",
+        slug="pipelines",
+        status=StatusChoices.PUBLISHED,
+        blurb="Notes on forecasting demand",
+        published_at=timezone.now(),
+    )
+    KnowledgeArticle.objects.create(
+        category=category,
+        title="Forecasting basics",
+        slug="forecasting-basics",
+        status=StatusChoices.PUBLISHED,
+        blurb="Start here",
+        published_at=timezone.now() - timezone.timedelta(days=1),
+    )
+
+    res = client.get(reverse("knowledge"), {"q": "forecast"})
+    ranked = [res.context["featured"]] + list(res.context["articles"])
+    assert [a.slug for a in ranked] == ["forecasting-basics", "pipelines"]
+
+    blurb_match.blurb = "Notes on staffing"
+    blurb_match.save()
+    res = client.get(reverse("knowledge"), {"q": "forecast"})
+    assert res.context["featured"].slug == "forecasting-basics"
+    assert list(res.context["articles"]) == []
+
+    blurb_match.delete()
+    res = client.get(reverse("knowledge"), {"q": "staffing"})
+    assert res.context["featured"] is None
+
+
+@pytest.mark.django_db
+def test_knowledge_search_tracks_reverse_tag_clear_and_delete():
+    from coresite.services import knowledge_search
+
+    category = KnowledgeCategory.objects.create(
+        title="General", slug="general", status=StatusChoices.PUBLISHED
+    )
+    article = KnowledgeArticle.objects.create(
+        category=category,
+        title="Pipelines",
+        slug="pipelines",
+        status=StatusChoices.PUBLISHED,
+        blurb="Notes",
+        published_at=timezone.now(),
+    )
+    cleared = KnowledgeTag.objects.create(name="Special", slug="special")
+    deleted = KnowledgeTag.objects.create(name="Seasonal", slug="seasonal")
+    article.tags.add(cleared, deleted)
+
+    def matches(query):
+        return list(knowledge_search.search(KnowledgeArticle.objects.all(), query))
+
+    assert matches("special") == [article]
+    cleared.articles.clear()
+    assert matches("special") == []
+
+    assert matches("seasonal") == [article]
+    deleted.delete()
+    assert matches("seasonal") == []
@@ -2,9 +2,11 @@ import time
 
 import pytest
 from django.contrib.auth.models import User
-from django.core.cache import cache
 from django.urls import reverse
 
+from coresite.auth_views import _failed_login_limit
+from utils import ratelimit
+
 
 @pytest.mark.django_db
 def test_failed_login_uses_cache_and_delay(client, monkeypatch):
@@ -17,13 +19,15 @@ def test_failed_login_uses_cache_and_delay(client, monkeypatch):
 
     monkeypatch.setattr(time, "sleep", fake_sleep)
 
+    limit = _failed_login_limit("tester")
+
     client.post(login_url, {"username": "tester", "password": "wrong"})
-    assert cache.get("failed_login_tester") == 1
+    assert ratelimit.usage(limit) == [1]
     assert calls[-1] == 1
 
     client.post(login_url, {"username": "tester", "password": "wrong"})
-    assert cache.get("failed_login_tester") == 2
+    assert ratelimit.usage(limit) == [2]
     assert calls[-1] == 2
 
     client.post(login_url, {"username": "tester", "password": "secret"})
-    assert cache.get("failed_login_tester") is None
+    assert ratelimit.usage(limit) == [0]
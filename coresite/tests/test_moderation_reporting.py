@@ -1,30 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
 from coresite import moderation
+from coresite.models import ModerationAuditEntry, ModerationReport, ReportStatusChoices
 
 
+@pytest.mark.django_db
 def test_report_thread_adds_to_queue(client):
-    moderation.REPORT_QUEUE.clear()
     res = client.get('/community/t/deploy-technofatty/report/')
     assert res.status_code == 302
-    assert len(moderation.REPORT_QUEUE) == 1
-    entry = moderation.REPORT_QUEUE[0]
-    assert entry['target']['type'] == 'thread'
-    assert entry['target']['id'] == 'deploy-technofatty'
+    assert ModerationReport.objects.count() == 1
+    entry = ModerationReport.objects.get()
+    assert entry.target['type'] == 'thread'
+    assert entry.target['id'] == 'deploy-technofatty'
+    assert ModerationAuditEntry.objects.filter(action='report').count() == 1
 
 
+@pytest.mark.django_db
 def test_report_answer_adds_to_queue(client):
-    moderation.REPORT_QUEUE.clear()
     res = client.get('/community/t/deploy-technofatty/a/1/report/')
     assert res.status_code == 302
-    assert len(moderation.REPORT_QUEUE) == 1
-    entry = moderation.REPORT_QUEUE[0]
-    assert entry['target']['type'] == 'answer'
-    assert entry['target']['thread'] == 'deploy-technofatty'
-    assert entry['target']['id'] == 1
+    assert ModerationReport.objects.count() == 1
+    entry = ModerationReport.objects.get()
+    assert entry.target['type'] == 'answer'
+    assert entry.target['thread'] == 'deploy-technofatty'
+    assert entry.target['id'] == 1
+    assert entry.target_key == 'deploy-technofatty:1'
 
 
+@pytest.mark.django_db
 def test_thread_page_has_report_links(client):
+    from coresite.models import Answer
+
+    answer = Answer.objects.filter(thread__slug='deploy-technofatty').first()
     res = client.get('/community/t/deploy-technofatty/')
     assert res.status_code == 200
     html = res.content.decode()
     assert '/community/t/deploy-technofatty/report/' in html
-    assert '/community/t/deploy-technofatty/a/1/report/' in html
+    assert f'/community/t/deploy-technofatty/a/{answer.pk}/report/' in html
+
+
+@pytest.mark.django_db
+def test_dashboard_pages_reports(admin_client, monkeypatch):
+    monkeypatch.setattr('coresite.views.MODERATION_PAGE_SIZE', 2)
+    moderation.queue_reports(None, [{'type': 'thread', 'id': f't{i}'} for i in range(3)])
+
+    res = admin_client.get('/community/moderation/')
+    assert [r.target_key for r in res.context['reports']] == ['t2', 't1']
+    res = admin_client.get('/community/moderation/' + res.context['older_reports_url'])
+    assert [r.target_key for r in res.context['reports']] == ['t0']
+    assert res.context['older_reports_url'] is None
+
+
+@pytest.mark.django_db
+def test_compact_merges_duplicates_and_prunes_history():
+    target = {'type': 'thread', 'id': 'spam'}
+    moderation.queue_reports(None, [target, target, {'type': 'thread', 'id': 'other'}])
+    moderation.queue_report(None, target)
+    old = timezone.now() - timedelta(days=400)
+    ModerationReport.objects.create(
+        created_at=old, reporter='x', target_type='thread', target_key='gone',
+        status=ReportStatusChoices.RESOLVED,
+    )
+    ModerationAuditEntry.objects.create(created_at=old, user='x', action='report')
+
+    call_command('compact_moderation', '--batch-size', '1')
+
+    spam = ModerationReport.objects.get(target_key='spam')
+    assert spam.report_count == 3
+    assert ModerationReport.objects.filter(target_key='other').exists()
+    assert not ModerationReport.objects.filter(target_key='gone').exists()
+    assert ModerationAuditEntry.objects.count() == 4
@@ -0,0 +1,70 @@
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from coresite.cache import NearCache
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "near-cache-tests",
+        },
+    }
+)
+class NearCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.shared = caches["shared"]
+        self.shared.clear()
+        self.near = NearCache("shared", {"OPTIONS": {"NEAR_TIMEOUT": 60, "NEAR_MAX_ENTRIES": 2}})
+
+    def test_reads_are_served_from_near_tier(self):
+        self.near.set("greeting", "hello")
+        self.shared.delete("greeting")
+        self.assertEqual(self.near.get("greeting"), "hello")
+
+    def test_values_written_elsewhere_are_visible(self):
+        self.shared.set("greeting", "from another worker")
+        self.assertEqual(self.near.get("greeting"), "from another worker")
+        self.assertEqual(self.near.get("missing", "default"), "default")
+
+    def test_delete_drops_both_tiers(self):
+        self.near.set("greeting", "hello")
+        self.near.delete("greeting")
+        self.assertIsNone(self.near.get("greeting"))
+        self.assertIsNone(self.shared.get("greeting"))
+
+    def test_near_tier_is_bounded_lru(self):
+        for key in ("a", "b", "c"):
+            self.near.set(key, key)
+        self.shared.clear()
+        self.assertIsNone(self.near.get("a"))
+        self.assertEqual(self.near.get_many(["b", "c"]), {"b": "b", "c": "c"})
+
+    def test_counters_use_shared_tier(self):
+        self.near.set("hits", 1)
+        self.shared.incr("hits")
+        self.assertEqual(self.near.incr("hits"), 3)
+        self.assertEqual(self.near.get("hits"), 3)
+
+    def test_counters_read_in_bulk_stay_out_of_near_tier(self):
+        self.shared.set("hits", 1)
+        self.assertEqual(self.near.get_many(["hits"]), {"hits": 1})
+        self.shared.incr("hits")
+        self.assertEqual(self.near.get("hits"), 2)
+
+    def test_mutating_a_read_value_does_not_leak(self):
+        self.near.set("items", ["a"])
+        self.near.get("items").append("b")
+        self.assertEqual(self.near.get("items"), ["a"])
+        value = {"tags": ["a"]}
+        self.near.set("doc", value)
+        value["tags"].append("b")
+        self.assertEqual(self.near.get("doc"), {"tags": ["a"]})
+
+    def test_expired_near_entries_fall_through(self):
+        near = NearCache("shared", {"OPTIONS": {"NEAR_TIMEOUT": 0}})
+        near.set("greeting", "hello")
+        self.shared.set("greeting", "updated")
+        self.assertEqual(near.get("greeting"), "updated")
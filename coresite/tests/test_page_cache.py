@@ -0,0 +1,69 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from coresite.models import CaseStudy
+from coresite.page_cache import CSRF_PLACEHOLDER
+
+
+@pytest.fixture
+def page_cache(settings):
+    settings.PAGE_CACHE_ENABLED = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_anonymous_page_served_from_cache_without_queries(client, page_cache, django_assert_num_queries):
+    CaseStudy.objects.create(title="Gamma", is_published=True)
+    first = client.get(reverse("case_studies"))
+    assert first["X-Page-Cache"] == "miss"
+
+    with django_assert_num_queries(0):
+        second = client.get(reverse("case_studies"))
+    assert second["X-Page-Cache"] == "hit"
+    assert "Gamma" in second.content.decode()
+    assert second["X-Robots-Tag"] == first["X-Robots-Tag"]
+
+
+@pytest.mark.django_db
+def test_model_save_invalidates_dependent_pages(client, page_cache):
+    study = CaseStudy.objects.create(title="Gamma", is_published=True)
+    client.get(reverse("case_studies"))
+
+    study.title = "Delta"
+    study.save()
+    res = client.get(reverse("case_studies"))
+    assert res["X-Page-Cache"] == "miss"
+    assert "Delta" in res.content.decode()
+
+
+@pytest.mark.django_db
+def test_query_string_and_consent_vary_the_key(client, page_cache):
+    client.get(reverse("case_studies"))
+    assert client.get(reverse("case_studies") + "?a=1")["X-Page-Cache"] == "miss"
+    assert client.get(reverse("case_studies") + "?a=1")["X-Page-Cache"] == "hit"
+
+    client.get(reverse("consent_accept"))
+    assert client.get(reverse("case_studies"))["X-Page-Cache"] == "miss"
+
+
+@pytest.mark.django_db
+def test_authenticated_requests_bypass_cache(client, page_cache):
+    user = User.objects.create_user(username="editor", password="pw")
+    client.force_login(user)
+    client.get(reverse("case_studies"))
+    res = client.get(reverse("case_studies"))
+    assert "X-Page-Cache" not in res
+
+
+@pytest.mark.django_db
+def test_cached_forms_get_a_fresh_csrf_token(client, page_cache):
+    client.get(reverse("home"))
+    res = client.get(reverse("home"))
+    html = res.content.decode()
+    assert res["X-Page-Cache"] == "hit"
+    assert 'name="csrfmiddlewaretoken"' in html
+    assert CSRF_PLACEHOLDER not in html
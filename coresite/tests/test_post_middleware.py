@@ -4,7 +4,8 @@ from django.core.cache import cache
 from django.http import HttpResponse
 from django.test import RequestFactory, TestCase
 
-from coresite.middleware import PENDING_POST_QUEUE, PostRateLimitMiddleware
+from coresite.middleware import PostRateLimitMiddleware
+from coresite.models import PostStatusChoices, Thread
 
 
 def dummy_view(request):
@@ -14,7 +15,6 @@ def dummy_view(request):
 class PostRateLimitMiddlewareTests(TestCase):
     def setUp(self):
         cache.clear()
-        PENDING_POST_QUEUE.clear()
         self.factory = RequestFactory()
         self.middleware = PostRateLimitMiddleware(dummy_view)
 
@@ -42,4 +42,6 @@ class PostRateLimitMiddlewareTests(TestCase):
         req.user = user
         resp = self.middleware(req)
         self.assertEqual(resp.status_code, 202)
-        self.assertEqual(len(PENDING_POST_QUEUE), 1)
+        pending = Thread.objects.get(status=PostStatusChoices.PENDING)
+        self.assertEqual((pending.title, pending.body), ("t", "hi"))
+        self.assertFalse(Thread.published.filter(pk=pending.pk).exists())
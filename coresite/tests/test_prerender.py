@@ -0,0 +1,144 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from coresite.models import (
+    JobStatusChoices,
+    KnowledgeArticle,
+    KnowledgeCategory,
+    PrerenderJob,
+    SiteImage,
+    StatusChoices,
+)
+from coresite.page_cache import CSRF_PLACEHOLDER
+from coresite.services import prerender
+
+
+@pytest.fixture
+def docroot(tmp_path, settings):
+    settings.PRERENDER_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def article(db):
+    category = KnowledgeCategory.objects.create(
+        title="Pricing", slug="pricing", status=StatusChoices.PUBLISHED
+    )
+    return KnowledgeArticle.objects.create(
+        category=category,
+        title="Value pricing",
+        slug="value-pricing",
+        status=StatusChoices.PUBLISHED,
+        published_at=timezone.now(),
+    )
+
+
+def test_render_writes_pages_feeds_and_sitemaps(docroot, article):
+    stats = prerender.render(
+        ["/", article.get_absolute_url(), reverse("knowledge_rss"), "/sitemap.xml", "/robots.txt"]
+    )
+    assert stats == {"written": 5, "removed": 0, "failed": 0}
+    page = (docroot / "knowledge" / "pricing" / "value-pricing" / "index.html").read_text()
+    assert "Value pricing" in page
+    assert (docroot / "knowledge" / "rss" / "index.xml").exists()
+    assert (docroot / "sitemap.xml").read_text().startswith("<?xml")
+    assert (docroot / "robots.txt").exists()
+
+    home = (docroot / "index.html").read_text()
+    assert 'name="csrfmiddlewaretoken"' in home
+    assert f'value="{CSRF_PLACEHOLDER}"' in home
+
+
+def test_render_does_not_log_newsletter_views(docroot, db, client, monkeypatch):
+    from coresite import views
+
+    events = []
+    monkeypatch.setattr(views, "log_newsletter_event", lambda request, event: events.append(event))
+    prerender.render(["/"])
+    assert events == []
+    client.get("/")
+    assert events == ["newsletter_block_view"]
+
+
+def test_unpublished_pages_are_removed(docroot, article):
+    url = article.get_absolute_url()
+    prerender.render([url])
+    article.status = StatusChoices.DRAFT
+    article.save()
+    assert prerender.render([url])["removed"] == 1
+    assert not (docroot / url.lstrip("/") / "index.html").exists()
+
+
+def test_save_queues_affected_pages(
+    docroot, article, settings, django_capture_on_commit_callbacks
+):
+    settings.PRERENDER_ENABLED = True
+    old_url = article.get_absolute_url()
+    prerender.render([old_url])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        article.slug = "value-based-pricing"
+        article.save()
+
+    # Nothing is rendered on the saving request.
+    assert (docroot / old_url.lstrip("/") / "index.html").exists()
+    assert PrerenderJob.objects.filter(path=old_url, status=JobStatusChoices.PENDING).exists()
+    call_command("process_prerender_queue", "--once")
+
+    assert not PrerenderJob.objects.exclude(status=JobStatusChoices.DONE).exists()
+    assert not (docroot / old_url.lstrip("/") / "index.html").exists()
+    assert (docroot / "knowledge" / "pricing" / "value-based-pricing" / "index.html").exists()
+    assert (docroot / "knowledge" / "pricing" / "index.html").exists()
+    assert (docroot / "knowledge" / "index.html").exists()
+
+
+def test_category_and_site_image_changes_are_queued(
+    docroot, article, settings, django_capture_on_commit_callbacks
+):
+    settings.PRERENDER_ENABLED = True
+    category = article.category
+    prerender.render([article.get_absolute_url(), "/knowledge/pricing/"])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        category.status = StatusChoices.DRAFT
+        category.save()
+        SiteImage.objects.create(key="hero1", alt_text="Hero")
+    queued = set(PrerenderJob.objects.values_list("path", flat=True))
+    assert {"/", "/knowledge/pricing/", article.get_absolute_url()} <= queued
+
+    prerender.process_pending(limit=len(queued))
+    assert not (docroot / "knowledge" / "pricing" / "index.html").exists()
+    assert not (docroot / "knowledge" / "pricing" / "value-pricing" / "index.html").exists()
+
+
+def test_requeue_while_rendering_keeps_job_pending(docroot, article, monkeypatch):
+    prerender.enqueue(["/"])
+    original = prerender.render
+
+    def render_and_requeue(paths):
+        paths = list(paths)
+        prerender.enqueue(paths)
+        return original(paths)
+
+    monkeypatch.setattr(prerender, "render", render_and_requeue)
+    assert prerender.process_pending()[0] == 1
+    assert PrerenderJob.objects.get().status == JobStatusChoices.PENDING
+
+
+def test_command_prunes_stale_files(docroot, article):
+    stale = docroot / "retired" / "index.html"
+    stale.parent.mkdir()
+    stale.write_text("old")
+    call_command("prerender")
+    assert not stale.exists()
+    assert (docroot / "knowledge" / "pricing" / "value-pricing" / "index.html").exists()
+
+
+@pytest.mark.django_db
+def test_csrf_endpoint_issues_token(client):
+    res = client.get(reverse("csrf_token"))
+    assert res.json()["token"]
+    assert "csrftoken" in res.cookies
+    assert "no-cache" in res["Cache-Control"]
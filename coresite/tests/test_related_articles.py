@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from coresite.models import (
+    KnowledgeArticle,
+    KnowledgeCategory,
+    KnowledgeTag,
+    RelatedKnowledgeArticle,
+    StatusChoices,
+)
+from coresite.services import related_articles
+
+
+def _category(slug):
+    return KnowledgeCategory.objects.create(
+        title=slug.title(), slug=slug, status=StatusChoices.PUBLISHED
+    )
+
+
+def _article(category, slug, days_old=1, **kwargs):
+    kwargs.setdefault("status", StatusChoices.PUBLISHED)
+    return KnowledgeArticle.objects.create(
+        category=category,
+        title=slug.replace("-", " ").title(),
+        slug=slug,
+        published_at=timezone.now() - timedelta(days=days_old),
+        **kwargs,
+    )
+
+
+def _related_slugs(article):
+    return [a.slug for a in related_articles.related_articles(article, limit=10)]
+
+
+@pytest.mark.django_db
+def test_scores_shared_tags_above_category_and_recency():
+    guides, other = _category("guides"), _category("other")
+    seo, ads = KnowledgeTag.objects.create(name="SEO", slug="seo"), KnowledgeTag.objects.create(name="Ads", slug="ads")
+    source = _article(guides, "source")
+    same_category_new = _article(guides, "same-category-new", days_old=1)
+    same_category_old = _article(guides, "same-category-old", days_old=400)
+    two_tags = _article(other, "two-tags", days_old=200)
+    _article(other, "unrelated")
+    _article(guides, "draft", status=StatusChoices.DRAFT)
+
+    two_tags.tags.add(seo, ads)
+    source.tags.add(seo, ads)
+
+    assert _related_slugs(source) == ["two-tags", "same-category-new", "same-category-old"]
+    assert _related_slugs(same_category_new)[0] == "source"
+
+
+@pytest.mark.django_db
+def test_tag_and_category_changes_refresh_neighbours():
+    guides, other = _category("guides"), _category("other")
+    seo = KnowledgeTag.objects.create(name="SEO", slug="seo")
+    first = _article(guides, "first")
+    second = _article(other, "second")
+    assert _related_slugs(first) == []
+
+    second.tags.add(seo)
+    first.tags.add(seo)
+    assert _related_slugs(first) == ["second"]
+    assert _related_slugs(second) == ["first"]
+
+    seo.articles.clear()
+    assert _related_slugs(first) == []
+    assert _related_slugs(second) == []
+
+    second.category = guides
+    second.save()
+    assert _related_slugs(first) == ["second"]
+
+    second.category = other
+    second.save()
+    assert _related_slugs(first) == []
+
+    second.category = guides
+    second.save()
+    second.delete()
+    assert _related_slugs(first) == []
+
+
+@pytest.mark.django_db
+def test_only_changes_that_affect_scores_rebuild(monkeypatch):
+    guides, other = _category("guides"), _category("other")
+    article = _article(guides, "main")
+    neighbour = _article(guides, "neighbour")
+    draft = _article(guides, "draft", status=StatusChoices.DRAFT)
+    rebuilt = []
+    original = related_articles.rebuild
+    monkeypatch.setattr(
+        related_articles, "rebuild", lambda ids: rebuilt.append(set(ids)) or original(ids)
+    )
+
+    article.title = "Main, typo fixed"
+    article.save()
+    assert rebuilt == []
+
+    # Drafts are never candidates: only the draft's own list can change.
+    draft.category = other
+    draft.save()
+    assert rebuilt == [{draft.pk}]
+
+    article.category = other
+    article.save()
+    assert rebuilt[-1] == {article.pk, neighbour.pk, draft.pk}
+    assert _related_slugs(neighbour) == []
+
+
+@pytest.mark.django_db
+def test_article_page_reads_related_with_one_query(client, django_assert_num_queries):
+    guides = _category("guides")
+    article = _article(guides, "main")
+    for i in range(4):
+        _article(guides, f"neighbour-{i}", days_old=i + 2)
+
+    with django_assert_num_queries(1):
+        related = related_articles.related_articles(article)
+        [a.category.slug for a in related]
+    assert [a.slug for a in related] == ["neighbour-0", "neighbour-1", "neighbour-2"]
+
+    res = client.get(reverse("knowledge_article", args=["guides", "main"]))
+    assert res.status_code == 200
+    assert "Neighbour 0" in res.content.decode()
+
+
+@pytest.mark.django_db
+def test_rebuild_command_restores_links():
+    guides = _category("guides")
+    article = _article(guides, "main")
+    _article(guides, "neighbour")
+    RelatedKnowledgeArticle.objects.all().delete()
+
+    call_command("rebuild_related_articles")
+    assert _related_slugs(article) == ["neighbour"]
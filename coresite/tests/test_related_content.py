@@ -0,0 +1,101 @@
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from coresite.models import (
+    BlogPost,
+    CaseStudy,
+    KnowledgeArticle,
+    KnowledgeCategory,
+    KnowledgeTag,
+    StatusChoices,
+    TaggedContent,
+    Tool,
+)
+from coresite.services import related_content
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def tags(db):
+    return {
+        slug: KnowledgeTag.objects.create(name=slug.title(), slug=slug)
+        for slug in ("pricing", "analytics")
+    }
+
+
+def _article(slug, *tag_objs, status=StatusChoices.PUBLISHED):
+    category, _ = KnowledgeCategory.objects.get_or_create(
+        slug="guides", defaults={"title": "Guides", "status": StatusChoices.PUBLISHED}
+    )
+    article = KnowledgeArticle.objects.create(
+        category=category,
+        title=slug.title(),
+        slug=slug,
+        status=status,
+        published_at=timezone.now(),
+    )
+    article.tags.add(*tag_objs)
+    return article
+
+
+@pytest.mark.django_db
+def test_related_ranks_by_shared_tags_across_kinds(tags):
+    _article("one-tag", tags["pricing"])
+    _article("two-tags", tags["pricing"], tags["analytics"])
+    _article("draft", tags["pricing"], status=StatusChoices.DRAFT)
+    tool = Tool.objects.create(title="TF CLI", slug="tf-cli", is_published=True)
+    tool.tags.add(tags["pricing"])
+    study = CaseStudy.objects.create(title="Hidden", slug="hidden", is_published=False)
+    study.tags.add(tags["pricing"])
+
+    result = related_content.related(["pricing", "analytics"])
+    assert [i["url"] for i in result["knowledge"]] == [
+        "/knowledge/guides/two-tags/",
+        "/knowledge/guides/one-tag/",
+    ]
+    assert result["tools"] == [{"title": "TF CLI", "url": "/tools/tf-cli/"}]
+    assert result["case_studies"] == []
+
+
+@pytest.mark.django_db
+def test_related_is_cached_and_invalidated_by_index_changes(tags, django_assert_num_queries):
+    _article("first", tags["analytics"])
+    related_content.related(["analytics"])
+    with django_assert_num_queries(0):
+        related_content.related(["analytics"])
+
+    study = CaseStudy.objects.create(title="ACME", slug="acme", is_published=True)
+    study.tags.add(tags["analytics"])
+    assert related_content.related(["analytics"])["case_studies"][0]["url"] == "/case-studies/acme/"
+
+    tags["analytics"].case_studies.clear()
+    assert related_content.related(["analytics"])["case_studies"] == []
+
+
+@pytest.mark.django_db
+def test_blog_posts_share_the_taxonomy_and_deletes_drop_rows(tags):
+    post = BlogPost.objects.create(
+        title="Analytics Post",
+        slug="analytics-post",
+        status=StatusChoices.PUBLISHED,
+        published_at=timezone.now(),
+        meta_title="Analytics Post",
+        meta_description="Desc",
+        canonical_url="https://technofatty.com/blog/analytics-post/",
+        og_image_url="https://example.com/og.png",
+        twitter_image_url="https://example.com/tw.png",
+        tags=[{"slug": "analytics", "title": "Analytics"}],
+    )
+    result = related_content.related(["analytics"], limits={"blog": 3})
+    assert result == {"blog": [{"title": "Analytics Post", "url": "/blog/analytics-post/"}]}
+
+    post.delete()
+    assert not TaggedContent.objects.filter(kind="blog").exists()
+    assert related_content.related(["analytics"], limits={"blog": 3}) == {"blog": []}
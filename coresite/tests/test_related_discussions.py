@@ -16,7 +16,7 @@ from coresite.models import (
 @pytest.mark.django_db
 def test_related_discussions_on_knowledge_article(client):
     cat = KnowledgeCategory.objects.create(title="Cat", slug="cat", status=StatusChoices.PUBLISHED)
-    tag = KnowledgeTag.objects.create(name="Deployment", slug="deployment")
+    tag, _ = KnowledgeTag.objects.get_or_create(slug="deployment", defaults={"name": "Deployment"})
     art = KnowledgeArticle.objects.create(
         category=cat,
         title="Article",
@@ -33,6 +33,7 @@ def test_related_discussions_on_knowledge_article(client):
 @pytest.mark.django_db
 def test_related_discussions_on_tool_detail(client):
     tool = Tool.objects.create(title="TF CLI", slug="tf-cli", is_published=True)
+    tool.tags.add(KnowledgeTag.objects.get_or_create(slug="deployment", defaults={"name": "Deployment"})[0])
     res = client.get(reverse("tool_detail", args=[tool.slug]))
     assert "Related discussions" in res.content.decode()
 
@@ -40,6 +41,7 @@ def test_related_discussions_on_tool_detail(client):
 @pytest.mark.django_db
 def test_related_discussions_on_case_study_detail(client):
     cs = CaseStudy.objects.create(title="ACME", slug="acme", is_published=True)
+    cs.tags.add(KnowledgeTag.objects.get_or_create(slug="scaling", defaults={"name": "Scaling"})[0])
     res = client.get(reverse("case_study_detail", args=[cs.slug]))
     assert "Related discussions" in res.content.decode()
 
@@ -66,3 +68,22 @@ def test_related_discussions_on_blog_post(client):
     content = res.content.decode()
     assert "Related discussions" in content
     assert "Subscribe for short, useful tech & music tips" in content
+
+
+@pytest.mark.django_db
+def test_hiding_a_thread_invalidates_tagged_pages(client):
+    from coresite.models import PostStatusChoices, Thread
+
+    tool = Tool.objects.create(title="TF Deploy", slug="tf-deploy", is_published=True)
+    tag, _ = KnowledgeTag.objects.get_or_create(slug="deployment", defaults={"name": "Deployment"})
+    tool.tags.add(tag)
+    thread = Thread.objects.create(title="Spam thread", body="?")
+    thread.tags.add(tag)
+    first = client.get(reverse("tool_detail", args=[tool.slug]))
+    assert "Spam thread" in first.content.decode()
+
+    thread.status = PostStatusChoices.REJECTED
+    thread.save()
+    res = client.get(reverse("tool_detail", args=[tool.slug]), HTTP_IF_NONE_MATCH=first["ETag"])
+    assert res.status_code == 200
+    assert "Spam thread" not in res.content.decode()
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from coresite import page_cache
+from coresite.models import (
+    KnowledgeArticle,
+    KnowledgeCategory,
+    KnowledgeTag,
+    StatusChoices,
+    TaggedContent,
+)
+from coresite.services import related_articles, scheduled_publishing
+
+
+@pytest.fixture
+def category():
+    return KnowledgeCategory.objects.create(
+        title="Guides", slug="guides", status=StatusChoices.PUBLISHED
+    )
+
+
+def _scheduled(category, slug, minutes):
+    return KnowledgeArticle.objects.create(
+        category=category,
+        title=slug.replace("-", " ").title(),
+        slug=slug,
+        status=StatusChoices.DRAFT,
+        published_at=timezone.now() + timedelta(minutes=minutes),
+    )
+
+
+@pytest.mark.django_db
+def test_publishes_due_batch_in_one_update(
+    category, django_assert_max_num_queries, django_capture_on_commit_callbacks
+):
+    tag = KnowledgeTag.objects.create(name="SEO", slug="seo")
+    live = KnowledgeArticle.objects.create(
+        category=category,
+        title="Live",
+        slug="live",
+        status=StatusChoices.PUBLISHED,
+        published_at=timezone.now() - timedelta(days=1),
+    )
+    due = [_scheduled(category, f"due-{n}", -n - 1) for n in range(3)]
+    later = _scheduled(category, "later", 30)
+    for article in due:
+        article.tags.add(tag)
+    version = page_cache.current_version("knowledge")
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        with django_assert_max_num_queries(6):
+            ids = scheduled_publishing.publish_due()
+    assert sorted(ids) == sorted(a.pk for a in due)
+    assert page_cache.current_version("knowledge") == version
+    for callback in callbacks:
+        callback()
+
+    statuses = dict(KnowledgeArticle.objects.values_list("slug", "status"))
+    assert statuses["due-0"] == statuses["due-2"] == StatusChoices.PUBLISHED
+    assert statuses["later"] == StatusChoices.DRAFT
+    assert page_cache.current_version("knowledge") != version
+    assert "due-0" in [a.slug for a in related_articles.related_articles(live, limit=10)]
+    assert TaggedContent.objects.filter(tag="seo", object_id=due[0].pk).exists()
+    assert scheduled_publishing.next_due() == later.published_at
+
+
+@pytest.mark.django_db
+def test_publish_all_due_batches(category):
+    for n in range(5):
+        _scheduled(category, f"due-{n}", -1)
+
+    assert scheduled_publishing.publish_all_due(batch_size=2) == 5
+    assert scheduled_publishing.publish_due() == []
+    assert scheduled_publishing.next_due() is None
+
+
+@pytest.mark.django_db
+def test_command_publishes_and_exits(category, capsys):
+    _scheduled(category, "due", -1)
+    _scheduled(category, "later", 30)
+
+    call_command("publish_scheduled_articles")
+
+    assert "Published 1 articles." in capsys.readouterr().out
+    assert KnowledgeArticle.published.filter(slug="due").exists()
+    assert not KnowledgeArticle.published.filter(slug="later").exists()
+
+
+@pytest.mark.django_db
+def test_failing_follow_up_step_does_not_skip_the_rest(
+    category, monkeypatch, django_capture_on_commit_callbacks
+):
+    _scheduled(category, "due", -1)
+    version = page_cache.current_version("knowledge")
+    refreshed = []
+
+    def broken(ids):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(related_articles, "rebuild", broken)
+    from coresite import feeds
+
+    monkeypatch.setattr(feeds, "refresh", lambda *a, **k: refreshed.append(a))
+    with django_capture_on_commit_callbacks(execute=True):
+        assert len(scheduled_publishing.publish_due()) == 1
+
+    assert page_cache.current_version("knowledge") != version
+    assert refreshed == [("knowledge",)]
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+
+from utils import singleflight
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_fresh_value_is_reused_until_version_changes():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert singleflight.get_or_set("k", compute, 60, version="v1") == 1
+    assert singleflight.get_or_set("k", compute, 60, version="v1") == 1
+    assert singleflight.get_or_set("k", compute, 60, version="v2") == 2
+    assert len(calls) == 2
+
+
+def test_stale_value_served_while_another_caller_recomputes():
+    singleflight.store("k", "old", 0, version="v1")
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "new"
+
+    worker = threading.Thread(
+        target=lambda: results.append(singleflight.get_or_set("k", slow, 60, version="v1"))
+    )
+    worker.start()
+    assert started.wait(5)
+    # The lock is held: a concurrent reader gets the stale value and does
+    # not recompute.
+    assert singleflight.get_or_set("k", lambda: pytest.fail("stampede"), 60, version="v1") == "old"
+    release.set()
+    worker.join(5)
+    assert results == ["new"]
+    assert singleflight.get_or_set("k", lambda: pytest.fail("recomputed"), 60, version="v1") == "new"
+
+
+def test_older_version_is_not_served_while_locked(monkeypatch):
+    monkeypatch.setattr(singleflight, "POLL_INTERVAL", 0.01)
+    singleflight.store("k", "old", 60, version="v1")
+    cache.add(f"{singleflight.LOCK_PREFIX}:k", 1, 30)
+
+    timer = threading.Timer(0.05, lambda: singleflight.store("k", "built", 60, version="v2"))
+    timer.start()
+    assert singleflight.get_or_set("k", lambda: "own", 60, version="v2", wait=2) == "built"
+    timer.join()
+    # With nobody finishing in time, the caller computes rather than serve "old".
+    singleflight.store("k", "old", 60, version="v1")
+    assert singleflight.get_or_set("k", lambda: "own", 60, version="v2", wait=0.05) == "own"
+
+
+def test_cold_key_waits_for_lock_holder(monkeypatch):
+    monkeypatch.setattr(singleflight, "POLL_INTERVAL", 0.01)
+    cache.add(f"{singleflight.LOCK_PREFIX}:k", 1, 30)
+
+    def finish():
+        singleflight.store("k", "built", 60)
+
+    timer = threading.Timer(0.05, finish)
+    timer.start()
+    assert singleflight.get_or_set("k", lambda: "own", 60, wait=2) == "built"
+    timer.join()
+
+
+def test_lock_released_when_compute_fails():
+    def boom():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        singleflight.get_or_set("k", boom, 60)
+    assert singleflight.get_or_set("k", lambda: "ok", 60) == "ok"
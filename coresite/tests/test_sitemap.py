@@ -0,0 +1,92 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from coresite.models import KnowledgeArticle, KnowledgeCategory, StatusChoices
+from coresite.services import sitemaps
+
+NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _locs(res):
+    root = ET.fromstring(res.content)
+    return [el.text for el in root.iter(f"{NS}loc")]
+
+
+def _article(category, slug, **kwargs):
+    kwargs.setdefault("status", StatusChoices.PUBLISHED)
+    return KnowledgeArticle.objects.create(
+        category=category,
+        title=slug.title(),
+        slug=slug,
+        published_at=timezone.now(),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def category(db):
+    return KnowledgeCategory.objects.create(
+        title="Pricing", slug="pricing", status=StatusChoices.PUBLISHED
+    )
+
+
+@pytest.mark.django_db
+def test_index_lists_a_shard_per_section(client, settings):
+    locs = _locs(client.get(reverse("sitemap_xml")))
+    base = settings.SITE_BASE_URL
+    assert f"{base}/sitemap-pages-1.xml" in locs
+    assert f"{base}/sitemap-blog-1.xml" in locs
+    assert f"{base}/sitemap-knowledge-categories-1.xml" in locs
+    assert f"{base}/sitemap-knowledge-1.xml" in locs
+    for loc in locs:
+        assert client.get(loc[len(base):]).status_code == 200
+
+
+def test_knowledge_shards_list_published_pages_with_lastmod(client, settings, category):
+    article = _article(category, "value-pricing")
+    _article(category, "draft-pricing", status=StatusChoices.DRAFT)
+
+    res = client.get(reverse("sitemap_section", args=["knowledge", 1]))
+    locs = _locs(res)
+    assert f"{settings.SITE_BASE_URL}{article.get_absolute_url()}" in locs
+    assert not any("draft-pricing" in loc for loc in locs)
+    assert f"<lastmod>{article.updated_at.date().isoformat()}</lastmod>" in res.content.decode()
+
+    categories = _locs(client.get(reverse("sitemap_section", args=["knowledge-categories", 1])))
+    assert f"{settings.SITE_BASE_URL}/knowledge/pricing/" in categories
+
+
+def test_shards_split_by_size_and_unknown_shards_404(client, monkeypatch, category):
+    monkeypatch.setattr(sitemaps, "SHARD_SIZE", 2)
+    for n in range(3):
+        _article(category, f"article-{n}")
+    locs = _locs(client.get(reverse("sitemap_xml")))
+    assert any(loc.endswith("/sitemap-knowledge-2.xml") for loc in locs)
+    assert len(_locs(client.get(reverse("sitemap_section", args=["knowledge", 1])))) == 2
+    assert len(_locs(client.get(reverse("sitemap_section", args=["knowledge", 2])))) == 1
+    assert client.get(reverse("sitemap_section", args=["knowledge", 3])).status_code == 404
+    assert client.get(reverse("sitemap_section", args=["pages", 2])).status_code == 404
+    assert client.get(reverse("sitemap_section", args=["nope", 1])).status_code == 404
+
+
+def test_edit_only_rebuilds_its_own_shard(client, django_assert_num_queries, category):
+    blog_url = reverse("sitemap_section", args=["blog", 1])
+    knowledge_url = reverse("sitemap_section", args=["knowledge", 1])
+    client.get(blog_url)
+    client.get(knowledge_url)
+
+    _article(category, "fresh-article")
+    with django_assert_num_queries(0):
+        client.get(blog_url)
+    assert any("fresh-article" in loc for loc in _locs(client.get(knowledge_url)))
@@ -1,12 +1,16 @@
 import tempfile
+from io import StringIO
+from unittest import mock
 from urllib.parse import urlparse
 
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.conf import settings
 from django.core.files.storage import default_storage
 from PIL import Image
 
-from coresite.models import BlogPost, PrimaryGoalChoices
+from coresite.models import BlogPost, JobStatusChoices, PrimaryGoalChoices
+from coresite.services import social_images
 
 
 @override_settings(
@@ -20,10 +24,23 @@ class SocialImageGenerationTests(TestCase):
         parsed = urlparse(url)
         return parsed.path.replace(settings.MEDIA_URL, "", 1)
 
-    def test_images_created_on_save(self):
+    def test_save_queues_job_and_serves_placeholder(self):
         post = BlogPost.objects.create(
-            title="My Branded Post", primary_goal=PrimaryGoalChoices.NEWSLETTER
+            title="My Branded Post", primary_goal=PrimaryGoalChoices.NEWSLETTER,
+            canonical_url="https://example.com/blog/post/",
         )
+        assert post.og_image_url == social_images.placeholder_url()
+        assert post.twitter_image_url == social_images.placeholder_url()
+        assert post.social_image_job.status == JobStatusChoices.PENDING
+
+    def test_worker_renders_images(self):
+        post = BlogPost.objects.create(
+            title="My Branded Post", primary_goal=PrimaryGoalChoices.NEWSLETTER,
+            canonical_url="https://example.com/blog/post/",
+        )
+        assert social_images.process_pending() == (1, 1)
+        post.refresh_from_db()
+        assert post.social_image_job.status == JobStatusChoices.DONE
         rel = self._rel_path(post.og_image_url)
         assert post.og_image_url.startswith("https://example.com/media/social/")
         assert post.twitter_image_url.startswith("https://example.com/media/social/")
@@ -31,12 +48,81 @@ class SocialImageGenerationTests(TestCase):
         with default_storage.open(rel, "rb") as f:
             img = Image.open(f)
             assert img.size == (1200, 630)
+        twitter_rel = self._rel_path(post.twitter_image_url)
+        with default_storage.open(rel, "rb") as og, default_storage.open(twitter_rel, "rb") as tw:
+            assert og.read() == tw.read()
+        assert social_images.process_pending() == (0, 0)
+
+    def test_requeued_job_is_not_overwritten_by_stale_render(self):
+        post = BlogPost.objects.create(
+            title="Title", meta_title="One", primary_goal=PrimaryGoalChoices.NEWSLETTER,
+            canonical_url="https://example.com/blog/post/",
+        )
+        [job] = social_images.claim_jobs(10)
+        post.meta_title = "Two"
+        post.save()
+        assert social_images.run_job(job) is False
+        post.refresh_from_db()
+        assert post.og_image_url == social_images.placeholder_url()
+        assert post.social_image_job.status == JobStatusChoices.PENDING
 
     def test_regenerates_on_meta_title_change(self):
         post = BlogPost.objects.create(
-            title="Title", meta_title="One", primary_goal=PrimaryGoalChoices.NEWSLETTER
+            title="Title", meta_title="One", primary_goal=PrimaryGoalChoices.NEWSLETTER,
+            canonical_url="https://example.com/blog/post/",
         )
+        social_images.process_pending()
+        post.refresh_from_db()
         first_url = post.og_image_url
         post.meta_title = "Two"
         post.save()
+        social_images.process_pending()
+        post.refresh_from_db()
         assert post.og_image_url != first_url
+        assert post.og_image_url != social_images.placeholder_url()
+
+    def test_regen_command_skips_existing_hashes(self):
+        post = BlogPost.objects.create(
+            title="Regen Me", primary_goal=PrimaryGoalChoices.NEWSLETTER,
+            canonical_url="https://example.com/blog/regen/",
+        )
+        out = StringIO()
+        call_command("regen_social_images", workers=1, stdout=out)
+        assert "Rendered 1 posts, skipped 0" in out.getvalue()
+        post.refresh_from_db()
+        assert post.og_image_url.startswith("https://example.com/media/social/regen-me-")
+        assert post.social_image_job.status == JobStatusChoices.DONE
+
+        with mock.patch(
+            "coresite.management.commands.regen_social_images.render_card"
+        ) as render:
+            out = StringIO()
+            call_command("regen_social_images", workers=1, stdout=out)
+        render.assert_not_called()
+        assert "Rendered 0 posts, skipped 1" in out.getvalue()
+
+    def test_regen_command_renders_in_process_pool(self):
+        for title in ("Pool One", "Pool Two"):
+            BlogPost.objects.create(
+                title=title, primary_goal=PrimaryGoalChoices.NEWSLETTER,
+                canonical_url="https://example.com/blog/pool/",
+            )
+        out = StringIO()
+        call_command("regen_social_images", workers=2, force=True, stdout=out)
+        assert "Rendered 2 posts" in out.getvalue()
+        for post in BlogPost.objects.all():
+            with default_storage.open(self._rel_path(post.og_image_url), "rb") as f:
+                assert Image.open(f).size == (1200, 630)
+
+    def test_wrap_uses_cached_widths(self):
+        assert social_images._get_font(80) is social_images._get_font(80)
+        text = "A fairly long social card title that certainly needs wrapping"
+        lines = social_images._wrap_text(text, 80, 1080)
+        assert len(lines) > 1
+        assert " ".join(lines) == text
+        font = social_images._get_font(80)
+        for line in lines:
+            assert font.getlength(line) <= 1080
+        hits = social_images._text_width.cache_info().hits
+        social_images._wrap_text(text, 80, 1080)
+        assert social_images._text_width.cache_info().hits > hits
@@ -4,6 +4,7 @@ import pytest
 from django.test import override_settings
 
 
+@pytest.mark.django_db
 @override_settings(SITE_BASE_URL="https://technofatty.com")
 def test_thread_page_has_qapage_schema(client):
     res = client.get("/community/t/deploy-technofatty/")
@@ -16,11 +17,13 @@ def test_thread_page_has_qapage_schema(client):
     assert "QAPage" in types
 
 
+@pytest.mark.django_db
 def test_thread_page_404(client):
     res = client.get("/community/t/does-not-exist/")
     assert res.status_code == 404
 
 
+@pytest.mark.django_db
 def test_no_accepted_answer_state(client):
     res = client.get("/community/t/api-authentication-options/")
     html = res.content.decode()
@@ -71,3 +71,61 @@ def test_tools_page_logs_gaps_when_empty(client, monkeypatch):
     client.get(reverse("tools"))
     assert ("tools", "tools_page") in calls
     assert ("knowledge", "tools_page") in calls
+
+
+def test_log_gap_dedupes_and_rotates(tmp_path, monkeypatch, settings):
+    from utils import backlog
+
+    settings.EVENT_BUFFER_ENABLED = True
+    path = tmp_path / "backlog.log"
+    monkeypatch.setattr(backlog, "LOG_PATH", str(path))
+    monkeypatch.setattr(backlog, "LOG_MAX_BYTES", 60)
+    monkeypatch.setattr(backlog, "_seen", type(backlog._seen)())
+    monkeypatch.setattr(backlog, "GAPS", type(backlog.GAPS)(maxlen=2))
+
+    backlog.log_gap("tools", "tools_page")
+    backlog.log_gap("tools", "tools_page")
+    backlog.log_gap("knowledge", "tools_page")
+    assert not path.exists()
+    assert backlog._sink.flush() == 2
+    assert len(path.read_text().splitlines()) == 2
+
+    backlog.log_gap("blog", "tools_page")
+    backlog._sink.flush()
+    assert [gap[0] for gap in backlog.GAPS] == ["knowledge", "blog"]
+    assert path.read_text().endswith("|blog|tools_page\n")
+    assert len((tmp_path / "backlog.log.1").read_text().splitlines()) == 2
+
+
+def test_concurrent_backlog_writes_rotate_once(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    from utils import backlog
+
+    path = tmp_path / "backlog.log"
+    monkeypatch.setattr(backlog, "LOG_PATH", str(path))
+    monkeypatch.setattr(backlog, "LOG_MAX_BYTES", 10_000)
+    monkeypatch.setattr(backlog, "LOG_BACKUPS", 50)
+    line = {"line": "x" * 99 + "\n"}
+    rotate = backlog._rotate
+
+    def slow_rotate(path):
+        time.sleep(0.01)
+        rotate(path)
+
+    monkeypatch.setattr(backlog, "_rotate", slow_rotate)
+
+    def write():
+        for _ in range(20):
+            backlog._write_lines([line])
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    files = [f for f in tmp_path.glob("backlog.log*") if not f.name.endswith(".lock")]
+    assert sorted(f.name for f in files) == ["backlog.log", "backlog.log.1"]
+    assert sum(len(f.read_text().splitlines()) for f in files) == 160
@@ -1,37 +1,49 @@
-from django.http import Http404, HttpResponse, HttpResponsePermanentRedirect, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponsePermanentRedirect,
+    HttpResponseRedirect,
+    JsonResponse,
+)
+from django.middleware.csrf import get_token
+from django.views.decorators.cache import never_cache
 from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
-from django.utils import timezone
-from django.utils.feedgenerator import Rss201rev2Feed
-from django.db.models import Q, Max
+from django.db.models import Max
 from newsletter.utils import log_newsletter_event
-from django.core.cache import cache
 from coresite.services.contact import contact_event
+from coresite.services import knowledge_search, prerender, related_articles, related_content, sitemaps
 from .models import (
     SiteImage,
     BlogPost,
+    BlogTag,
     KnowledgeCategory,
     KnowledgeArticle,
     Tool,
     CaseStudy,
-    SITEMAP_CACHE_KEY,
     PrimaryGoalChoices,
+    PostStatusChoices,
+    Thread,
+    ModerationReport,
+    ModerationAuditEntry,
+    ReportStatusChoices,
 )
 from .forms import ContactForm
 from .notifiers import ContactNotifier
-from datetime import datetime
 import hashlib
+import math
 import json
 from .signals import get_signals_content
 from .support import get_support_content
 from .community import get_community_content
 from .footer import get_footer_content
 from coresite.context_processors import NAV_LINKS
+from .page_cache import cache_public_page, conditional_on, current_version
 from . import moderation
 from django.contrib.admin.views.decorators import staff_member_required
-from utils import backlog
+from utils import backlog, keyset, ratelimit, singleflight
 
 
 KNOWLEDGE_SUB_SECTIONS = [
@@ -41,200 +53,26 @@ KNOWLEDGE_SUB_SECTIONS = [
     {"title": "Quick Wins", "url_name": "knowledge_quick_wins"},
 ]
 
-# Legacy endpoints like /services/, /signup/, /community/join/, and /signals/<slug>/
-# are intentionally omitted to keep retired paths out of the sitemap.
-TOP_LEVEL_URLS = [
-    {"loc": f"{settings.SITE_BASE_URL}/", "priority": "1.0", "changefreq": "weekly"},
-    {
-        "loc": f"{settings.SITE_BASE_URL}/knowledge/",
-        "priority": "0.8",
-        "changefreq": "weekly",
-    },
-    {"loc": f"{settings.SITE_BASE_URL}/blog/", "priority": "0.8", "changefreq": "weekly"},
-    {
-        "loc": f"{settings.SITE_BASE_URL}/resources/",
-        "priority": "0.8",
-        "changefreq": "weekly",
-    },
-    *(
-        [
-            {
-                "loc": f"{settings.SITE_BASE_URL}/case-studies/",
-                "priority": "0.7",
-                "changefreq": "weekly",
-            }
-        ]
-        if settings.CASE_STUDIES_INDEXABLE
-        else []
-    ),
-    {
-        "loc": f"{settings.SITE_BASE_URL}/community/",
-        "priority": "0.8",
-        "changefreq": "weekly",
-    },
-]
-
-
-# Placeholder thread and related content data for the community hub.
-THREADS = [
-    {
-        "title": "How do I deploy Technofatty?",
-        "slug": "deploy-technofatty",
-        "tags": ["deployment"],
-        "replies": 3,
-        "updated": datetime(2024, 1, 15),
-        "answered": True,
-        "author": "Priya",
-    },
-    {
-        "title": "Scaling best practices?",
-        "slug": "scaling-best-practices",
-        "tags": ["scaling"],
-        "replies": 0,
-        "updated": datetime(2024, 2, 10),
-        "answered": False,
-        "author": "Liam",
-    },
-    {
-        "title": "API authentication options",
-        "slug": "api-authentication-options",
-        "tags": ["api", "security"],
-        "replies": 1,
-        "updated": datetime(2024, 2, 5),
-        "answered": False,
-        "author": "Ava",
-    },
-    {
-        "title": "How do I contribute to Technofatty?",
-        "slug": "contribute-to-technofatty",
-        "tags": ["community"],
-        "replies": 1,
-        "updated": datetime(2024, 3, 5),
-        "answered": True,
-        "author": "Mia",
-    },
-]
-
-RELATED_CONTENT_ITEMS = {
-    "knowledge": [
-        {"title": "Getting Started", "url": "/knowledge/getting-started/", "tags": ["deployment"]},
-        {"title": "Scaling 101", "url": "/knowledge/scaling-101/", "tags": ["scaling"]},
-        {"title": "API Security", "url": "/knowledge/api-security/", "tags": ["api", "security"]},
-    ],
-    "tools": [
-        {"title": "TF CLI", "url": "/tools/tf-cli/", "tags": ["deployment"]},
-    ],
-    "case_studies": [
-        {"title": "ACME scales with TF", "url": "/case-studies/acme/", "tags": ["scaling"]},
-    ],
-}
-
-# Tags for non-article content to align taxonomy across the site.
-TOOL_TAGS = {
-    "tf-cli": ["deployment"],
-    "roi-calculator": ["scaling"],
-    "content-ideator": ["community"],
-}
-
-CASE_STUDY_TAGS = {
-    "acme": ["scaling"],
-    "alpha": ["deployment"],
-    "beta": ["scaling"],
-}
-
-
 def _content_tags(obj):
     """Return a list of tag slugs for the given content object."""
     if isinstance(obj, KnowledgeArticle):
         return list(obj.tags.values_list("slug", flat=True))
     if isinstance(obj, BlogPost):
         return [t.get("slug") for t in obj.tags or []]
-    if isinstance(obj, Tool):
-        return TOOL_TAGS.get(obj.slug, [])
-    if isinstance(obj, CaseStudy):
-        return CASE_STUDY_TAGS.get(obj.slug, [])
+    if isinstance(obj, (Tool, CaseStudy)):
+        return list(obj.tags.values_list("slug", flat=True))
     return []
 
 
 def _related_threads(tags):
-    """Return threads that share any of the given tags."""
-    return [t for t in THREADS if set(tags) & set(t["tags"])][:3]
-
-
-# Placeholder thread content for individual thread pages.
-THREAD_DETAILS = {
-    "deploy-technofatty": {
-        "title": "How do I deploy Technofatty?",
-        "body": "What's the best way to deploy the platform?",
-        "author": "Priya",
-        "created": datetime(2024, 1, 10),
-        "answers": [
-            {
-                "id": 1,
-                "author": "Sam",
-                "body": "Use Docker Compose for a quick start.",
-                "is_staff": True,
-                "accepted": True,
-                "created": datetime(2024, 1, 16),
-            },
-            {
-                "id": 2,
-                "author": "Alex",
-                "body": "Kubernetes works well once you scale.",
-                "is_staff": False,
-                "accepted": False,
-                "created": datetime(2024, 1, 17),
-            },
-            {
-                "id": 3,
-                "author": "Priya",
-                "body": "Thanks everyone, the Docker route worked!",
-                "is_staff": False,
-                "accepted": False,
-                "created": datetime(2024, 1, 18),
-            },
-        ],
-    },
-    "scaling-best-practices": {
-        "title": "Scaling best practices?",
-        "body": "How should I scale Technofatty for growing workloads?",
-        "author": "Liam",
-        "created": datetime(2024, 2, 1),
-        "answers": [],
-    },
-    "api-authentication-options": {
-        "title": "API authentication options",
-        "body": "Which authentication methods does the API support?",
-        "author": "Ava",
-        "created": datetime(2024, 2, 3),
-        "answers": [
-            {
-                "id": 1,
-                "author": "Tom",
-                "body": "OAuth2 and API keys are both available.",
-                "is_staff": False,
-                "accepted": False,
-                "created": datetime(2024, 2, 6),
-            }
-        ],
-    },
-    "contribute-to-technofatty": {
-        "title": "How do I contribute to Technofatty?",
-        "body": "I'd like to help. Where should I start?",
-        "author": "Mia",
-        "created": datetime(2024, 3, 1),
-        "answers": [
-            {
-                "id": 1,
-                "author": "Zoe",
-                "body": "Check out our CONTRIBUTING guide and join discussions in this community.",
-                "is_staff": True,
-                "accepted": True,
-                "created": datetime(2024, 3, 6),
-            }
-        ],
-    },
-}
+    """Return the most recently active threads sharing any of ``tags``."""
+    if not tags:
+        return []
+    return list(
+        Thread.published.filter(tags__slug__in=tags)
+        .distinct()
+        .order_by("-last_activity_at", "-id")[:3]
+    )
 
 
 def _redirect_with_consent_flag(referer: str) -> str:
@@ -273,7 +111,22 @@ def consent_decline(request):
     return response
 
 
+@never_cache
+def csrf_token(request):
+    """Issue a CSRF token for forms on pre-rendered pages (see main.js)."""
+    return JsonResponse({"token": get_token(request)})
+
+
 def homepage(request):
+    # The pre-render worker is not a visitor; don't count its renders.
+    if not prerender.is_prerender_request(request):
+        log_newsletter_event(request, "newsletter_block_view")
+    return _homepage(request)
+
+
+@conditional_on("case_studies", "site_images")
+@cache_public_page("case_studies", "site_images")
+def _homepage(request):
     resources = [
         {
             "title": "AI for Marketing",
@@ -304,7 +157,6 @@ def homepage(request):
     context = {
         "site_images": images,
         "is_homepage": True,
-        "now": datetime.now(),
         "resources": resources,
         "case_studies": case_studies,
         "featured_grid_version": f"{resources_sig}:{cs_qs.count()}:{cs_ver_ts}",
@@ -314,7 +166,6 @@ def homepage(request):
         "footer": footer,
         "canonical_url": "/",
     }
-    log_newsletter_event(request, "newsletter_block_view")
     return render(request, "coresite/homepage.html", context)
 
 
@@ -325,6 +176,10 @@ def signal_detail(request, slug: str):
         "coresite/signal_placeholder.html",
         {"slug": slug, "footer": footer},
     )
+
+
+@conditional_on("knowledge")
+@cache_public_page("knowledge")
 def knowledge(request):
     page_str = request.GET.get("page")
     if page_str == "1":
@@ -362,11 +217,7 @@ def knowledge(request):
         if minutes is not None:
             articles_qs = articles_qs.filter(reading_time__lte=minutes)
     if search:
-        articles_qs = articles_qs.filter(
-            Q(title__icontains=search)
-            | Q(blurb__icontains=search)
-            | Q(tags__name__icontains=search)
-        ).distinct()
+        articles_qs = knowledge_search.search(articles_qs, search)
     paginator = Paginator(articles_qs, 9)
     try:
         page_obj = paginator.page(page_number)
@@ -442,6 +293,8 @@ def knowledge(request):
     return response
 
 
+@conditional_on("knowledge")
+@cache_public_page("knowledge")
 def knowledge_category(request, category_slug: str):
     page_str = request.GET.get("page")
     if page_str == "1":
@@ -486,6 +339,8 @@ def knowledge_category(request, category_slug: str):
     return render(request, "coresite/knowledge/category.html", context)
 
 
+@conditional_on("knowledge", "community")
+@cache_public_page("knowledge", "community")
 def knowledge_article(request, category_slug: str, article_slug: str):
     footer = get_footer_content()
     if request.GET.get("preview") == "1" and request.user.is_staff:
@@ -502,23 +357,7 @@ def knowledge_article(request, category_slug: str, article_slug: str):
             category=category,
             slug=article_slug,
         )
-    related_limit = 3
-    related_articles = list(
-        KnowledgeArticle.published.filter(category=category)
-        .exclude(id=article.id)
-        .order_by("-published_at")[:related_limit]
-    )
-    if len(related_articles) < related_limit:
-        tags = article.tags.all()
-        if tags:
-            tag_related = (
-                KnowledgeArticle.published.filter(tags__in=tags)
-                .exclude(id=article.id)
-                .exclude(id__in=[a.id for a in related_articles])
-                .distinct()
-                .order_by("-published_at")[: related_limit - len(related_articles)]
-            )
-            related_articles.extend(tag_related)
+    related = related_articles.related_articles(article)
 
     tags = _content_tags(article)
     context = {
@@ -528,7 +367,7 @@ def knowledge_article(request, category_slug: str, article_slug: str):
         "category": category,
         "article": article,
         "canonical_url": f"/knowledge/{category_slug}/{article_slug}/",
-        "related_articles": related_articles,
+        "related_articles": related,
         "related_discussions": _related_threads(tags),
     }
     return render(request, "coresite/knowledge/article.html", context)
@@ -583,6 +422,8 @@ _CASE_STUDY_ROBOTS = (
 )
 
 
+@conditional_on("case_studies")
+@cache_public_page("case_studies")
 def case_studies(request):
     footer = get_footer_content()
     studies = CaseStudy.objects.filter(is_published=True)
@@ -603,6 +444,8 @@ case_studies.context_object_name = "case_studies"
 case_studies.meta_robots = _CASE_STUDY_ROBOTS
 
 
+@conditional_on("case_studies", "community")
+@cache_public_page("case_studies", "community")
 def case_study_detail(request, slug: str):
     preview = request.GET.get("preview") == "1" and request.user.is_staff
     lookup = {"slug": slug}
@@ -690,6 +533,8 @@ def _get_tools_blog_items():
     ]
 
 
+@conditional_on("tools")
+@cache_public_page("tools")
 def tools(request):
     footer = get_footer_content()
     robots = "index,follow" if settings.TOOLS_INDEXABLE else "noindex,nofollow"
@@ -720,6 +565,8 @@ def tools(request):
     return response
 
 
+@conditional_on("tools", "community")
+@cache_public_page("tools", "community")
 def tool_detail(request, slug: str):
     footer = get_footer_content()
     tool = get_object_or_404(Tool.objects.published(), slug=slug)
@@ -740,50 +587,73 @@ def tool_detail(request, slug: str):
     return response
 
 
+COMMUNITY_PAGE_SIZE = 10
+COMMUNITY_COUNT_TIMEOUT = 600
+
+
+def _community_thread_count(threads_qs, unanswered: bool, tag) -> int:
+    """Count the hub's threads once per community change, not per request."""
+    digest = hashlib.md5(f"{unanswered}:{tag or ''}".encode()).hexdigest()
+    return singleflight.get_or_set(
+        f"community:count:{digest}",
+        threads_qs.count,
+        COMMUNITY_COUNT_TIMEOUT,
+        version=current_version("community"),
+    )
+
+
 def community(request):
-    """Render the community hub with basic filtering and pagination."""
+    """Render the community hub with filtering and keyset pagination.
+
+    Next/previous links carry a cursor so deep pages seek straight to their
+    rows on the ``(status, [answered,] last_activity_at, id)`` indexes. Plain
+    ``?page=N`` links (canonical URLs, old bookmarks) fall back to an offset.
+    """
     footer = get_footer_content()
     filter_param = request.GET.get("filter", "latest")
     tag = request.GET.get("tag")
-    page_number = int(request.GET.get("page", 1))
+    try:
+        page_number = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page_number = 1
     robots = "index,follow"
 
     error = False
-    from django.core.paginator import Paginator, EmptyPage
     try:
-        threads = list(THREADS)
+        threads_qs = Thread.published.all()
         if filter_param == "unanswered":
-            threads = [t for t in threads if not t["answered"]]
+            threads_qs = threads_qs.filter(answered=False)
         if tag:
-            threads = [t for t in threads if tag in t["tags"]]
-        threads.sort(key=lambda t: t["updated"], reverse=True)
-        paginator = Paginator(threads, 10)
-        page_obj = paginator.page(page_number)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+            threads_qs = threads_qs.filter(tags__slug=tag)
+        count = _community_thread_count(threads_qs, filter_param == "unanswered", tag)
+        num_pages = max(math.ceil(count / COMMUNITY_PAGE_SIZE), 1)
+        page_number = min(page_number, num_pages)
+        page_obj = keyset.paginate(
+            threads_qs.prefetch_related("tags"),
+            ("last_activity_at", "id"),
+            COMMUNITY_PAGE_SIZE,
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+            offset=(page_number - 1) * COMMUNITY_PAGE_SIZE,
+        )
     except Exception:
-        threads = []
-        paginator = Paginator([], 1)
-        page_obj = paginator.page(1)
+        num_pages = 1
+        page_number = 1
+        page_obj = keyset.KeysetPage([], None, None)
         error = True
 
     selected_tags = set([tag]) if tag else set()
     if not selected_tags:
         for t in page_obj.object_list:
-            selected_tags.update(t["tags"])
+            selected_tags.update(x.slug for x in t.tags.all())
 
-    related = {}
-    for key, items in RELATED_CONTENT_ITEMS.items():
-        filtered = [i for i in items if selected_tags.intersection(i["tags"])]
-        if key == "knowledge":
-            related[key] = filtered[:2]
-        else:
-            related[key] = filtered[:1]
+    related = related_content.related(selected_tags)
 
-    def absolute_page_url(num: int) -> str:
+    def absolute_page_url(num: int, **cursor) -> str:
         params = {}
         if num != 1:
             params["page"] = num
+            params.update(cursor)
         if filter_param != "latest":
             params["filter"] = filter_param
         if tag:
@@ -791,8 +661,16 @@ def community(request):
         query = f"?{urlencode(params)}" if params else ""
         return f"/community/{query}"
 
-    prev_page = absolute_page_url(page_number - 1) if page_obj.has_previous() else None
-    next_page = absolute_page_url(page_number + 1) if page_obj.has_next() else None
+    prev_page = (
+        absolute_page_url(page_number - 1, before=page_obj.prev_cursor)
+        if page_obj.has_previous()
+        else None
+    )
+    next_page = (
+        absolute_page_url(page_number + 1, after=page_obj.next_cursor)
+        if page_obj.has_next()
+        else None
+    )
 
     context = {
         "footer": footer,
@@ -802,6 +680,8 @@ def community(request):
         "canonical_url": absolute_page_url(page_number),
         "threads": page_obj.object_list,
         "page_obj": page_obj,
+        "page_number": page_number,
+        "num_pages": num_pages,
         "filter": filter_param,
         "tag": tag,
         "related_content": related,
@@ -819,18 +699,17 @@ def community(request):
 def community_thread(request, slug: str):
     """Render an individual community thread with pagination."""
     footer = get_footer_content()
-    thread = THREAD_DETAILS.get(slug)
-    if not thread:
-        raise Http404
+    thread = get_object_or_404(Thread.published, slug=slug)
 
     from django.core.paginator import Paginator, EmptyPage
 
-    answers_all = list(thread.get("answers", []))
-    accepted = next((a for a in answers_all if a.get("accepted")), None)
-    other_answers = [a for a in answers_all if not a.get("accepted")]
+    answers_qs = thread.answers.filter(status=PostStatusChoices.PUBLISHED)
+    accepted = answers_qs.filter(accepted=True).first()
 
     page_number = int(request.GET.get("page", 1))
-    paginator = Paginator(answers_all, 10)
+    paginator = Paginator(answers_qs, 10)
+    # The denormalized count spares the paginator a COUNT query.
+    paginator.count = thread.reply_count
     try:
         page_obj = paginator.page(page_number)
     except EmptyPage:
@@ -842,7 +721,7 @@ def community_thread(request, slug: str):
     prev_page = absolute_page_url(page_number - 1) if page_obj.has_previous() else None
     next_page = absolute_page_url(page_number + 1) if page_obj.has_next() else None
 
-    meta_desc_source = accepted["body"] if accepted else thread["body"]
+    meta_desc_source = accepted.body if accepted else thread.body
     context = {
         "footer": footer,
         "page_id": "community-thread",
@@ -850,16 +729,15 @@ def community_thread(request, slug: str):
         "slug": slug,
         "answers": page_obj.object_list,
         "accepted_answer": accepted,
-        "other_answers": other_answers,
         "page_obj": page_obj,
         "canonical_url": absolute_page_url(page_number),
         "prev_page_url": prev_page,
         "next_page_url": next_page,
-        "page_title": thread["title"],
-        "meta_title": thread["title"],
+        "page_title": thread.title,
+        "meta_title": thread.title,
         "meta_description": meta_desc_source[:155],
         "meta_robots": "noindex",
-        "total_answers": len(answers_all),
+        "total_answers": thread.reply_count,
         "site_base_url": settings.SITE_BASE_URL,
     }
     response = render(request, "coresite/thread.html", context)
@@ -885,47 +763,74 @@ def report_answer(request, slug: str, answer_id: int):
     return redirect("community_thread", slug=slug)
 
 
+MODERATION_PAGE_SIZE = 50
+
+
 @staff_member_required
 def moderation_dashboard(request):
-    """Simple staff-only dashboard listing reports and audit log."""
+    """Staff-only dashboard listing open reports and the audit log, newest first."""
     footer = get_footer_content()
+    status = request.GET.get("status", ReportStatusChoices.OPEN)
+    if status not in ReportStatusChoices.values:
+        status = ReportStatusChoices.OPEN
+    reports = keyset.paginate(
+        ModerationReport.objects.filter(status=status),
+        ("created_at", "id"),
+        MODERATION_PAGE_SIZE,
+        after=request.GET.get("reports_after"),
+    )
+    audit_log = keyset.paginate(
+        ModerationAuditEntry.objects.all(),
+        ("created_at", "id"),
+        MODERATION_PAGE_SIZE,
+        after=request.GET.get("log_after"),
+    )
+
+    def older_url(param, cursor):
+        params = {"status": status, param: cursor} if cursor else None
+        return f"?{urlencode(params)}" if params else None
+
     context = {
         "footer": footer,
-        "reports": moderation.REPORT_QUEUE,
-        "audit_log": moderation.AUDIT_LOG,
+        "status": status,
+        "statuses": ReportStatusChoices.choices,
+        "reports": reports.object_list,
+        "audit_log": audit_log.object_list,
+        "older_reports_url": older_url("reports_after", reports.next_cursor),
+        "older_log_url": older_url("log_after", audit_log.next_cursor),
     }
     return render(request, "coresite/moderation_dashboard.html", context)
 
 
+@conditional_on("blog")
+@cache_public_page("blog")
 def blog(request):
     page_str = request.GET.get("page")
     if page_str == "1":
         return HttpResponsePermanentRedirect(reverse("blog"))
 
     footer = get_footer_content()
-    all_posts = list(BlogPost.published.order_by("-published_at"))
+    published_qs = BlogPost.published.all()
+    posts_qs = published_qs.defer("content").order_by("-published_at")
 
     category_slug = request.GET.get("category")
     tag_slug = request.GET.get("tag")
     time_str = request.GET.get("time")
 
-    posts = all_posts
     if category_slug:
-        posts = [p for p in posts if p.category_slug == category_slug]
+        posts_qs = posts_qs.filter(category_slug=category_slug)
     if tag_slug:
-        posts = [p for p in posts if any(t.get("slug") == tag_slug for t in p.tags)]
+        posts_qs = posts_qs.filter(blog_tags__slug=tag_slug)
     if time_str:
-        posts = [
-            p
-            for p in posts
-            if p.published_at and p.published_at.strftime("%Y") == time_str
-        ]
+        if time_str.isdigit():
+            posts_qs = posts_qs.filter(published_at__year=int(time_str))
+        else:
+            posts_qs = posts_qs.none()
 
-    # Basic pagination over in-memory posts to enable proper SEO signals.
     from django.core.paginator import Paginator, EmptyPage
 
     page_number = int(page_str or 1)
-    paginator = Paginator(posts, 4)
+    paginator = Paginator(posts_qs, 4)
     try:
         page_obj = paginator.page(page_number)
     except EmptyPage:
@@ -935,18 +840,22 @@ def blog(request):
     featured_post = page_posts[0] if page_number == 1 and page_posts else None
     remaining_posts = page_posts[1:] if page_number == 1 else page_posts
 
-    categories = {
-        (p.category_slug, p.category_title)
-        for p in all_posts
-        if p.category_slug
-    }
-    tags = {
-        (t["slug"], t["title"]) for p in all_posts for t in p.tags
-    }
+    # Facets come from the whole published archive, not the filtered page.
+    categories = set(
+        published_qs.exclude(category_slug="")
+        .order_by()
+        .values_list("category_slug", "category_title")
+        .distinct()
+    )
+    tags = set(
+        BlogTag.objects.filter(posts__in=published_qs)
+        .order_by()
+        .values_list("slug", "title")
+        .distinct()
+    )
     times = {
-        p.published_at.strftime("%Y")
-        for p in all_posts
-        if p.published_at
+        d.strftime("%Y")
+        for d in published_qs.order_by().dates("published_at", "year")
     }
 
     def absolute_page_url(num: int) -> str:
@@ -992,6 +901,8 @@ def blog(request):
     return render(request, "coresite/blog.html", context)
 
 
+@conditional_on("blog", "related_content", "community")
+@cache_public_page("blog", "related_content", "community")
 def blog_post(request, post_slug: str):
     footer = get_footer_content()
     post = get_object_or_404(BlogPost.published, slug=post_slug)
@@ -1017,10 +928,7 @@ def blog_post(request, post_slug: str):
     if post.primary_goal == PrimaryGoalChoices.NEWSLETTER:
         primary_goal_meta = json.dumps({"form": "newsletter", "post": post.slug})
 
-    related = {}
-    for key, items in RELATED_CONTENT_ITEMS.items():
-        filtered = [i for i in items if set(tags) & set(i["tags"])]
-        related[key] = filtered[:2] if key == "knowledge" else filtered[:1]
+    related = related_content.related(tags)
     context = {
         "footer": footer,
         "page_id": "post",
@@ -1036,6 +944,8 @@ def blog_post(request, post_slug: str):
     return render(request, "coresite/blog_detail.html", context)
 
 
+@conditional_on("blog")
+@cache_public_page("blog")
 def blog_category(request, category_slug: str):
     footer = get_footer_content()
     posts_qs = BlogPost.published.filter(
@@ -1059,27 +969,20 @@ def blog_category(request, category_slug: str):
     return render(request, "coresite/blog_category.html", context)
 
 
+@conditional_on("blog", "related_content")
+@cache_public_page("blog", "related_content")
 def blog_tag(request, tag_slug: str):
     footer = get_footer_content()
-    posts = [
-        p
-        for p in BlogPost.published.all()
-        if any(t.get("slug") == tag_slug for t in p.tags)
-    ]
+    posts = list(
+        BlogPost.published.filter(blog_tags__slug=tag_slug)
+        .defer("content")
+        .order_by("-published_at")
+    )
     tag_title = tag_slug.replace("-", " ").title()
-    tag_description = ""
-    for post in posts:
-        for t in post.tags:
-            if t.get("slug") == tag_slug:
-                tag_description = t.get("description", "")
-                break
-        if tag_description:
-            break
-
-    related = {}
-    for key, items in RELATED_CONTENT_ITEMS.items():
-        filtered = [i for i in items if tag_slug in i["tags"]]
-        related[key] = filtered[:2] if key == "knowledge" else filtered[:1]
+    tag = BlogTag.objects.filter(slug=tag_slug).only("description").first()
+    tag_description = tag.description if tag else ""
+
+    related = related_content.related([tag_slug])
 
     context = {
         "footer": footer,
@@ -1095,80 +998,24 @@ def blog_tag(request, tag_slug: str):
     return render(request, "coresite/blog_tag.html", context)
 
 
-def blog_rss(request):
-    """Return an RSS 2.0 feed of recent blog posts."""
-    feed = Rss201rev2Feed(
-        title="Technofatty Blog",
-        link=f"{settings.SITE_BASE_URL}/blog/",
-        description="Latest news and insights from Technofatty.",
+@conditional_on("blog", "knowledge", "case_studies", "tools")
+def sitemap_xml(request):
+    return HttpResponse(
+        sitemaps.index_xml(), content_type="application/xml; charset=utf-8"
     )
 
-    posts = BlogPost.published.order_by("-published_at")[:10]
-    for post in posts:
-        pubdate = post.published_at
-        if pubdate is None:
-            pubdate = timezone.now()
-        elif timezone.is_naive(pubdate):
-            pubdate = timezone.make_aware(pubdate, timezone.utc)
-        feed.add_item(
-            title=post.title,
-            link=f"{settings.SITE_BASE_URL}/blog/{post.slug}/",
-            description=post.excerpt,
-            unique_id=f"{settings.SITE_BASE_URL}/blog/{post.slug}/",
-            pubdate=pubdate,
-        )
-
-    if feed.latest_post_date is None:
-        feed.latest_post_date = timezone.now()
 
-    rss_content = feed.writeString("utf-8")
-    return HttpResponse(
-        rss_content, content_type="application/rss+xml; charset=utf-8"
-    )
+def sitemap_section(request, section: str, page: int):
+    def shard(request):
+        xml_content = sitemaps.shard_xml(section, page)
+        if xml_content is None:
+            raise Http404("Unknown sitemap")
+        return HttpResponse(xml_content, content_type="application/xml; charset=utf-8")
 
-def sitemap_xml(request):
-    cache_key = SITEMAP_CACHE_KEY
-    xml_content = cache.get(cache_key)
-    if xml_content is None:
-        urls = list(TOP_LEVEL_URLS)
-        posts = BlogPost.published.order_by("-published_at")[:10]
-        for post in posts:
-            urls.append(
-                {
-                    "loc": f"{settings.SITE_BASE_URL}/blog/{post.slug}/",
-                    "priority": "0.5",
-                    "changefreq": "monthly",
-                }
-            )
-        if settings.CASE_STUDIES_INDEXABLE:
-            studies = CaseStudy.objects.filter(is_published=True).only("slug", "updated_at")
-            for study in studies:
-                urls.append(
-                    {
-                        "loc": f"{settings.SITE_BASE_URL}{study.get_absolute_url()}",
-                        "priority": "0.5",
-                        "changefreq": "monthly",
-                        "lastmod": (study.updated_at or timezone.now()).date().isoformat(),
-                    }
-                )
-        xml_parts = [
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>",
-            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-        ]
-        for url in urls:
-            xml_parts.append("  <url>")
-            xml_parts.append(f"    <loc>{url['loc']}</loc>")
-            xml_parts.append(f"    <changefreq>{url['changefreq']}</changefreq>")
-            if 'lastmod' in url:
-                xml_parts.append(f"    <lastmod>{url['lastmod']}</lastmod>")
-            xml_parts.append(f"    <priority>{url['priority']}</priority>")
-            xml_parts.append("  </url>")
-        xml_parts.append("</urlset>")
-        xml_content = "\n".join(xml_parts)
-        cache.set(cache_key, xml_content, 60 * 60)
-    return HttpResponse(
-        xml_content, content_type="application/xml; charset=utf-8"
-    )
+    groups = sitemaps.groups_for(section)
+    if not groups:
+        return shard(request)
+    return conditional_on(*groups)(shard)(request)
 
 
 def robots_txt(request):
@@ -1221,13 +1068,11 @@ def contact(request):
             data = {k: v for k, v in form.cleaned_data.items() if k != "website"}
             ip = request.META.get("REMOTE_ADDR", "")
             email = data.get("email", "")
-            cache_key = f"contact:{ip}:{email}"
-            if cache.get(cache_key):
-                contact_event("throttle_hit", {"ip": ip, "email": email})
-            else:
+            if ratelimit.consume(ratelimit.Limit(f"contact:{ip}:{email}", 1, 60)):
                 ContactNotifier().send(**data)
                 contact_event("submitted_success", {"ip": ip})
-                cache.set(cache_key, True, timeout=60)
+            else:
+                contact_event("throttle_hit", {"ip": ip, "email": email})
             return redirect("/contact/?sent=1")
         first_error = next(iter(form.errors))
         form.fields[first_error].widget.attrs["autofocus"] = "autofocus"
@@ -1,23 +1,39 @@
 import hashlib
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
 
+from utils.events import BufferedSink, write_json_lines
+
 logger = logging.getLogger(__name__)
 
 
+def _write_events(records: List[Dict[str, Any]]) -> None:
+    path = getattr(settings, "EVENT_LOG_PATH", "")
+    if path:
+        write_json_lines(path, records)
+        return
+    for record in records:
+        logger.info(record)
+
+
+sink = BufferedSink("newsletter", _write_events)
+
+
 def log_newsletter_event(
     request, event: str, email: str = "", result: str = "", duration_ms: float = 0.0
 ) -> None:
     ip = request.META.get("REMOTE_ADDR", "")
     ua = request.META.get("HTTP_USER_AGENT", "")
     email_hash = hashlib.sha256(email.encode()).hexdigest() if email else ""
-    logger.info(
+    sink.emit(
         {
+            "ts": timezone.now().isoformat(),
             "event": event,
             "email_hash": email_hash,
             "ip": ip,
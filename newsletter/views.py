@@ -2,10 +2,11 @@ import hashlib
 import time
 
 from django.conf import settings
-from django.core.cache import cache
 from django.http import HttpResponseNotAllowed
 from django.shortcuts import render
 
+from utils import ratelimit
+
 from .copy import get_copy
 from .forms import NewsletterSubscribeForm
 from .providers import Result, get_provider
@@ -81,11 +82,11 @@ def newsletter_form(request):
     limits = getattr(
         settings, "NEWSLETTER_RATE_LIMITS", {"ip_per_hour": 10, "email_per_hour": 5}
     )
-    ip_key = f"nl:ip:{ip}"
-    email_key = f"nl:email:{email_hash}"
-    if cache.get(ip_key, 0) >= limits.get("ip_per_hour", 10) or cache.get(
-        email_key, 0
-    ) >= limits.get("email_per_hour", 5):
+    allowed = ratelimit.consume(
+        ratelimit.Limit(f"nl:ip:{ip}", limits.get("ip_per_hour", 10), 3600),
+        ratelimit.Limit(f"nl:email:{email_hash}", limits.get("email_per_hour", 5), 3600),
+    )
+    if not allowed:
         log_newsletter_event(
             request,
             "newsletter_subscribe_failure",
@@ -103,9 +104,6 @@ def newsletter_form(request):
         }
         return _render_noindex(request, "newsletter/form.html", context)
 
-    cache.set(ip_key, cache.get(ip_key, 0) + 1, 3600)
-    cache.set(email_key, cache.get(email_key, 0) + 1, 3600)
-
     provider = get_provider(
         ip=ip, ua=request.META.get("HTTP_USER_AGENT", ""), source="signup"
     )
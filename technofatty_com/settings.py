@@ -169,6 +169,79 @@ if os.environ.get("DB_ENGINE") == "sqlite":
 if ENV == "production" and DATABASES["default"].get("ENGINE", "").endswith("postgresql") and not DATABASES["default"].get("PASSWORD"):
     raise ImproperlyConfigured("POSTGRES_PASSWORD must be set in production")
 
+# -------------------------------------------------
+# Cache
+# -------------------------------------------------
+# 'redis' shares one store across workers, 'file' needs no external service,
+# 'locmem' keeps everything per process (development and tests).
+TF_CACHE_BACKEND = os.environ.get(
+    "TF_CACHE_BACKEND", "locmem" if DEBUG else "file"
+).lower()
+CACHE_TIMEOUT = int(os.environ.get("CACHE_TIMEOUT", "300"))
+
+if TF_CACHE_BACKEND == "redis":
+    _SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/1"),
+    }
+elif TF_CACHE_BACKEND == "file":
+    _SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "CACHE_FILE_PATH", os.path.join(BASE_DIR, "var", "cache")
+        ),
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "5000"))},
+    }
+else:
+    _SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "technofatty",
+    }
+
+CACHES = {
+    "shared": {**_SHARED_CACHE, "TIMEOUT": CACHE_TIMEOUT, "KEY_PREFIX": "tf"},
+    # Per-process LRU in front of the shared store; see coresite/cache.py.
+    "default": {
+        "BACKEND": "coresite.cache.NearCache",
+        "LOCATION": "shared",
+        "TIMEOUT": CACHE_TIMEOUT,
+        "OPTIONS": {
+            "NEAR_TIMEOUT": int(os.environ.get("CACHE_NEAR_TIMEOUT", "5")),
+            "NEAR_MAX_ENTRIES": int(os.environ.get("CACHE_NEAR_MAX_ENTRIES", "512")),
+        },
+    },
+}
+
+# Whole-page cache for anonymous visitors (coresite/page_cache.py).
+PAGE_CACHE_ENABLED = (
+    os.environ.get("PAGE_CACHE_ENABLED") or str(not DEBUG)
+).lower() == "true"
+PAGE_CACHE_TIMEOUT = int(os.environ.get("PAGE_CACHE_TIMEOUT", "600"))
+
+# Shared cache for {% fragment %} partials (coresite/fragments.py). The
+# per-request memo is always on.
+FRAGMENT_CACHE_ENABLED = (
+    os.environ.get("FRAGMENT_CACHE_ENABLED") or str(not DEBUG)
+).lower() == "true"
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("FRAGMENT_CACHE_TIMEOUT", "3600"))
+
+# Static copies of public pages for the web server to serve directly
+# (coresite/services/prerender.py). PRERENDER_ENABLED re-renders the pages
+# affected by each content save; `manage.py prerender` renders everything.
+PRERENDER_ROOT = os.environ.get("PRERENDER_ROOT", os.path.join(BASE_DIR, "var", "prerender"))
+PRERENDER_ENABLED = os.environ.get("PRERENDER_ENABLED", "false").lower() == "true"
+
+# Newsletter and contact events are buffered in memory and written in batches
+# (utils/events.py). EVENT_LOG_PATH sends newsletter events to a JSON-lines
+# file instead of the logger.
+EVENT_BUFFER_ENABLED = (
+    os.environ.get("EVENT_BUFFER_ENABLED") or str(not DEBUG)
+).lower() == "true"
+EVENT_BUFFER_MAX_SIZE = int(os.environ.get("EVENT_BUFFER_MAX_SIZE", "100"))
+EVENT_BUFFER_FLUSH_INTERVAL = float(os.environ.get("EVENT_BUFFER_FLUSH_INTERVAL", "5"))
+EVENT_BUFFER_MAX_LEN = int(os.environ.get("EVENT_BUFFER_MAX_LEN", "10000"))
+EVENT_LOG_PATH = os.environ.get("EVENT_LOG_PATH", "")
+
 # -------------------------------------------------
 # Internationalization
 # -------------------------------------------------
@@ -191,11 +264,14 @@ STATICFILES_DIRS = []
 # Where collectstatic will gather files for production serving (Nginx, etc.)
 STATIC_ROOT = Path("/var/www/technofatty_com/static")
 
-# Hash filenames for cache-busting; CDN should set long-lived cache headers
-STATICFILES_STORAGE = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+# Hash filenames for cache-busting; CDN should set long-lived cache headers.
+# Project JS/CSS (paths under STATIC_MINIFY_PREFIXES) is minified before hashing.
+STATICFILES_STORAGE = "coresite.storage.MinifiedManifestStaticFilesStorage"
+STATIC_MINIFY_PREFIXES = ["coresite/"]
 
-# Let Django find compiled CSS from sass_processor
+# Let Django find compiled CSS from build_static and sass_processor
 STATICFILES_FINDERS = [
+    "coresite.assets.CompiledSassFinder",
     "django.contrib.staticfiles.finders.FileSystemFinder",
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
     "sass_processor.finders.CssFinder",
@@ -214,6 +290,9 @@ SASS_PROCESSOR_INCLUDE_DIRS = [
 # Optional: disable on-the-fly compilation in production for speed
 SASS_PROCESSOR_ENABLED = DEBUG
 
+# build_static compiles SCSS here, outside the source tree.
+SASS_BUILD_ROOT = BASE_DIR / "var" / "sass"
+
 # -------------------------------------------------
 # Security / CSRF
 # -------------------------------------------------
@@ -72,6 +72,11 @@ urlpatterns = [
     path('newsletter/', include('newsletter.urls')),
     path('robots.txt', core_views.robots_txt, name="robots_txt"),
     path('sitemap.xml', core_views.sitemap_xml, name="sitemap_xml"),
+    path(
+        'sitemap-<slug:section>-<int:page>.xml',
+        core_views.sitemap_section,
+        name="sitemap_section",
+    ),
     path('signup/', SignupView.as_view(), name='signup'),
     path('activate/<uidb64>/<token>/', ActivateView.as_view(), name='activate'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
@@ -0,0 +1,82 @@
+import pytest
+from django.core.cache import cache
+
+from utils import ratelimit
+from utils.ratelimit import Limit
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_consume_blocks_once_rate_is_reached():
+    limit = Limit("test:burst", 2, 60)
+    assert ratelimit.consume(limit, now=600)
+    assert ratelimit.consume(limit, now=601)
+    assert not ratelimit.consume(limit, now=602)
+    assert ratelimit.usage(limit, now=602) == [2]
+
+
+def test_rejected_requests_do_not_increment():
+    limit = Limit("test:rejected", 1, 60)
+    assert ratelimit.consume(limit, now=600)
+    for _ in range(5):
+        assert not ratelimit.consume(limit, now=610)
+    assert ratelimit.usage(limit, now=610) == [1]
+
+
+def test_previous_window_is_weighted_by_overlap():
+    limit = Limit("test:sliding", 2, 60)
+    for now in (650, 655, 658):
+        ratelimit.hit(limit, now=now)
+    # 15s into the next bucket, 75% of the previous one still overlaps.
+    assert not ratelimit.consume(limit, now=675)
+    # 45s in, the three old hits only count as 0.75 combined.
+    assert ratelimit.consume(limit, now=705)
+
+
+def test_rate_one_is_an_exact_lockout():
+    limit = Limit("test:lockout", 1, 60)
+    assert ratelimit.consume(limit, now=59.0)
+    assert not ratelimit.consume(limit, now=59.5)
+    # The previous bucket would only weigh ~0.99 here.
+    assert not ratelimit.consume(limit, now=60.5)
+    assert ratelimit.usage(limit, now=61) == [1]
+    ratelimit.reset(limit, now=61)
+    assert ratelimit.consume(limit, now=62)
+
+
+def test_any_exhausted_limit_blocks_all_without_counting():
+    ip = Limit("test:ip", 5, 3600)
+    email = Limit("test:email", 1, 3600)
+    assert ratelimit.consume(ip, email, now=7200)
+    assert not ratelimit.consume(ip, email, now=7201)
+    assert ratelimit.usage(ip, email, now=7201) == [1, 1]
+
+
+def test_consume_rechecks_after_increment():
+    limit = Limit("test:race", 2, 60)
+    ratelimit.hit(limit, now=600)
+    # Simulate a concurrent request that incremented after our read.
+    original = ratelimit._incr
+
+    def racing_incr(key, timeout):
+        original(key, timeout)
+        return original(key, timeout)
+
+    ratelimit._incr = racing_incr
+    try:
+        assert not ratelimit.consume(limit, now=601)
+    finally:
+        ratelimit._incr = original
+
+
+def test_hit_and_reset():
+    limit = Limit("test:counter", 3, 300)
+    assert ratelimit.hit(limit, now=900) == [1]
+    assert ratelimit.hit(limit, now=901) == [2]
+    ratelimit.reset(limit, now=902)
+    assert ratelimit.usage(limit, now=902) == [0]
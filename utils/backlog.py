@@ -1,23 +1,84 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import List, Tuple
+from typing import Deque, List, Tuple
 
-# Simple in-memory store of gaps and persisted log for future triage
-GAPS: List[Tuple[str, str, datetime]] = []
+from utils.events import BufferedSink
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+LOG_PATH = os.path.join(os.path.dirname(__file__), "backlog.log")
+# Rotate to backlog.log.1 .. backlog.log.N once the file reaches this size.
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+# Repeats of the same (kind, location) inside this many seconds are dropped.
+DEDUP_WINDOW = 300
+# Most recent gaps kept in memory for inspection.
+MAX_GAPS = 1000
+
+# Ring buffer of recent gaps; the log file is the durable record.
+GAPS: Deque[Tuple[str, str, datetime]] = deque(maxlen=MAX_GAPS)
+
+_seen: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+_seen_lock = threading.Lock()
+
+
+def _rotate(path: str) -> None:
+    for n in range(LOG_BACKUPS - 1, 0, -1):
+        if os.path.exists(f"{path}.{n}"):
+            os.replace(f"{path}.{n}", f"{path}.{n + 1}")
+    os.replace(path, f"{path}.1")
+
+
+def _write_lines(records: List[dict]) -> None:
+    lines = "".join(record["line"] for record in records)
+    # Every worker has its own writer thread; an exclusive lock on a sidecar
+    # file keeps the size check, rotation and append from interleaving, so
+    # two workers cannot both rotate or write into a file just renamed away.
+    with open(f"{LOG_PATH}.lock", "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if os.path.getsize(LOG_PATH) + len(lines) > LOG_MAX_BYTES:
+                _rotate(LOG_PATH)
+        except OSError:
+            pass
+        with open(LOG_PATH, "a", encoding="utf-8") as fh:
+            fh.write(lines)
+
+
+_sink = BufferedSink("backlog", _write_lines)
+
+
+def _is_repeat(key: Tuple[str, str], now: float) -> bool:
+    with _seen_lock:
+        last = _seen.get(key)
+        if last is not None and now - last < DEDUP_WINDOW:
+            return True
+        _seen[key] = now
+        _seen.move_to_end(key)
+        while len(_seen) > MAX_GAPS:
+            _seen.popitem(last=False)
+    return False
 
 
 def log_gap(kind: str, location: str) -> None:
     """Record a missing content gap for later review.
 
+    The line is queued for a background writer, so callers on the request
+    path never touch the file. Repeats within ``DEDUP_WINDOW`` are ignored.
+
     Args:
         kind: Type of content that was missing (e.g. "knowledge" or "tools").
         location: Where the gap was encountered.
     """
+    if _is_repeat((kind, location), time.monotonic()):
+        return
     entry = (kind, location, datetime.utcnow())
     GAPS.append(entry)
-    try:
-        with open(__file__.rsplit("/", 1)[0] + "/backlog.log", "a", encoding="utf-8") as fh:
-            fh.write(f"{entry[2].isoformat()}|{kind}|{location}\n")
-    except OSError:
-        # If the log file can't be written, fail silently; the in-memory
-        # record is still available for inspection in tests.
-        pass
+    _sink.emit({"line": f"{entry[2].isoformat()}|{kind}|{location}\n"})
@@ -0,0 +1,144 @@
+"""Buffered event sinks for high-volume, low-value writes.
+
+Analytics-style events (newsletter impressions, contact attempts) should not
+cost a database or log write on the request that produced them. A
+:class:`BufferedSink` collects records in memory and hands them to its
+``write`` callable in batches, from a daemon thread, once ``max_size``
+records are waiting or ``flush_interval`` seconds have passed. Anything still
+buffered is flushed when the interpreter exits. If the writer stalls, the
+buffer holds at most ``max_len`` records; the oldest are dropped and counted
+in ``dropped``.
+
+Buffering follows ``EVENT_BUFFER_ENABLED``; with it off every record is
+written straight away, which keeps tests and local development synchronous.
+Records are lost if the process is killed outright, so only use a sink for
+data that can tolerate that.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+
+class BufferedSink:
+    """Batch records for ``write``, which receives a non-empty list."""
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[List[Record]], None],
+        max_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_len: Optional[int] = None,
+    ):
+        self.name = name
+        self.write = write
+        self._max_size = max_size
+        self._flush_interval = flush_interval
+        self._max_len = max_len
+        self.dropped = 0
+        self._dropped_reported = 0
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._buffer: Deque[Record] = deque()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, "EVENT_BUFFER_ENABLED", False)
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, "EVENT_BUFFER_MAX_SIZE", 100)
+
+    @property
+    def flush_interval(self) -> float:
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, "EVENT_BUFFER_FLUSH_INTERVAL", 5.0)
+
+    @property
+    def max_len(self) -> int:
+        if self._max_len is not None:
+            return self._max_len
+        return getattr(settings, "EVENT_BUFFER_MAX_LEN", 10000)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def emit(self, record: Record) -> None:
+        """Queue ``record``; written immediately when buffering is off."""
+        if not self.enabled:
+            self._write([record])
+            return
+        if self._pid != os.getpid():
+            # Forked worker: the parent's lock, buffer and thread are not ours.
+            self._reset()
+        with self._lock:
+            while len(self._buffer) >= self.max_len:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(record)
+            full = len(self._buffer) >= self.max_size
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"event-sink-{self.name}", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns how many records."""
+        with self._lock:
+            records, self._buffer = list(self._buffer), deque()
+            dropped = self.dropped - self._dropped_reported
+            self._dropped_reported = self.dropped
+        if dropped:
+            logger.warning(
+                "Dropped %d %s event(s): buffer full", dropped, self.name
+            )
+        if records:
+            self._write(records)
+        return len(records)
+
+    def _write(self, records: List[Record]) -> None:
+        try:
+            self.write(records)
+        except Exception:
+            logger.exception("Dropped %d %s event(s)", len(records), self.name)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            # Don't hold a database connection open between batches.
+            connections.close_all()
+
+
+def write_json_lines(path: str, records: List[Record]) -> None:
+    """Append ``records`` to ``path`` as JSON lines in a single write."""
+    lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(lines)
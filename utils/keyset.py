@@ -0,0 +1,122 @@
+"""Keyset ("seek") pagination for newest-first listings.
+
+Offset pagination makes the database walk and discard every row before the
+requested page, so deep pages get slower as a listing grows. Keyset
+pagination instead remembers the sort key of the last row shown and asks for
+rows strictly after it, which an index on the sort columns answers directly
+at any depth.
+
+Cursors are opaque URL-safe tokens holding the boundary row's sort values.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.db.models import Q, QuerySet
+
+
+@dataclass
+class KeysetPage:
+    object_list: List[Any]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> Optional[Tuple]:
+    """Return the sort values in ``token``, or ``None`` if it is malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            return None
+        return tuple(_decode_value(v) for v in values)
+    except (ValueError, TypeError):
+        return None
+
+
+def _after(fields: Sequence[str], values: Sequence, op: str) -> Q:
+    """Build ``(f1, f2, ...) <op> (v1, v2, ...)`` as a lexicographic filter."""
+    condition = Q()
+    for i, field in enumerate(fields):
+        term = Q(**{f"{field}__{op}": values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            term &= Q(**{prev_field: prev_value})
+        condition |= term
+    return condition
+
+
+def paginate(
+    queryset: QuerySet,
+    fields: Sequence[str],
+    per_page: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    offset: int = 0,
+) -> KeysetPage:
+    """Return one page of ``queryset`` ordered newest first by ``fields``.
+
+    ``fields`` must end in a unique column (usually ``id``) so the order is
+    total. Pass the ``next_cursor`` of a page as ``after`` to move forward, or
+    its ``prev_cursor`` as ``before`` to move back. ``offset`` is only used
+    without a cursor, to land on numbered pages from old or shared links.
+    """
+    descending = [f"-{field}" for field in fields]
+    ascending = list(fields)
+
+    def boundary(obj) -> str:
+        return encode_cursor([getattr(obj, field) for field in fields])
+
+    cursor = decode_cursor(before, len(fields)) if before else None
+    if cursor is not None:
+        rows = list(
+            queryset.filter(_after(fields, cursor, "gt")).order_by(*ascending)[: per_page + 1]
+        )
+        more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=boundary(rows[-1]) if rows else None,
+            prev_cursor=boundary(rows[0]) if rows and more else None,
+        )
+
+    cursor = decode_cursor(after, len(fields)) if after else None
+    if cursor is not None:
+        queryset = queryset.filter(_after(fields, cursor, "lt"))
+        offset = 0
+    rows = list(queryset.order_by(*descending)[offset : offset + per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    has_previous = cursor is not None or offset > 0
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=boundary(rows[-1]) if rows and more else None,
+        prev_cursor=boundary(rows[0]) if rows and has_previous else None,
+    )
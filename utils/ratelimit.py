@@ -0,0 +1,142 @@
+"""Sliding-window rate limiting on top of the shared cache.
+
+Each :class:`Limit` counts hits in fixed buckets of ``window`` seconds. The
+estimate for "the last ``window`` seconds" is the current bucket plus the
+previous bucket weighted by how much of it still overlaps the window, which
+smooths out the burst a plain fixed window allows at bucket boundaries.
+
+That estimate is too loose for ``rate=1`` throttles ("one post a minute"):
+a hit late in one bucket weighs just under 1 a second later. Those limits are
+an exact lockout instead, a key added with ``cache.add`` that expires after
+``window`` seconds.
+
+Checks for any number of limits are a single ``get_many`` call, so rejected
+requests cost one cache round trip. Counters only move through
+``cache.incr``/``cache.add``. Those are atomic on Redis; with the file or
+locmem backends concurrent requests from different processes can overshoot
+a limit slightly.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+
+KEY_PREFIX = "rl"
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Allow at most ``rate`` hits for ``key`` per ``window`` seconds."""
+
+    key: str
+    rate: int
+    window: int
+
+    @property
+    def lockout(self) -> bool:
+        return self.rate == 1
+
+    @property
+    def lock_key(self) -> str:
+        return f"{KEY_PREFIX}:{self.key}:{self.window}:lock"
+
+
+def _buckets(limit: Limit, now: float) -> Tuple[str, str, float]:
+    index = int(now // limit.window)
+    elapsed = (now % limit.window) / limit.window
+    current = f"{KEY_PREFIX}:{limit.key}:{limit.window}:{index}"
+    previous = f"{KEY_PREFIX}:{limit.key}:{limit.window}:{index - 1}"
+    return current, previous, 1.0 - elapsed
+
+
+def _estimate(current: int, previous: int, weight: float) -> float:
+    return current + previous * weight
+
+
+def _fetch(limits: Sequence[Limit], now: float) -> Tuple[list, Dict[str, int]]:
+    buckets = [_buckets(limit, now) for limit in limits]
+    keys = [key for current, previous, _ in buckets for key in (current, previous)]
+    keys.extend(limit.lock_key for limit in limits if limit.lockout)
+    return buckets, cache.get_many(keys)
+
+
+def _used(limit: Limit, bucket: Tuple[str, str, float], counts: Dict[str, int]) -> float:
+    if limit.lockout:
+        return counts.get(limit.lock_key, 0)
+    current, previous, weight = bucket
+    return _estimate(counts.get(current, 0), counts.get(previous, 0), weight)
+
+
+def _incr(key: str, timeout: int) -> int:
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout):
+            return 1
+        return cache.incr(key)
+
+
+def usage(*limits: Limit, now: Optional[float] = None) -> List[int]:
+    """Return the estimated hit count for each limit without recording a hit."""
+    now = time.time() if now is None else now
+    buckets, counts = _fetch(limits, now)
+    return [math.ceil(_used(limit, bucket, counts)) for limit, bucket in zip(limits, buckets)]
+
+
+def consume(*limits: Limit, now: Optional[float] = None) -> bool:
+    """Record a hit against every limit if none of them is exhausted.
+
+    When the first read already shows a limit exhausted, returns ``False``
+    without touching any counter. Otherwise every limit is incremented and
+    re-checked against the value the increment returned; if a concurrent
+    caller got there first this returns ``False``, but the counters it has
+    already bumped (including those of limits that still had room) stay
+    bumped. The re-check only prevents overshoot where ``incr``/``add`` are
+    atomic, i.e. on Redis; the file and locmem backends can still let a
+    race through (see the module docstring).
+    """
+    now = time.time() if now is None else now
+    buckets, counts = _fetch(limits, now)
+    for limit, bucket in zip(limits, buckets):
+        if _used(limit, bucket, counts) >= limit.rate:
+            return False
+    allowed = True
+    for limit, (current, previous, weight) in zip(limits, buckets):
+        if limit.lockout:
+            # Only one concurrent caller can add the key.
+            allowed = cache.add(limit.lock_key, 1, limit.window) and allowed
+            continue
+        count = _incr(current, limit.window * 2)
+        # ``count - 1`` hits landed before ours, including concurrent ones.
+        if _estimate(count - 1, counts.get(previous, 0), weight) >= limit.rate:
+            allowed = False
+    return allowed
+
+
+def hit(*limits: Limit, now: Optional[float] = None) -> List[int]:
+    """Record a hit against every limit and return the updated estimates."""
+    now = time.time() if now is None else now
+    buckets, counts = _fetch(limits, now)
+    result = []
+    for limit, (current, previous, weight) in zip(limits, buckets):
+        if limit.lockout:
+            result.append(_incr(limit.lock_key, limit.window))
+            continue
+        count = _incr(current, limit.window * 2)
+        result.append(math.ceil(_estimate(count, counts.get(previous, 0), weight)))
+    return result
+
+
+def reset(*limits: Limit, now: Optional[float] = None) -> None:
+    """Forget recorded hits for every limit."""
+    now = time.time() if now is None else now
+    keys = []
+    for limit in limits:
+        current, previous, _ = _buckets(limit, now)
+        keys.extend((current, previous, limit.lock_key))
+    cache.delete_many(keys)
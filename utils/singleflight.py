@@ -0,0 +1,115 @@
+"""Single-flight, stale-while-revalidate reads over the shared cache.
+
+Plain ``get``/``set`` caching stampedes when a hot key expires or its content
+version moves on publish: every worker misses at once and recomputes the same
+value. :func:`get_or_set` lets one caller win a short lock and recompute.
+While it does, callers holding an entry that has merely expired are answered
+from it. Callers with no entry, or one stored for an older version, wait
+briefly for the winner before computing on their own: a new version means the
+content changed, and the old value must not be served (and cached, or
+answered with the new version's validators) as if it were current.
+
+Entries are stored as ``(version, fresh_until, value)`` under a key that does
+not include the version, so each value has a single key and lock however
+often its version moves. They stay in the cache ``stale_timeout`` seconds
+past ``fresh_until``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from django.core.cache import cache
+
+LOCK_PREFIX = "singleflight:lock"
+# Longest a recompute may hold the lock before another caller may try.
+LOCK_TIMEOUT = 30
+# How long a soft-expired value may still be served while it is rebuilt.
+STALE_TIMEOUT = 60 * 60
+# How long a caller with nothing to serve waits for the lock holder.
+WAIT = 2.0
+POLL_INTERVAL = 0.05
+
+Entry = Tuple[str, float, Any]
+
+
+def _fresh(entry: Optional[Entry], version: str) -> bool:
+    return entry is not None and entry[0] == version and time.time() < entry[1]
+
+
+def _shared():
+    """The cache without ``coresite.cache.NearCache``'s per-process tier."""
+    return getattr(cache, "shared", cache)
+
+
+def peek(key: str, default: Any = None, version: Optional[str] = None) -> Any:
+    """Return the cached value for ``key`` (fresh or stale), or ``default``.
+
+    With ``version``, only a value stored for that version is returned.
+    """
+    entry = cache.get(key)
+    if entry is None or (version is not None and entry[0] != version):
+        return default
+    return entry[2]
+
+
+def store(
+    key: str,
+    value: Any,
+    timeout: Optional[int],
+    version: str = "",
+    stale_timeout: int = STALE_TIMEOUT,
+) -> None:
+    """Cache ``value`` as fresh for ``timeout`` seconds (``None``: forever)."""
+    if timeout is None:
+        cache.set(key, (version, float("inf"), value), None)
+    else:
+        cache.set(key, (version, time.time() + timeout, value), timeout + stale_timeout)
+
+
+def get_or_set(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: Optional[int],
+    version: str = "",
+    stale_timeout: int = STALE_TIMEOUT,
+    lock_timeout: int = LOCK_TIMEOUT,
+    wait: float = WAIT,
+) -> Any:
+    """Return the value for ``key``, letting one caller at a time recompute it.
+
+    An entry is fresh while it is younger than ``timeout`` and was stored for
+    ``version``. Otherwise the caller that takes the lock runs ``compute`` and
+    stores the result. Concurrent callers get the expired value if it was
+    stored for ``version``; otherwise they wait up to ``wait`` seconds for
+    the new one before computing it themselves.
+    """
+    entry = cache.get(key)
+    if _fresh(entry, version):
+        return entry[2]
+
+    lock_key = f"{LOCK_PREFIX}:{key}"
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            # Another worker may have finished just before we took the lock;
+            # its value might not have reached our near cache tier yet.
+            latest = _shared().get(key)
+            if _fresh(latest, version):
+                return latest[2]
+            value = compute()
+            store(key, value, timeout, version, stale_timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    if entry is not None and entry[0] == version:
+        return entry[2]
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        # The near tier may still hold the entry we already rejected.
+        entry = _shared().get(key)
+        if entry is not None and entry[0] == version:
+            return entry[2]
+    return compute()